@@ -1,15 +1,21 @@
 
 import uvicorn
 import json
+import argparse
+import subprocess
+import sys
 from fastapi import FastAPI, Request
 from rich.console import Console
 from rich.panel import Panel
 from rich.json import JSON
 from rich.layout import Layout
 from rich.live import Live
+from rich.table import Table
 
 # Import your agent
-from qsr_agent.agent import process_order
+from qsr_agent.agent import enrichment_queue, process_order, session_pool
+from qsr_agent.tools import get_response_cache
+from qsr_agent.validation_checkers import validation_stats
 
 app = FastAPI()
 console = Console()
@@ -25,6 +31,26 @@ AGENT_CARD = {
 async def get_agent_card():
     return AGENT_CARD
 
+@app.get("/metrics/enrichment")
+async def get_enrichment_metrics():
+    """Depth, in-flight jobs and retry/failure counters of the background enrichment queue."""
+    return enrichment_queue.metrics()
+
+@app.get("/metrics/sessions")
+async def get_session_metrics():
+    """Live sessions gauge plus session creation and eviction counters."""
+    return session_pool.metrics()
+
+@app.get("/metrics/validation")
+async def get_validation_metrics():
+    """Attempts, locally repaired outputs and retry causes per robust_* agent output."""
+    return validation_stats()
+
+@app.get("/metrics/llm_cache")
+async def get_llm_cache_metrics():
+    """Hit/miss counters of the LLM response cache, overall and per agent."""
+    return get_response_cache().metrics()
+
 @app.post("/a2a/message")
 async def handle_a2a_message(request: Request):
     # 1. VISUALIZE INCOMING
@@ -32,6 +58,8 @@ async def handle_a2a_message(request: Request):
     incoming_msg = payload.get("message", {})
     parts = incoming_msg.get("parts", [])
     user_text = next((p["text"] for p in parts if "text" in p), "")
+    # Messages of one A2A conversation share a session; otherwise each order gets its own.
+    context_id = incoming_msg.get("contextId") or payload.get("contextId")
 
     console.print(Panel(f"[bold cyan]{user_text}[/]", title="📨 INCOMING ORDER (CrewAI)", border_style="cyan"))
 
@@ -39,7 +67,7 @@ async def handle_a2a_message(request: Request):
     try:
         # We await the async agent
         console.print("[yellow]... Agent is thinking (Sub-agents & Guardrails running) ...[/]")
-        adk_result = await process_order(user_text)
+        adk_result = await process_order(user_text, context_id=context_id)
     except Exception as e:
         console.print(f"[bold red]❌ Error running agent: {e}[/]")
         return {"error": str(e)}
@@ -55,8 +83,8 @@ async def handle_a2a_message(request: Request):
         
         if "kitchen_agent_output" in state:
             final_text = str(state["kitchen_agent_output"])
-        elif "turn_history" in adk_result:
-            final_text = adk_result["turn_history"][-1].get("response", "")
+        elif adk_result.get("final_text"):
+            final_text = adk_result["final_text"]
 
     # 4. SHOW THE BRAIN (Internal State)
     # This shows what your Queue, Inventory, and Load Balancer actually did
@@ -77,6 +105,53 @@ async def handle_a2a_message(request: Request):
         }
     }
 
+# --- STARTUP PROFILING ---
+def profile_imports(module: str = "qsr_agent", top: int = 25) -> None:
+    """
+    Import `module` in a fresh interpreter with `-X importtime` and print
+    the slowest imports by cumulative time, so startup regressions show up.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+
+    if proc.returncode != 0:
+        last = (proc.stderr.strip().splitlines() or [f"exit code {proc.returncode}"])[-1]
+        console.print(f"[bold red]❌ import {module} failed:[/]\n{last}")
+
+    total_us = max((r[0] for r in rows), default=0)
+    table = Table(title=f"⏱️ Import time for '{module}' (total {total_us / 1000:.1f} ms)")
+    table.add_column("cumulative (ms)", justify="right")
+    table.add_column("self (ms)", justify="right")
+    table.add_column("module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        table.add_row(f"{cumulative_us / 1000:.1f}", f"{self_us / 1000:.1f}", name)
+    console.print(table)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ADK Kitchen A2A server")
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help="Print an -X importtime summary for qsr_agent and exit.",
+    )
+    parser.add_argument("--top", type=int, default=25, help="Rows to show with --profile-imports.")
+    args = parser.parse_args()
+
+    if args.profile_imports:
+        profile_imports(top=args.top)
+        sys.exit(0)
+
     console.print(Panel("[bold white]🚀 ADK KITCHEN SERVER ONLINE (A2A Mode)[/]", style="on blue"))
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -2,10 +2,12 @@
 
 import datetime
 import asyncio
+import json
 import logging
+import os
 from typing import Optional, Dict, Any  # ✅ extended types
 
-from google.adk.agents import Agent, SequentialAgent, ParallelAgent
+from google.adk.agents import Agent, ParallelAgent
 from google.adk.tools import FunctionTool
 from google.adk.runners import InMemoryRunner
 
@@ -19,13 +21,17 @@ from google.genai import types
 from google.adk.tools.tool_context import ToolContext
 from google.adk.tools.base_tool import BaseTool
 
-from .config import config
+from .config import config, ensure_model_credentials
+from .job_queue import JobQueue
+from .pipeline import DagAgent, NodeSpec
+from .session_pool import SessionPool
+from .state_codec import decode
 from .sub_agents import (
     order_loader_agent,
     queuing_agent,
     kitchen_load_balancer_agent,
     ai_checker_agent,
-    notifier_agent,
+    conditional_notifier_agent,
     delivery_agent,
     forecasting_agent,
     robust_storekeeper_agent,
@@ -33,7 +39,14 @@ from .sub_agents import (
     robust_feedback_agent,
     robust_refinement_agent,
 )
-from .tools import get_order_details, update_order_status, fetch_inventory, save_system_logs
+from .tools import (
+    get_order_details,
+    get_order_progress,
+    dispatch_table_deliveries,
+    update_order_status,
+    fetch_inventory,
+    save_system_logs,
+)
 
 # -------------------------------------------------------------------
 # Logger for guardrails & API
@@ -178,28 +191,59 @@ def qsr_tool_guardrail(
 
 
 # -------------------------------------------------------------------
-# 1) SEQUENTIAL PIPELINE: order_flow
-#    order_loader_agent -> queuing -> KLB -> AI checker -> notifier -> delivery
+# Model credentials (before_agent_callback on root_agent)
+#   - Resolves Vertex AI credentials before the first model call, however
+#     the agent is run (process_order, `adk web`, `adk run`), while
+#     keeping google.auth off the import path
+# -------------------------------------------------------------------
+def model_credentials_callback(callback_context: CallbackContext) -> None:
+    ensure_model_credentials()
+    return None
+
+
 # -------------------------------------------------------------------
-order_flow = SequentialAgent(
+# 1) DEPENDENCY-GRAPH PIPELINE: order_flow
+#    order_loader -> {queuing, KLB} ; KLB -> {AI checker, delivery}
+#    AI checker -> notifier (gated)
+#    Each step declares the state keys it reads/writes; steps whose
+#    inputs are ready run concurrently.
+# -------------------------------------------------------------------
+order_flow = DagAgent(
     name="order_flow",
     description=(
-        "Sequential pipeline for processing an order: "
-        "load order -> queue -> kitchen load balance -> AI check -> notify -> delivery."
+        "Dependency-graph pipeline for processing an order: "
+        "load order -> queue + kitchen load balance -> AI check + delivery -> notify."
     ),
     sub_agents=[
-        order_loader_agent,          # 0. load full order into state["order"]
-        queuing_agent,               # 1. uses state["order"]
-        kitchen_load_balancer_agent, # 2. uses state["order"]
-        ai_checker_agent,          # 3. uses state["order"]  (you commented this out)
-        notifier_agent,              # 4. uses state["order"]
-        delivery_agent,              # 5. uses state["order"]
+        order_loader_agent,
+        queuing_agent,
+        kitchen_load_balancer_agent,
+        ai_checker_agent,
+        conditional_notifier_agent,
+        delivery_agent,
     ],
+    nodes={
+        "order_loader_agent": NodeSpec(outputs=("order",)),
+        "queuing_agent": NodeSpec(inputs=("order",), outputs=("queue_assignment",)),
+        "kitchen_load_balancer_agent": NodeSpec(inputs=("order",), outputs=("station_split",)),
+        "ai_checker_agent": NodeSpec(
+            inputs=("order", "station_split"), outputs=("assembly_check",)
+        ),
+        "conditional_notifier_agent": NodeSpec(
+            inputs=("assembly_check",), outputs=("chef_alert", "notifier_agent_skipped")
+        ),
+        # Needs the kitchen's ready time to line up runner trips.
+        "delivery_agent": NodeSpec(
+            inputs=("order", "station_split"), outputs=("delivery_assignment",)
+        ),
+    },
 )
 
 
 # -------------------------------------------------------------------
 # 2) PARALLEL BACKGROUND ENRICHMENT
+#    Not part of the request path: process_order() queues one job per
+#    branch for each order once order_flow has finished (see section 5).
 # -------------------------------------------------------------------
 background_enrichment = ParallelAgent(
     name="background_enrichment",
@@ -228,21 +272,20 @@ root_agent = Agent(
     You are Kitchen Agent, orchestrating sub-agents to process customer orders.
 
     1. For ANY user message that mentions or implies an order:
-       - Rely on the SequentialAgent `order_flow`.
+       - Rely on the pipeline agent `order_flow`.
        - The first step, `order_loader_agent`, will ALWAYS produce a shared `order`
          object in the session state under key "order".
        - All subsequent agents in `order_flow` MUST use that `order` and not ask the user
          to re-specify details.
 
-    2. Run `background_enrichment` in parallel to handle:
-       - forecasting_agent
-       - robust_storekeeper_agent
-       - robust_loyalty_agent
-       - robust_feedback_agent
-       - robust_refinement_agent
+    2. Do NOT wait for forecasting, inventory, loyalty, feedback or refinement.
+       That background enrichment is queued automatically after `order_flow`
+       finishes, so reply with the kitchen ticket as soon as the order is processed.
 
     3. Use the provided tools when needed:
        - get_order_details(order_id) to fetch orders from storage
+       - get_order_progress(order_id) to see how far its station jobs have got
+       - dispatch_table_deliveries() to send ready table orders out with runners
        - update_order_status(...) to move through QUEUED -> PREPARING -> ...
        - fetch_inventory() to understand ingredient availability
        - save_system_logs(...) to log important pipeline events
@@ -259,16 +302,19 @@ root_agent = Agent(
 
     sub_agents=[
         order_flow,
-        background_enrichment,
     ],
     tools=[
         FunctionTool(get_order_details),
+        FunctionTool(get_order_progress),
+        FunctionTool(dispatch_table_deliveries),
         FunctionTool(update_order_status),
         FunctionTool(fetch_inventory),
         FunctionTool(save_system_logs),
     ],
     output_key="kitchen_agent_output",
 
+    before_agent_callback=model_credentials_callback,
+
     # 🔒 Attach guardrails
     # before_model_callback=qsr_input_guardrail,
     before_tool_callback=qsr_tool_guardrail,
@@ -310,32 +356,129 @@ root_agent = Agent(
 
 # -------------------------------------------------------------------
 # 4) RUNNER + process_order()
+#    Every order runs in its own session from a bounded pool:
+#      SESSION_POOL_SIZE         live sessions before LRU eviction (default 256)
+#      SESSION_IDLE_TTL_S        idle A2A conversation sessions expire (default 900)
+#      SESSION_COMPLETED_TTL_S   finished one-shot order sessions expire (default 60)
 # -------------------------------------------------------------------
 runner = InMemoryRunner(agent=root_agent)
 
-# CHANGE 1: Add 'async' keyword here
-async def process_order(user_message: str):
+session_pool = SessionPool(
+    runner,
+    max_sessions=int(os.getenv("SESSION_POOL_SIZE", "256")),
+    idle_ttl=float(os.getenv("SESSION_IDLE_TTL_S", "900")),
+    completed_ttl=float(os.getenv("SESSION_COMPLETED_TTL_S", "60")),
+)
+
+
+async def process_order(user_message: str, context_id: Optional[str] = None) -> dict:
     """
-    Run the kitchen agent via InMemoryRunner and return a JSON-serializable response.
+    Run the kitchen agent for one message and return a JSON-serializable response:
+    {"session_id", "conversation", "state", "written_keys", "final_text", "events"}.
+
+    Messages with the same `context_id` (the A2A contextId) share a session;
+    without one, the order gets a fresh session of its own. Enrichment is
+    queued only when this message produced an order, so a follow-up in the
+    same conversation does not enrich the previous message's order again.
     """
-    logger.info("[API] process_order called | user_message=%r", user_message)
+    logger.info("[API] process_order called | context_id=%s | user_message=%r", context_id, user_message)
 
     try:
-        # CHANGE 2: Remove 'asyncio.run()' and use 'await' directly
-        # OLD: result = asyncio.run(runner.run_debug(user_message))
-        result = await runner.run_debug(user_message)
-
-        if hasattr(result, "model_dump"):
-            dumped = result.model_dump()
-            logger.debug("[API] process_order result keys=%s", list(dumped.keys()))
-            return dumped
-
+        result = await session_pool.run(user_message, key=context_id)
+        if "order" in result["written_keys"]:
+            enqueue_background_enrichment(result["state"])
         logger.debug(
-            "[API] process_order raw result type=%s repr=%r",
-            type(result),
-            result,
+            "[API] process_order session=%s events=%d | %s",
+            result["session_id"],
+            result["events"],
+            session_pool.metrics(),
         )
         return result
     except Exception as e:
         logger.exception("[API] process_order failed with error: %s", e)
-        return {"error": str(e)}
\ No newline at end of file
+        return {"error": str(e)}
+
+
+# -------------------------------------------------------------------
+# 5) BACKGROUND ENRICHMENT QUEUE
+#    Each background_enrichment branch runs as its own job, on its own
+#    runner, off the request path, through a bounded job queue. A failed
+#    branch is retried alone, so the branches that succeeded are not
+#    re-run (and their writes are not repeated).
+#      ENRICHMENT_WORKERS       concurrent branch runs (default 10)
+#      ENRICHMENT_QUEUE_SIZE    waiting jobs before new ones are rejected (default 500)
+#      ENRICHMENT_MAX_ATTEMPTS  attempts per job, with exponential backoff (default 3)
+# -------------------------------------------------------------------
+ENRICHMENT_STATE_KEYS = (
+    "order",
+    "queue_assignment",
+    "station_split",
+    "assembly_check",
+    "delivery_assignment",
+)
+
+enrichment_runners = {
+    branch.name: InMemoryRunner(agent=branch, app_name="qsr_enrichment")
+    for branch in background_enrichment.sub_agents
+}
+
+enrichment_queue = JobQueue(
+    "background_enrichment",
+    workers=int(os.getenv("ENRICHMENT_WORKERS", "10")),
+    max_size=int(os.getenv("ENRICHMENT_QUEUE_SIZE", "500")),
+    max_attempts=int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "3")),
+)
+
+
+async def run_background_enrichment(branch: str, order_id: str, snapshot: dict) -> dict:
+    """
+    Run one background_enrichment branch for one processed order in a
+    fresh session seeded with the order_flow results. The session is
+    deleted afterwards; returns its final state.
+    """
+    runner = enrichment_runners[branch]
+    sessions = runner.session_service
+    session = await sessions.create_session(
+        app_name=runner.app_name, user_id="enrichment", state=dict(snapshot)
+    )
+    try:
+        message = types.Content(
+            role="user",
+            parts=[types.Part(text=(
+                f"Run background enrichment for processed order {order_id}:\n"
+                + json.dumps(snapshot, default=str)
+            ))],
+        )
+        async for _ in runner.run_async(
+            user_id="enrichment", session_id=session.id, new_message=message
+        ):
+            pass
+        session = await sessions.get_session(
+            app_name=runner.app_name, user_id="enrichment", session_id=session.id
+        )
+        logger.info("[Enrichment] order=%s branch=%s done | keys=%s", order_id, branch, sorted(session.state))
+        return dict(session.state)
+    finally:
+        await sessions.delete_session(
+            app_name=runner.app_name, user_id="enrichment", session_id=session.id
+        )
+
+
+def enqueue_background_enrichment(state) -> bool:
+    """
+    Queue one enrichment job per branch for the order in `state` (no-op if
+    order_flow produced none). Returns False if any branch was rejected.
+    """
+    snapshot = {k: state[k] for k in ENRICHMENT_STATE_KEYS if k in state}
+    order = decode(snapshot, "order")
+    if order is None:
+        return False
+    order_id = order.order_id
+    accepted = True
+    for branch in enrichment_runners:
+        accepted &= enrichment_queue.submit(
+            f"{order_id}:{branch}",
+            lambda branch=branch: run_background_enrichment(branch, order_id, snapshot),
+        )
+    logger.info("[Enrichment] queued=%s order=%s | %s", accepted, order_id, enrichment_queue.metrics())
+    return accepted
@@ -12,10 +12,138 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import inspect
+import json
+from typing import Optional
+
 from google.adk.agents.callback_context import CallbackContext
-from google.genai.types import Content
+from google.adk.models.llm_response import LlmResponse
+from google.genai.types import Content, Part
+from pydantic import BaseModel
+
+from .output_schemas import coerce_to_schema
+from .response_cache import fingerprint, mask_order_id, unmask_order_id
+from .state_codec import decode
+from .tools import get_response_cache
 
 
 def suppress_output_callback(callback_context: CallbackContext) -> Content:
     """Suppresses the output of the agent by returning an empty Content object."""
     return Content()
+
+
+def structured_output_callback(schema: type[BaseModel], output_key: str):
+    """
+    after_model_callback that repairs an agent's final text against `schema`
+    before ADK parses it into state[output_key].
+
+    - Valid JSON is left untouched.
+    - JSON wrapped in prose or fences, with trailing commas, or with Python
+      literals is rewritten to the validated object, so no retry is needed.
+    - Output that cannot be repaired is blanked (so ADK does not raise while
+      parsing it) and the cause is left in state["<output_key>_parse_error"]
+      for the validation checker to record before it retries.
+    """
+    error_key = f"{output_key}_parse_error"
+
+    def callback(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        content = llm_response.content
+        if llm_response.partial or not content or not content.parts:
+            return None
+        if any(part.function_call for part in content.parts):
+            return None
+        text = "".join(p.text for p in content.parts if p.text and not p.thought)
+        if not text.strip():
+            return None
+
+        value, error, repaired = coerce_to_schema(text, schema)
+        if callback_context.state.get(error_key) is not None:
+            callback_context.state[error_key] = None
+        if error is None and not repaired:
+            return None
+        if error is not None:
+            callback_context.state[error_key] = error
+
+        parts = [p for p in content.parts if p.thought]
+        parts.append(Part(text=json.dumps(value) if value is not None else ""))
+        return llm_response.model_copy(update={"content": Content(role=content.role, parts=parts)})
+
+    return callback
+
+
+def _is_cacheable(llm_response: LlmResponse) -> bool:
+    content = llm_response.content
+    if llm_response.partial or llm_response.error_code or not content or not content.parts:
+        return False
+    return any((p.text and p.text.strip() and not p.thought) or p.function_call for p in content.parts)
+
+
+def enable_response_cache(agent, state_keys: tuple = (), order_scoped: bool = False) -> None:
+    """
+    Opt `agent` in to the shared LLM response cache (tools.get_response_cache).
+
+    A before_model_callback looks the call up by its fingerprint: agent name,
+    resolved instruction, model, tool set, the `state_keys` inputs (without
+    per-order ids and times) and the request from the current user message
+    on. A hit returns the stored LlmResponse without calling the model; tool
+    calls in it still run.
+
+    `order_scoped` agents work on state["order"] and echo its id in tool
+    calls and output. Their requests are keyed with that id masked and their
+    responses stored with it masked; a hit gets the current order's id put
+    back, so an identical order placed later reuses the answer.
+
+    The agent's existing after_model_callbacks run first, and their final
+    response is what gets stored, so hits come back already post-processed.
+    Partial, failed and empty responses are never stored.
+    """
+    pending: "collections.OrderedDict[tuple, str]" = collections.OrderedDict()
+    after_callbacks = list(agent.canonical_after_model_callbacks)
+
+    def lookup(callback_context: CallbackContext, llm_request) -> Optional[LlmResponse]:
+        cache = get_response_cache()
+        if not cache.enabled:
+            return None
+        order_id = _scoped_order_id(callback_context)
+        key = fingerprint(
+            agent.name, llm_request, callback_context.user_content, callback_context.state, state_keys,
+            order_id=order_id,
+        )
+        body = cache.get(key, agent.name)
+        if body is not None:
+            response = LlmResponse.model_validate_json(unmask_order_id(body, order_id))
+            response.custom_metadata = {**(response.custom_metadata or {}), "response_cache": "hit"}
+            return response
+        pending[(callback_context.invocation_id, agent.name)] = key
+        while len(pending) > 256:  # calls that errored never reach `store`
+            pending.popitem(last=False)
+        return None
+
+    async def store(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        altered = None
+        for callback in after_callbacks:
+            result = callback(callback_context=callback_context, llm_response=llm_response)
+            if inspect.isawaitable(result):
+                result = await result
+            if result:
+                altered = result
+                break
+        if llm_response.partial:
+            return altered
+        key = pending.pop((callback_context.invocation_id, agent.name), None)
+        final = altered or llm_response
+        if key is not None and _is_cacheable(final):
+            body = mask_order_id(final.model_dump_json(exclude_none=True), _scoped_order_id(callback_context))
+            get_response_cache().put(key, body, agent.name)
+        return altered
+
+    def _scoped_order_id(callback_context: CallbackContext) -> Optional[str]:
+        if not order_scoped:
+            return None
+        order = decode(callback_context.state, "order")
+        return order.order_id if order else None
+
+    agent.before_model_callback = [lookup] + list(agent.canonical_before_model_callbacks)
+    agent.after_model_callback = store
+
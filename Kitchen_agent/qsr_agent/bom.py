@@ -0,0 +1,157 @@
+import json
+
+import numpy as np
+
+
+class BomEngine:
+    """
+    Bill-of-materials explosion for whole orders.
+
+    recipes.json is loaded once into a dense (items + addons) x ingredients
+    matrix. An order (or a batch of orders) is turned into a count matrix of
+    the same rows, and a single matrix multiply yields the ingredient needs:
+
+        needs[order, ingredient] = counts[order, row] @ recipe[row, ingredient]
+
+    Addons (e.g. "Extra Cheese") are rows of their own that carry ingredient
+    deltas; they are counted once per unit of the item they are attached to.
+
+    Stock is a different key space: inventory.json (the InventoryLedger)
+    counts prepared portions per menu item and addon ("Veg Burger",
+    "Extra Cheese"), not raw ingredients. The "stock" section maps each
+    item or addon to the inventory keys one unit of it draws down, and a
+    second (items + addons) x stock-keys matrix turns an order into ledger
+    deltas the same way. Items or addons without an entry are not stocked.
+
+    recipes.json shape:
+      {
+        "items":  {"Veg Burger": {"Burger Bun": 1, "Veg Patty": 1, ...}, ...},
+        "addons": {"Extra Cheese": {"Cheese Slice": 1}, ...},
+        "stock":  {"Veg Burger": {"Veg Burger": 1}, "Extra Cheese": {"Extra Cheese": 1}, ...}
+      }
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "r") as f:
+            recipes = json.load(f)
+
+        items = recipes.get("items", {})
+        addons = recipes.get("addons", {})
+
+        ingredients = sorted(
+            {ing for recipe in (*items.values(), *addons.values()) for ing in recipe}
+        )
+        self.ingredients: list[str] = ingredients
+        ing_index = {name: i for i, name in enumerate(ingredients)}
+
+        # Rows [0, len(items)) are menu items, the rest are addons.
+        self.item_rows = {name.lower(): i for i, name in enumerate(items)}
+        self.addon_rows = {
+            name.lower(): len(items) + i for i, name in enumerate(addons)
+        }
+
+        self.matrix = np.zeros((len(items) + len(addons), len(ingredients)))
+        for row, recipe in enumerate((*items.values(), *addons.values())):
+            for ing, qty in recipe.items():
+                self.matrix[row, ing_index[ing]] = qty
+
+        # Recipe rows -> inventory.json keys.
+        stock = recipes.get("stock", {})
+        self.stock_keys: list[str] = sorted({key for use in stock.values() for key in use})
+        stock_index = {key: i for i, key in enumerate(self.stock_keys)}
+        self.row_names = [*items, *addons]
+        self.stock_matrix = np.zeros((len(self.row_names), len(self.stock_keys)))
+        for name, use in stock.items():
+            row = self.item_rows.get(name.lower(), self.addon_rows.get(name.lower()))
+            if row is None:
+                raise ValueError(f"recipes.json stock entry {name!r} is not an item or addon")
+            for key, qty in use.items():
+                self.stock_matrix[row, stock_index[key]] = qty
+
+    # ---- core ----
+
+    def _counts(self, orders: list[dict]) -> tuple[np.ndarray, list[list[str]]]:
+        """Build the orders x rows count matrix and collect unknown item/addon names."""
+        order_idx, row_idx, qtys = [], [], []
+        unmatched: list[list[str]] = []
+
+        for o, order in enumerate(orders):
+            missing = []
+            for item in order.get("items") or []:
+                name = item.get("name") or item.get("item_name") or ""
+                qty = item.get("quantity", 1) or 1
+
+                row = self.item_rows.get(name.lower())
+                if row is None:
+                    missing.append(name)
+                else:
+                    order_idx.append(o)
+                    row_idx.append(row)
+                    qtys.append(qty)
+
+                for addon in item.get("addons") or []:
+                    addon_row = self.addon_rows.get(str(addon).lower())
+                    if addon_row is None:
+                        missing.append(str(addon))
+                        continue
+                    order_idx.append(o)
+                    row_idx.append(addon_row)
+                    qtys.append(qty)
+            unmatched.append(missing)
+
+        counts = np.zeros((len(orders), self.matrix.shape[0]))
+        if qtys:
+            np.add.at(counts, (np.array(order_idx), np.array(row_idx)), np.array(qtys, dtype=float))
+        return counts, unmatched
+
+    def requirements(self, orders: list[dict]) -> tuple[np.ndarray, list[list[str]]]:
+        """Return the orders x ingredients needs matrix and per-order unmatched names."""
+        counts, unmatched = self._counts(orders)
+        return counts @ self.matrix, unmatched
+
+    # ---- dict helpers for tools ----
+
+    def _to_dict(self, row: np.ndarray) -> dict:
+        nz = np.nonzero(row)[0]
+        return {self.ingredients[i]: float(row[i]) for i in nz}
+
+    def explode(self, order: dict) -> dict:
+        """Aggregated ingredient needs for a single order."""
+        needs, unmatched = self.requirements([order])
+        return {"ingredients": self._to_dict(needs[0]), "unmatched_items": unmatched[0]}
+
+    def stock_deltas(self, order: dict) -> dict:
+        """
+        InventoryLedger deltas (negative, in inventory.json keys) for a single
+        order, plus the ordered items/addons that have no stock entry.
+        """
+        counts, unmatched = self._counts([order])
+        used = counts[0] @ self.stock_matrix
+        unstocked = [
+            self.row_names[row]
+            for row in np.nonzero(counts[0])[0]
+            if not self.stock_matrix[row].any()
+        ]
+        return {
+            "deltas": {
+                self.stock_keys[i]: -(int(used[i]) if float(used[i]).is_integer() else float(used[i]))
+                for i in np.nonzero(used)[0]
+            },
+            "unstocked": unstocked,
+            "unmatched_items": unmatched[0],
+        }
+
+    def explode_batch(self, orders: list[dict]) -> dict:
+        """Per-order and total ingredient needs for a batch of orders."""
+        needs, unmatched = self.requirements(orders)
+        return {
+            "total": self._to_dict(needs.sum(axis=0)),
+            "per_order": {
+                order.get("order_id", str(i)): {
+                    "ingredients": self._to_dict(needs[i]),
+                    "unmatched_items": unmatched[i],
+                }
+                for i, order in enumerate(orders)
+            },
+        }
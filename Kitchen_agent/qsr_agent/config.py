@@ -63,11 +63,10 @@
 # limitations under the License.
 
 import os
+import threading
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
-import google.auth
-
 load_dotenv()
 
 
@@ -75,27 +74,49 @@ load_dotenv()
 # Read environment variable to determine if Vertex AI should be used
 USE_VERTEX = os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "True").lower() == "true"
 
-if USE_VERTEX:
-    # ---------------------------
-    # Vertex AI Mode (requires ADC)
-    # ---------------------------
-    try:
-        credentials, project_id = google.auth.default()
-        os.environ.setdefault("GOOGLE_CLOUD_PROJECT", project_id)
-        os.environ["GOOGLE_CLOUD_LOCATION"] = "global"
-    except Exception as e:
-        raise RuntimeError(
-            "Vertex AI mode is enabled, but Google Cloud ADC credentials "
-            "were not found. Set GOOGLE_GENAI_USE_VERTEXAI=FALSE to use API Key mode.\n"
-            f"Original error: {e}"
-        )
-else:
+os.environ["GOOGLE_CLOUD_LOCATION"] = "global"
+if not USE_VERTEX:
     # ---------------------------
     # API KEY MODE (NO CREDENTIALS NEEDED)
     # ---------------------------
     # Dummy project id — not used, but required by ADK runtime
     os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "api-key-mode")
-    os.environ["GOOGLE_CLOUD_LOCATION"] = "global"
+
+
+_credentials_lock = threading.Lock()
+_credentials_checked = False
+
+
+def ensure_model_credentials() -> None:
+    """
+    Resolve Vertex AI credentials on first use instead of at import time.
+
+    google.auth.default() can probe the metadata server and is slow when no
+    credentials exist, so it only runs the first time a model is about to be
+    called (and not at all in API key mode or when GOOGLE_CLOUD_PROJECT is set).
+    """
+    global _credentials_checked
+    if _credentials_checked:
+        return
+    with _credentials_lock:
+        if _credentials_checked:
+            return
+        if USE_VERTEX and not os.getenv("GOOGLE_CLOUD_PROJECT"):
+            # ---------------------------
+            # Vertex AI Mode (requires ADC)
+            # ---------------------------
+            import google.auth
+
+            try:
+                credentials, project_id = google.auth.default()
+                os.environ.setdefault("GOOGLE_CLOUD_PROJECT", project_id)
+            except Exception as e:
+                raise RuntimeError(
+                    "Vertex AI mode is enabled, but Google Cloud ADC credentials "
+                    "were not found. Set GOOGLE_GENAI_USE_VERTEXAI=FALSE to use API Key mode.\n"
+                    f"Original error: {e}"
+                )
+        _credentials_checked = True
 
 
 @dataclass
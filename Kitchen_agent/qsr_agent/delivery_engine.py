@@ -0,0 +1,189 @@
+import datetime
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class PendingDelivery:
+    order_id: str
+    table: str
+    zone: str
+    ready_at: float          # minutes on the dispatcher clock
+
+
+def _now_minutes() -> float:
+    return time.time() / 60.0
+
+
+def _iso(minutes: float) -> str:
+    return datetime.datetime.fromtimestamp(minutes * 60.0).isoformat(timespec="seconds")
+
+
+class TableDispatcher:
+    """
+    Batches table deliveries into staff runner trips.
+
+    floor_map.json places the pass (where runners pick up food) and every
+    table on a 2-D floor plan and assigns tables to zones. The full
+    pass+tables distance matrix is computed once with NumPy broadcasting.
+
+    Orders waiting for a runner are grouped by zone. Within a zone, a trip
+    starts at the pass and repeatedly visits the nearest unvisited table
+    (a masked argmin over one matrix row per step) until the runner holds
+    `runner_capacity` orders, then returns to the pass. Orders for the same
+    table share a stop.
+
+    A pending delivery that is still undispatched `ttl_minutes` after its
+    ready time is dropped, so orders whose delivery or completion is never
+    reported (e.g. TEMP orders that are not persisted) cannot pile up.
+    """
+
+    def __init__(self, floor_map_path: str, wave_window: float = 2.0, ttl_minutes: Optional[float] = 60.0):
+        with open(floor_map_path, "r") as f:
+            floor = json.load(f)
+
+        self.version = floor.get("version", 1)
+        self.runner_capacity = int(floor.get("runner_capacity", 4))
+        self.speed = float(floor.get("runner_speed_m_per_min", 60.0))
+        self.handoff = float(floor.get("handoff_min", 0.5))
+        self.wave_window = wave_window
+        self.ttl_minutes = ttl_minutes
+
+        tables = floor.get("tables", {})
+        self.tables: list[str] = list(tables)
+        self.zone_of: dict[str, str] = {t: spec.get("zone", "main") for t, spec in tables.items()}
+        # Row/column 0 is the pass; table i lives at index i + 1.
+        self._index = {t: i + 1 for i, t in enumerate(self.tables)}
+        points = np.array([floor.get("pass", [0.0, 0.0])] + [tables[t]["xy"] for t in self.tables], dtype=float)
+        self.distance = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=-1)
+
+        self._lock = threading.Lock()
+        self._pending: dict[str, PendingDelivery] = {}
+        self.expired = 0
+
+    # ---- pending deliveries ----
+
+    def known_tables(self) -> set:
+        return set(self.tables)
+
+    def add(self, order_id: str, table: str, ready_at: Optional[float] = None) -> PendingDelivery:
+        table = str(table)
+        if table not in self._index:
+            raise KeyError(f"Table {table} is not on the floor map")
+        entry = PendingDelivery(
+            order_id=order_id,
+            table=table,
+            zone=self.zone_of[table],
+            ready_at=_now_minutes() if ready_at is None else ready_at,
+        )
+        with self._lock:
+            self._expire(_now_minutes())
+            self._pending[order_id] = entry
+        return entry
+
+    def remove(self, order_id: str) -> bool:
+        with self._lock:
+            return self._pending.pop(order_id, None) is not None
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop deliveries left undispatched ttl_minutes past their ready time."""
+        with self._lock:
+            return self._expire(_now_minutes() if now is None else now)
+
+    def _expire(self, now: float) -> int:
+        if not self.ttl_minutes:
+            return 0
+        stale = [d.order_id for d in self._pending.values() if d.ready_at + self.ttl_minutes <= now]
+        for order_id in stale:
+            del self._pending[order_id]
+        self.expired += len(stale)
+        return len(stale)
+
+    # ---- routing ----
+
+    def _route(self, stops: list[str]) -> tuple[list[str], float]:
+        """Nearest-neighbour tour pass -> stops -> pass; returns (table order, metres)."""
+        idx = np.array([self._index[t] for t in stops])
+        unvisited = np.ones(len(idx), dtype=bool)
+        here, total, order = 0, 0.0, []
+        for _ in range(len(idx)):
+            row = np.where(unvisited, self.distance[here, idx], np.inf)
+            nxt = int(np.argmin(row))
+            unvisited[nxt] = False
+            total += row[nxt]
+            here = idx[nxt]
+            order.append(stops[nxt])
+        total += self.distance[here, 0]
+        return order, float(total)
+
+    def _trips(self, deliveries: list[PendingDelivery]) -> list[dict]:
+        by_zone: dict[str, list[PendingDelivery]] = {}
+        for d in sorted(deliveries, key=lambda d: d.ready_at):
+            by_zone.setdefault(d.zone, []).append(d)
+
+        trips = []
+        for zone, group in sorted(by_zone.items()):
+            # Earliest-ready orders go first; each trip carries runner_capacity orders.
+            for start in range(0, len(group), self.runner_capacity):
+                load = group[start:start + self.runner_capacity]
+                tables = list(dict.fromkeys(d.table for d in load))
+                sequence, metres = self._route(tables)
+                solo = float(2 * self.distance[0, [self._index[d.table] for d in load]].sum())
+                depart = max(d.ready_at for d in load)
+                by_table: dict[str, list[str]] = {}
+                for d in load:
+                    by_table.setdefault(d.table, []).append(d.order_id)
+                trips.append({
+                    "zone": zone,
+                    "stops": [{"table": t, "order_ids": by_table[t]} for t in sequence],
+                    "distance_m": round(metres, 1),
+                    "solo_distance_m": round(solo, 1),
+                    "depart_at": _iso(depart),
+                    "duration_min": round(metres / self.speed + self.handoff * len(sequence), 1),
+                })
+        return trips
+
+    def plan(self, ready_by: Optional[float] = None) -> list[dict]:
+        """Runner trips for every pending delivery ready by `ready_by` (without dispatching)."""
+        ready_by = _now_minutes() if ready_by is None else ready_by
+        with self._lock:
+            self._expire(_now_minutes())
+            due = [d for d in self._pending.values() if d.ready_at <= ready_by]
+        return self._trips(due)
+
+    def trip_for(self, order_id: str) -> Optional[dict]:
+        """The tentative trip of one order: its zone-mates ready within the wave window."""
+        with self._lock:
+            me = self._pending.get(order_id)
+            if me is None:
+                return None
+            wave = [
+                d for d in self._pending.values()
+                if d.zone == me.zone and abs(d.ready_at - me.ready_at) <= self.wave_window
+            ]
+        for trip in self._trips(wave):
+            if any(order_id in stop["order_ids"] for stop in trip["stops"]):
+                return trip
+        return None
+
+    def dispatch(self, now: Optional[float] = None) -> dict:
+        """Hand every ready delivery to runners and drop them from the pending set."""
+        now = _now_minutes() if now is None else now
+        with self._lock:
+            self._expire(now)
+            due = [d for d in self._pending.values() if d.ready_at <= now]
+            for d in due:
+                del self._pending[d.order_id]
+        trips = self._trips(due)
+        return {
+            "trips": trips,
+            "orders": len(due),
+            "solo_trips": len(due),
+            "distance_m": round(sum(t["distance_m"] for t in trips), 1),
+            "solo_distance_m": round(sum(2 * float(self.distance[0, self._index[d.table]]) for d in due), 1),
+        }
@@ -0,0 +1,63 @@
+from typing import Optional
+
+# Delivery-mode rules. Kept free of NumPy so the delivery agent can import
+# them without loading the table dispatcher (delivery_engine).
+
+PICKUP = "pickup"
+TABLE_DELIVERY = "table_delivery"
+DRONE_DELIVERY = "drone_delivery"
+
+PICKUP_PREFERENCES = {"pickup", "takeaway", "take-away", "takeout", "to-go", "counter"}
+TABLE_PREFERENCES = {
+    "table", "table_delivery", "staff_delivery", "staff", "dining", "dine_in", "dine-in",
+}
+DRONE_PREFERENCES = {"drone", "drone_delivery"}
+
+
+def _table_number(order: dict) -> Optional[str]:
+    raw = order.get("table_number", order.get("table"))
+    if raw is None or str(raw).strip() in ("", "null", "None"):
+        return None
+    return str(raw).strip()
+
+
+def classify_delivery(order: dict, known_tables: Optional[set] = None) -> dict:
+    """
+    Map an order's delivery preference and table number to a delivery mode.
+
+    Rules (first match wins):
+      - drone preference                    -> drone_delivery, table ignored
+      - pickup / takeaway preference        -> pickup
+      - a table number on the floor map     -> table_delivery
+      - dine-in preference without a table  -> pickup at the counter
+      - anything else                       -> pickup
+    No table number is ever invented.
+    """
+    preference = str(
+        order.get("delivery_preference") or order.get("delivery_mode") or ""
+    ).strip().lower()
+    table = _table_number(order)
+    if table is not None and known_tables is not None and table not in known_tables:
+        unknown_table, table = table, None
+    else:
+        unknown_table = None
+
+    if preference in DRONE_PREFERENCES:
+        mode, table, reason = DRONE_DELIVERY, None, "Drone delivery requested."
+    elif preference in PICKUP_PREFERENCES:
+        mode, table, reason = PICKUP, None, f"Customer collects ({preference})."
+    elif table is not None:
+        mode, reason = TABLE_DELIVERY, f"Staff delivers to table {table}."
+    elif unknown_table is not None:
+        mode, reason = PICKUP, f"Table {unknown_table} is not on the floor map; collect at the counter."
+    elif preference in TABLE_PREFERENCES:
+        mode, reason = PICKUP, "Dine-in order without a table number; collect at the counter."
+    else:
+        mode, reason = PICKUP, "No delivery preference given; defaulting to pickup."
+
+    return {
+        "order_id": order.get("order_id") or "UNKNOWN_ORDER",
+        "delivery_mode": mode,
+        "table_number": table,
+        "reason": reason,
+    }
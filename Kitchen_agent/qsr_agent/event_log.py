@@ -0,0 +1,203 @@
+import asyncio
+import atexit
+import datetime
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+
+class EventLogger:
+    """
+    Buffered, structured event sink for pipeline logs.
+
+    - `log()` only appends a timestamped record to an in-memory buffer, so it
+      is safe to call from inside the async agent loop.
+    - When an event loop is running, a background task flushes the buffer in
+      batches (every `flush_interval` seconds, or early once `batch_size`
+      records are waiting), with the file I/O pushed to a worker thread.
+      Without a loop, the buffer is flushed synchronously at `batch_size`.
+    - The JSONL file is rotated to `<path>.1`, `<path>.2`, ... once it grows
+      past `max_bytes` or is older than `rotate_interval` seconds.
+    - `query()` tails the log backwards, so it never reads the whole file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_bytes: int = 5 * 1024 * 1024,
+        rotate_interval: Optional[float] = None,
+        backup_count: int = 5,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+
+        self._buffer: list[dict] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._opened_at = time.time()
+
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+
+        atexit.register(self.flush)
+
+    # ---- producer side ----
+
+    def log(self, event: str, order_id: Optional[str] = None, agent: Optional[str] = None, **fields) -> dict:
+        """Buffer one event and return the structured record."""
+        record = {
+            "ts": datetime.datetime.now().isoformat(),
+            "event": event,
+            "order_id": order_id,
+            "agent": agent,
+            **fields,
+        }
+        with self._lock:
+            self._buffer.append(record)
+            backlog = len(self._buffer)
+
+        if self._ensure_flusher():
+            if backlog >= self.batch_size:
+                self._loop.call_soon_threadsafe(self._wake.set)
+        elif backlog >= self.batch_size:
+            self.flush()
+        return record
+
+    def _ensure_flusher(self) -> bool:
+        """Start the background flush task on the running loop, if there is one."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called from a worker thread or sync code: rely on size-based flushing
+            # (and on an existing flusher task, if another loop started one).
+            return self._task is not None and not self._task.done()
+
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._wake = asyncio.Event()
+            self._task = loop.create_task(self._flush_loop())
+        return True
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self._buffer:
+                await asyncio.to_thread(self.flush)
+
+    # ---- writer side ----
+
+    def flush(self) -> None:
+        """Write all buffered records to disk in one append."""
+        # The write lock is held across the swap so concurrent flushes keep order.
+        with self._write_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+
+            payload = "".join(json.dumps(r) + "\n" for r in batch)
+            self._maybe_rotate()
+            with open(self.path, "a") as f:
+                f.write(payload)
+
+    def _maybe_rotate(self) -> None:
+        if not os.path.exists(self.path):
+            self._opened_at = time.time()
+            return
+        too_big = os.path.getsize(self.path) >= self.max_bytes
+        too_old = (
+            self.rotate_interval is not None
+            and time.time() - self._opened_at >= self.rotate_interval
+        )
+        if not (too_big or too_old):
+            return
+
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._opened_at = time.time()
+
+    # ---- queries ----
+
+    @staticmethod
+    def _read_backwards(path: str, block_size: int = 64 * 1024):
+        """Yield the lines of `path` from last to first, reading fixed-size blocks."""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            remainder = b""
+            while position > 0:
+                step = min(block_size, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step) + remainder
+                lines = chunk.split(b"\n")
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if remainder.strip():
+                yield remainder
+
+    def query(
+        self,
+        limit: int = 50,
+        order_id: Optional[str] = None,
+        agent: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        Return the newest `limit` matching events, oldest first.
+        Unflushed events are included; rotated files are only opened if needed.
+        """
+        def matches(record: dict) -> bool:
+            return (
+                (order_id is None or record.get("order_id") == order_id)
+                and (agent is None or record.get("agent") == agent)
+            )
+
+        found: list[dict] = []
+        with self._lock:
+            pending = list(self._buffer)
+        for record in reversed(pending):
+            if since and record["ts"] < since:
+                return list(reversed(found))
+            if matches(record):
+                found.append(record)
+                if len(found) >= limit:
+                    return list(reversed(found))
+
+        files = [self.path] + [f"{self.path}.{i}" for i in range(1, self.backup_count + 1)]
+        for path in files:
+            if not os.path.exists(path):
+                continue
+            for line in self._read_backwards(path):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if since and record.get("ts", "") < since:
+                    return list(reversed(found))
+                if matches(record):
+                    found.append(record)
+                    if len(found) >= limit:
+                        return list(reversed(found))
+        return list(reversed(found))
@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+import threading
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_entry(entry: dict) -> dict:
+    """
+    One feedback entry in the current shape {"user", "feedback", "time", ...}.
+    Legacy feedback.json entries used "customer_id" / "text" and had no
+    "time"; their time reads as None.
+    """
+    entry = dict(entry)
+    user = entry.pop("customer_id", None)
+    text = entry.pop("text", None)
+    if entry.get("user") is None:
+        entry["user"] = user
+    if entry.get("feedback") is None:
+        entry["feedback"] = text
+    entry.setdefault("time", None)
+    return entry
+
+
+class FeedbackStore:
+    """
+    Customer feedback kept as append-only JSONL.
+
+    - `append` writes one line, independent of how much history exists.
+    - `iter_entries` is a generator that streams entries from a byte-offset
+      cursor, so callers never hold the whole history in memory. Entries
+      come out normalised (see normalize_entry), whatever shape they were
+      written in.
+    - `iter_newest` streams the same entries newest first, reading blocks
+      backwards from the end of the file, so recent feedback costs the same
+      however long the history is.
+    - `page` wraps either into `since` / `limit` / `cursor` pagination for tools.
+    """
+
+    def __init__(self, path: str, seed_path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fh = None
+
+        if not os.path.exists(path) and seed_path:
+            self._seed_from_json(seed_path)
+
+    def _seed_from_json(self, seed_path: str) -> None:
+        """One-off migration from the legacy feedback.json array."""
+        if not os.path.exists(seed_path):
+            return
+        try:
+            with open(seed_path, "r") as f:
+                entries = json.load(f)
+        except json.JSONDecodeError:
+            logger.warning("[FeedbackStore] Could not parse %s, starting empty", seed_path)
+            return
+        if not isinstance(entries, list):
+            return
+        with open(self.path, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+
+    # ---- writes ----
+
+    def append(self, entry: dict) -> None:
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self.path, "a")
+            self._fh.write(json.dumps(entry) + "\n")
+            self._fh.flush()
+
+    # ---- reads ----
+
+    def iter_entries(
+        self, cursor: int = 0, since: Optional[str] = None
+    ) -> Iterator[tuple[int, dict]]:
+        """
+        Yield (next_cursor, entry) pairs starting at byte offset `cursor`.
+
+        Parameters:
+          cursor: Byte offset returned by a previous read; 0 starts from the top.
+          since: ISO timestamp; entries older than it are skipped. Entries
+            without a time (legacy ones) cannot be placed and are kept.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(cursor)
+            offset = cursor
+            for raw in f:
+                offset += len(raw)
+                entry = self._decode(raw)
+                if entry is None:
+                    continue
+                if since and entry["time"] and entry["time"] < since:
+                    continue
+                yield offset, entry
+
+    def iter_newest(
+        self, cursor: Optional[int] = None, since: Optional[str] = None, block_size: int = 64 * 1024
+    ) -> Iterator[tuple[int, dict]]:
+        """
+        Yield (next_cursor, entry) pairs newest first, from the lines that end
+        before byte offset `cursor` (None starts at the end of the file).
+
+        Entries are appended in time order, so the scan stops at the first
+        entry older than `since` instead of reading the rest of the file.
+        Untimed legacy entries sit at the top and are only reached without
+        `since`.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell() if cursor is None else min(cursor, f.tell())
+            remainder = b""
+            while position > 0:
+                step = min(block_size, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step) + remainder
+                lines = chunk.split(b"\n")
+                # The first piece may be the tail of an earlier line, unless
+                # the top of the file has been reached.
+                remainder = lines.pop(0) if position > 0 else b""
+                start = position + len(remainder) + (1 if position > 0 else 0)
+                starts = []
+                for raw in lines:
+                    starts.append(start)
+                    start += len(raw) + 1
+                for offset, raw in zip(reversed(starts), reversed(lines)):
+                    entry = self._decode(raw)
+                    if entry is None:
+                        continue
+                    if since and entry["time"] and entry["time"] < since:
+                        return
+                    yield offset, entry
+
+    @staticmethod
+    def _decode(raw: bytes) -> Optional[dict]:
+        line = raw.strip()
+        if not line:
+            return None
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        return normalize_entry(entry) if isinstance(entry, dict) else None
+
+    def page(
+        self,
+        since: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> dict:
+        """
+        Return up to `limit` entries plus the cursor to continue from.
+        Oldest first by default; `newest_first` pages back from the end of
+        the history instead. `next_cursor` is None once there is nothing
+        further to read. Raises ValueError if `limit` is below 1.
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        if newest_first:
+            entries = []
+            for offset, entry in self.iter_newest(cursor=cursor, since=since):
+                if len(entries) == limit:
+                    return {"feedback": entries, "next_cursor": cursor}
+                entries.append(entry)
+                cursor = offset
+            return {"feedback": entries, "next_cursor": None}
+
+        cursor = cursor or 0
+        entries = []
+        next_cursor = None
+        for offset, entry in self.iter_entries(cursor=cursor, since=since):
+            if len(entries) == limit:
+                next_cursor = cursor
+                break
+            entries.append(entry)
+            cursor = offset
+        return {"feedback": entries, "next_cursor": next_cursor}
@@ -0,0 +1,184 @@
+import datetime
+import json
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+class ForecastEngine:
+    """
+    Demand forecasting for every menu item at once.
+
+    historical_orders.json is aggregated once into an items x days matrix of
+    sold quantities. Completed orders are folded in incrementally through
+    `record_order`, and forecasts are cached until new data arrives.
+
+    Fitting runs additive Holt-Winters with weekly seasonality (period 7 on
+    daily totals) over all items simultaneously: the time loop is in Python,
+    but each step updates the level/trend/season of every item as one NumPy
+    vector operation. Histories shorter than two full seasons fall back to
+    Holt's linear trend method.
+    """
+
+    SEASON = 7
+
+    def __init__(
+        self,
+        history_path: str,
+        alpha: float = 0.5,
+        beta: float = 0.1,
+        gamma: float = 0.3,
+    ):
+        self.history_path = history_path
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+
+        self._lock = threading.Lock()
+        self.items: list[str] = []
+        self._item_index: dict[str, int] = {}
+        self._start: Optional[datetime.date] = None
+        self._counts = np.zeros((0, 0))
+        self._seen_orders: set[str] = set()
+
+        self._version = 0
+        self._cache: dict[int, tuple[int, dict]] = {}
+
+        self._load_history()
+
+    # ---- aggregation ----
+
+    def _load_history(self) -> None:
+        if not os.path.exists(self.history_path):
+            return
+        with open(self.history_path, "r") as f:
+            orders = json.load(f)
+        for order in orders if isinstance(orders, list) else []:
+            self._add(order)
+        self._version += 1
+
+    @staticmethod
+    def _order_date(order: dict) -> datetime.date:
+        try:
+            return datetime.datetime.fromisoformat(order["time"]).date()
+        except (KeyError, TypeError, ValueError):
+            return datetime.date.today()
+
+    def _ensure_shape(self, n_items: int, day: int) -> int:
+        """Grow the count matrix to fit `n_items` rows and column `day`; returns the column."""
+        rows, cols = self._counts.shape
+        if day < 0:
+            # Order predates the current window: shift everything right.
+            pad = np.zeros((rows, -day))
+            self._counts = np.hstack([pad, self._counts])
+            self._start -= datetime.timedelta(days=-day)
+            cols, day = cols - day, 0
+        if n_items > rows or day >= cols:
+            grown = np.zeros((max(n_items, rows), max(day + 1, cols)))
+            grown[:rows, :cols] = self._counts
+            self._counts = grown
+        return day
+
+    def _add(self, order: dict) -> bool:
+        """Fold `order` into the counts. Returns False if it was already counted."""
+        order_id = order.get("order_id")
+        if order_id:
+            if order_id in self._seen_orders:
+                return False
+            self._seen_orders.add(order_id)
+
+        date = self._order_date(order)
+        if self._start is None:
+            self._start = date
+
+        for item in order.get("items") or []:
+            name = item.get("name")
+            if not name:
+                continue
+            if name not in self._item_index:
+                self._item_index[name] = len(self.items)
+                self.items.append(name)
+            day = self._ensure_shape(len(self.items), (date - self._start).days)
+            self._counts[self._item_index[name], day] += item.get("quantity", 1) or 1
+        return True
+
+    def record_order(self, order: dict) -> bool:
+        """
+        Fold one completed order into the series and invalidate cached
+        forecasts. An order already counted (same order_id) is ignored and
+        leaves the cache intact. Returns whether the series changed.
+        """
+        with self._lock:
+            if not self._add(order):
+                return False
+            self._version += 1
+            return True
+
+    # ---- fitting ----
+
+    def _fit(self, y: np.ndarray, periods: int) -> tuple[np.ndarray, str]:
+        """Vectorized Holt-Winters over all rows of y (items x days)."""
+        n, t_len = y.shape
+        m = self.SEASON
+        seasonal = t_len >= 2 * m
+
+        if seasonal:
+            level = y[:, :m].mean(axis=1)
+            trend = (y[:, m:2 * m].mean(axis=1) - level) / m
+            season = y[:, :m] - level[:, None]
+        else:
+            level = y[:, 0].copy()
+            trend = (y[:, 1] - y[:, 0]) if t_len >= 2 else np.zeros(n)
+            season = np.zeros((n, 1))
+            m = 1
+
+        a, b, g = self.alpha, self.beta, self.gamma
+        for t in range(t_len):
+            s = season[:, t % m]
+            prev_level = level
+            level = a * (y[:, t] - s) + (1 - a) * (level + trend)
+            trend = b * (level - prev_level) + (1 - b) * trend
+            if seasonal:
+                season[:, t % m] = g * (y[:, t] - level) + (1 - g) * s
+
+        h = np.arange(1, periods + 1)
+        forecast = level[:, None] + h[None, :] * trend[:, None]
+        forecast += season[:, (t_len + h - 1) % m]
+        return np.clip(forecast, 0, None), "holt_winters" if seasonal else "holt_linear"
+
+    def forecast(self, periods: int = 7) -> dict:
+        """Return per-item and total forecasts for the next `periods` days."""
+        with self._lock:
+            cached = self._cache.get(periods)
+            if cached and cached[0] == self._version:
+                return cached[1]
+
+            if not self.items:
+                return {"error": "No order history available to forecast."}
+
+            y = self._counts
+            yhat, method = self._fit(y, periods)
+            last_day = self._start + datetime.timedelta(days=y.shape[1] - 1)
+            dates = [
+                (last_day + datetime.timedelta(days=i)).strftime("%Y-%m-%d")
+                for i in range(1, periods + 1)
+            ]
+            result = {
+                "method": method,
+                "history_days": int(y.shape[1]),
+                "forecast": [
+                    {"ds": ds, "yhat": round(float(v), 2)}
+                    for ds, v in zip(dates, yhat.sum(axis=0))
+                ],
+                "items": {
+                    name: [
+                        {"ds": ds, "yhat": round(float(v), 2)}
+                        for ds, v in zip(dates, yhat[i])
+                    ]
+                    for i, name in enumerate(self.items)
+                },
+            }
+            self._cache[periods] = (self._version, result)
+            return result
@@ -0,0 +1,116 @@
+import collections
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+from .storage_utils import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryLedger:
+    """
+    Single-writer inventory ledger over inventory.json.
+
+    - Current stock per item is cached in memory, so reads never touch disk.
+    - All writes go through one lock, so concurrent storekeeper runs
+      (ParallelAgent branches, overlapping A2A requests) cannot lose updates.
+    - A whole batch of deltas is persisted with a single atomic file write.
+    - `version` increases on every successful write and can be used as a
+      compare-and-set token by callers that read, think, then write.
+    - A write with an `idempotency_key` (e.g. the order id) happens at most
+      once: repeating it returns the first result, so retried agent runs
+      cannot deduct the same order twice. The last `max_idempotency_keys`
+      keys are remembered for the life of the process.
+    """
+
+    def __init__(self, path: str, max_idempotency_keys: int = 10000):
+        self.path = path
+        self.max_idempotency_keys = max_idempotency_keys
+        self._lock = threading.Lock()
+        self._stock: dict[str, float] = self._load()
+        self._applied: "collections.OrderedDict[str, dict]" = collections.OrderedDict()
+        self.version = 0
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            logger.warning("[InventoryLedger] Could not parse %s, starting empty", self.path)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    # ---- reads (memory only) ----
+
+    def snapshot(self) -> dict:
+        """Return a copy of the current stock levels."""
+        return dict(self._stock)
+
+    def get(self, item: str) -> float:
+        return self._stock.get(item, 0)
+
+    # ---- writes ----
+
+    def apply_deltas(
+        self,
+        deltas: dict,
+        expected_version: Optional[int] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> dict:
+        """
+        Apply several stock changes in one atomic write.
+
+        Parameters:
+          deltas: {item: qty} where negative qty deducts and positive qty restocks.
+          expected_version: If given, the write only happens when the ledger is
+            still at this version (compare-and-set); otherwise a conflict is returned.
+          idempotency_key: If given and already applied, nothing is written and
+            the first result is returned with "duplicate": True.
+
+        Stock never goes below zero; items that were clamped are reported.
+        """
+        with self._lock:
+            if idempotency_key is not None and idempotency_key in self._applied:
+                return {**self._applied[idempotency_key], "duplicate": True}
+
+            if expected_version is not None and expected_version != self.version:
+                return {
+                    "applied": False,
+                    "conflict": True,
+                    "version": self.version,
+                    "message": "Inventory changed since it was read; re-read and retry.",
+                }
+
+            new_stock = dict(self._stock)
+            updated = {}
+            clamped = []
+            for item, qty in deltas.items():
+                target = new_stock.get(item, 0) + qty
+                if target < 0:
+                    clamped.append(item)
+                    target = 0
+                new_stock[item] = target
+                updated[item] = target
+
+            if updated:
+                # Persist first; the cache only moves once the file is safely replaced.
+                atomic_write_json(self.path, new_stock)
+                self._stock = new_stock
+                self.version += 1
+
+            result = {
+                "applied": True,
+                "version": self.version,
+                "updated": updated,
+                "clamped": clamped,
+            }
+            if idempotency_key is not None:
+                self._applied[idempotency_key] = result
+                while len(self._applied) > self.max_idempotency_keys:
+                    self._applied.popitem(last=False)
+            return result
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    job_id: str
+    run: Callable[[], Awaitable[object]]
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class JobQueue:
+    """
+    Bounded in-process job queue with a fixed asyncio worker pool.
+
+    - `submit()` never blocks the caller: when `max_size` jobs are already
+      waiting, the job is rejected (and counted) instead of slowing down the
+      request that produced it.
+    - `workers` tasks pull jobs concurrently; they are started lazily on the
+      running event loop (and restarted if the loop changes).
+    - A failing job is retried up to `max_attempts` times with exponential
+      backoff plus jitter (`backoff_base * 2**n`, capped at `backoff_max`).
+      Backoff sleeps happen off the queue, so one retrying job does not
+      hold a worker.
+    - `metrics()` reports depth, in-flight count and outcome counters.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int = 2,
+        max_size: int = 100,
+        max_attempts: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+    ):
+        self.name = name
+        self.workers = workers
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: list[asyncio.Task] = []
+        self._retry_tasks: set[asyncio.Task] = set()
+
+        self._in_flight = 0
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "retried": 0, "rejected": 0}
+        self._max_depth = 0
+        self._last_error: Optional[str] = None
+        self._started = 0
+        self._wait_total = 0.0
+
+    # ---- producer side ----
+
+    def submit(self, job_id: str, run: Callable[[], Awaitable[object]]) -> bool:
+        """Enqueue `run` (a coroutine factory). Returns False if the queue is full."""
+        self._ensure_workers()
+        if self._queue.qsize() >= self.max_size:
+            self._counters["rejected"] += 1
+            logger.warning("[%s] queue full (%d); rejected job %s", self.name, self.max_size, job_id)
+            return False
+        self._queue.put_nowait(Job(job_id, run))
+        self._counters["submitted"] += 1
+        self._max_depth = max(self._max_depth, self._queue.qsize())
+        return True
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            # Unbounded underneath: the size limit applies to new submissions
+            # only, so accepted jobs can always be re-queued for a retry.
+            self._queue = asyncio.Queue()
+            self._tasks = []
+        self._tasks = [t for t in self._tasks if not t.done()]
+        for i in range(len(self._tasks), self.workers):
+            self._tasks.append(loop.create_task(self._worker(i), name=f"{self.name}-worker-{i}"))
+
+    # ---- worker side ----
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            self._in_flight += 1
+            try:
+                if job.attempts == 0:
+                    self._started += 1
+                    self._wait_total += time.monotonic() - job.enqueued_at
+                job.attempts += 1
+                await job.run()
+                self._counters["completed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = f"{job.job_id}: {e}"
+                if job.attempts < self.max_attempts:
+                    self._counters["retried"] += 1
+                    delay = min(self.backoff_base * 2 ** (job.attempts - 1), self.backoff_max)
+                    delay *= random.uniform(0.5, 1.0)
+                    logger.warning(
+                        "[%s] job %s failed (attempt %d/%d), retrying in %.1fs: %s",
+                        self.name, job.job_id, job.attempts, self.max_attempts, delay, e,
+                    )
+                    task = asyncio.create_task(self._requeue_later(job, delay))
+                    self._retry_tasks.add(task)
+                    task.add_done_callback(self._retry_tasks.discard)
+                else:
+                    self._counters["failed"] += 1
+                    logger.error("[%s] job %s failed after %d attempts: %s",
+                                 self.name, job.job_id, job.attempts, e)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def _requeue_later(self, job: Job, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._queue.put_nowait(job)
+
+    async def drain(self) -> None:
+        """Wait until every accepted job (including pending retries) has finished."""
+        if self._queue is None:
+            return
+        while True:
+            await self._queue.join()
+            if not self._retry_tasks:
+                return
+            await asyncio.gather(*self._retry_tasks, return_exceptions=True)
+
+    # ---- metrics ----
+
+    def metrics(self) -> dict:
+        return {
+            "queue": self.name,
+            "depth": self._queue.qsize() if self._queue else 0,
+            "max_depth": self._max_depth,
+            "capacity": self.max_size,
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "pending_retries": len(self._retry_tasks),
+            **self._counters,
+            "mean_wait_s": round(self._wait_total / self._started, 3) if self._started else 0.0,
+            "last_error": self._last_error,
+        }
@@ -0,0 +1,169 @@
+import atexit
+import collections
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .storage_utils import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoyaltyProfile:
+    """
+    One customer's loyalty record as stored in loyalty.json.
+
+    Attributes:
+        user_id (str): Customer ID, e.g. "CUST001".
+        points (int): Current points balance.
+        extra (dict): Any other stored fields, preserved as-is on write.
+    """
+
+    user_id: str
+    points: int = 0
+    extra: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, user_id: str, raw) -> "LoyaltyProfile":
+        # Older files stored a bare integer instead of {"points": n}.
+        if isinstance(raw, (int, float)):
+            return cls(user_id=user_id, points=int(raw))
+        raw = dict(raw or {})
+        points = int(raw.pop("points", 0) or 0)
+        return cls(user_id=user_id, points=points, extra=raw)
+
+    def to_json(self) -> dict:
+        return {"points": self.points, **self.extra}
+
+
+class LoyaltyStore:
+    """
+    Loyalty points store that coalesces increments in memory.
+
+    `add_points` only touches an in-memory accumulator. Pending increments
+    are merged and written to loyalty.json in one atomic write once
+    `flush_every` increments have piled up or `flush_interval` seconds have
+    passed since the first unflushed one, whichever comes first. Reads
+    include pending increments, so callers always see their own writes.
+
+    An increment with an `idempotency_key` (e.g. the order id) is applied
+    at most once, so retried agent runs cannot credit one order twice.
+    The last `max_idempotency_keys` keys are remembered for the life of
+    the process.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_every: int = 50,
+        flush_interval: float = 5.0,
+        max_idempotency_keys: int = 10000,
+    ):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.max_idempotency_keys = max_idempotency_keys
+
+        self._lock = threading.Lock()
+        self._profiles: dict[str, LoyaltyProfile] = self._load()
+        self._pending: dict[str, int] = {}
+        self._pending_count = 0
+        self._timer: Optional[threading.Timer] = None
+        self._applied: "collections.OrderedDict[str, None]" = collections.OrderedDict()
+
+        # Don't lose buffered points on a clean shutdown.
+        atexit.register(self.flush)
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            logger.warning("[LoyaltyStore] Could not parse %s, starting empty", self.path)
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {uid: LoyaltyProfile.from_json(uid, raw) for uid, raw in data.items()}
+
+    # ---- reads ----
+
+    def get(self, user_id: str) -> Optional[LoyaltyProfile]:
+        """Return the profile including unflushed points, or None if unknown."""
+        with self._lock:
+            return self._get_locked(user_id)
+
+    def _get_locked(self, user_id: str) -> Optional[LoyaltyProfile]:
+        base = self._profiles.get(user_id)
+        pending = self._pending.get(user_id)
+        if base is None and pending is None:
+            return None
+        base = base or LoyaltyProfile(user_id=user_id)
+        return LoyaltyProfile(
+            user_id=user_id,
+            points=base.points + (pending or 0),
+            extra=dict(base.extra),
+        )
+
+    def has_applied(self, idempotency_key: str) -> bool:
+        with self._lock:
+            return idempotency_key in self._applied
+
+    # ---- writes ----
+
+    def add_points(
+        self, user_id: str, points: int, idempotency_key: Optional[str] = None
+    ) -> LoyaltyProfile:
+        """
+        Queue a points increment and return the resulting profile. An
+        increment whose idempotency_key was already applied is skipped.
+        """
+        with self._lock:
+            if idempotency_key is not None:
+                if idempotency_key in self._applied:
+                    return self._get_locked(user_id) or LoyaltyProfile(user_id=user_id)
+                self._applied[idempotency_key] = None
+                while len(self._applied) > self.max_idempotency_keys:
+                    self._applied.popitem(last=False)
+
+            self._pending[user_id] = self._pending.get(user_id, 0) + points
+            self._pending_count += 1
+            flush_now = self._pending_count >= self.flush_every
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush_now:
+            self.flush()
+        return self.get(user_id)
+
+    def flush(self) -> None:
+        """Merge pending increments into the profiles and write loyalty.json once."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+
+            profiles = dict(self._profiles)
+            for user_id, delta in self._pending.items():
+                current = profiles.get(user_id) or LoyaltyProfile(user_id=user_id)
+                profiles[user_id] = LoyaltyProfile(
+                    user_id=user_id,
+                    points=current.points + delta,
+                    extra=current.extra,
+                )
+
+            atomic_write_json(
+                self.path, {uid: p.to_json() for uid, p in profiles.items()}
+            )
+            self._profiles = profiles
+            self._pending = {}
+            self._pending_count = 0
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+
+class MenuCache:
+    """
+    In-memory copy of menu.json with prebuilt lookup indexes.
+
+    The file is only re-parsed when its mtime or size changes, and the
+    stat check itself is throttled to once per `check_interval` seconds,
+    so menu display and order creation are memory-only in steady state.
+
+    Indexes:
+      name_to_id        lowercase item name -> item id
+      id_to_price       item id -> price
+      id_to_item        item id -> full menu entry
+      category_to_items category -> list of menu entries
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._last_check = 0.0
+        self._menu: dict = {}
+        self._error: Optional[str] = None
+
+        self.name_to_id: dict[str, str] = {}
+        self.id_to_price: dict[str, float] = {}
+        self.id_to_item: dict[str, dict] = {}
+        self.category_to_items: dict[str, list] = {}
+
+    # ---- loading ----
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._stamp is not None and now - self._last_check < self.check_interval:
+            return
+
+        with self._lock:
+            self._last_check = now
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                self._set_error("Menu file (menu.json) not found in data directory.")
+                return
+
+            stamp = (st.st_mtime_ns, st.st_size)
+            if stamp == self._stamp:
+                return
+
+            try:
+                with open(self.path, "r") as f:
+                    menu = json.load(f)
+            except Exception as e:
+                self._set_error(f"Failed to load menu: {e}")
+                return
+
+            self._build_indexes(menu)
+            self._menu = menu
+            self._error = None
+            self._stamp = stamp
+
+    def _set_error(self, message: str) -> None:
+        self._menu = {}
+        self._error = message
+        self._stamp = None
+        self.name_to_id, self.id_to_price = {}, {}
+        self.id_to_item, self.category_to_items = {}, {}
+
+    def _build_indexes(self, menu: dict) -> None:
+        name_to_id, id_to_price, id_to_item, category_to_items = {}, {}, {}, {}
+        for category, entries in menu.items():
+            if not isinstance(entries, list):
+                continue
+            category_to_items[category] = entries
+            for entry in entries:
+                item_id = entry.get("id")
+                name_to_id[entry.get("name", "").lower()] = item_id
+                id_to_price[item_id] = entry.get("price")
+                id_to_item[item_id] = entry
+
+        # Swap all indexes in together so readers never see a half-built set.
+        self.name_to_id, self.id_to_price = name_to_id, id_to_price
+        self.id_to_item, self.category_to_items = id_to_item, category_to_items
+
+    # ---- lookups ----
+
+    def menu(self) -> dict:
+        """Return the parsed menu, or {"error": ...} if it could not be loaded."""
+        self._refresh()
+        if self._error:
+            return {"error": self._error}
+        return self._menu
+
+    def item_id(self, name: str) -> Optional[str]:
+        """Resolve a menu item name (case-insensitive) to its id."""
+        self._refresh()
+        return self.name_to_id.get(name.lower())
+
+    def price(self, item_id: str) -> Optional[float]:
+        self._refresh()
+        return self.id_to_price.get(item_id)
+
+    def items_in(self, category: str) -> list:
+        self._refresh()
+        return self.category_to_items.get(category, [])
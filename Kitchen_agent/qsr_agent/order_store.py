@@ -0,0 +1,319 @@
+import abc
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Orders in this status are finished; everything else counts as pending.
+COMPLETED_STATUS = "COMPLETED"
+
+
+def _load_legacy_orders(seed_path: str) -> list[dict]:
+    """Read the legacy orders.json array, tolerating a missing or broken file."""
+    if not os.path.exists(seed_path):
+        return []
+    try:
+        with open(seed_path, "r") as f:
+            content = f.read().strip()
+        orders = json.loads(content) if content else []
+    except json.JSONDecodeError:
+        logger.warning("[OrderStore] Could not parse %s, starting empty", seed_path)
+        orders = []
+    if not isinstance(orders, list):
+        return []
+    return [o for o in orders if isinstance(o, dict) and o.get("order_id")]
+
+
+def normalize_status(status) -> str:
+    """Canonical stored form of an order status (upper case, QUEUED if missing)."""
+    return str(status or "QUEUED").strip().upper()
+
+
+def _is_pending(status) -> bool:
+    return str(status or "").upper() != COMPLETED_STATUS
+
+
+# ==========================================================
+# BACKEND INTERFACE
+# ==========================================================
+
+class OrderStore(abc.ABC):
+    """
+    Interface shared by all order backends.
+    The order tools in tools.py only talk to this API.
+
+    `put` and `update_status` normalise the status here, so every backend
+    stores and returns it in the same form; backends implement `_put` and
+    `_set_status`.
+    """
+
+    @abc.abstractmethod
+    def get(self, order_id: str) -> Optional[dict]:
+        """Return a copy of the order, or None if unknown."""
+
+    def put(self, order: dict) -> None:
+        """Insert or replace a full order record."""
+        self._put({**order, "status": normalize_status(order.get("status"))})
+
+    def update_status(self, order_id: str, status: str) -> bool:
+        """Set the status of an existing order. Returns False if the order is unknown."""
+        return self._set_status(order_id, normalize_status(status))
+
+    @abc.abstractmethod
+    def pending(self) -> list[dict]:
+        """Return all orders that are not completed, oldest first."""
+
+    @abc.abstractmethod
+    def _put(self, order: dict) -> None:
+        """Store an order whose status is already normalised."""
+
+    @abc.abstractmethod
+    def _set_status(self, order_id: str, status: str) -> bool:
+        """Store an already-normalised status for an existing order."""
+
+
+# ==========================================================
+# APPEND-ONLY ORDER JOURNAL
+# ==========================================================
+
+class JournalOrderStore(OrderStore):
+    """
+    Order store backed by an append-only JSONL journal.
+
+    Every write appends a single line to the journal instead of rewriting
+    the whole file, and an in-memory `order_id -> record` index (rebuilt by
+    replaying the journal on startup) serves lookups and status updates in O(1).
+
+    Journal lines look like:
+      {"op": "put", "order": {...}}
+      {"op": "status", "order_id": "ORD001", "status": "READY"}
+    """
+
+    def __init__(self, journal_path: str, seed_path: Optional[str] = None):
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+        self._index: dict[str, dict] = {}
+        self._fh = None
+
+        if not os.path.exists(journal_path) and seed_path:
+            self._seed_from_json(seed_path)
+        self._replay()
+
+    # ---- startup ----
+
+    def _seed_from_json(self, seed_path: str) -> None:
+        """One-off migration from the legacy orders.json array."""
+        orders = _load_legacy_orders(seed_path)
+        if not orders:
+            return
+        with open(self.journal_path, "w") as f:
+            for order in orders:
+                f.write(json.dumps({"op": "put", "order": order}) + "\n")
+
+    def _replay(self) -> None:
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "r") as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-append; skip it.
+                    logger.warning(
+                        "[OrderStore] Skipping corrupt journal line %d in %s",
+                        line_no,
+                        self.journal_path,
+                    )
+                    continue
+                self._apply(entry)
+
+    def _apply(self, entry: dict) -> None:
+        op = entry.get("op")
+        # Journals written before statuses were normalised may hold any case.
+        if op == "put":
+            order = entry.get("order") or {}
+            if order.get("order_id"):
+                order["status"] = normalize_status(order.get("status"))
+                self._index[order["order_id"]] = order
+        elif op == "status":
+            order = self._index.get(entry.get("order_id"))
+            if order is not None:
+                order["status"] = normalize_status(entry.get("status"))
+
+    def _append(self, entry: dict) -> None:
+        # Keep one handle open in append mode; each entry is a single flushed line.
+        if self._fh is None:
+            self._fh = open(self.journal_path, "a")
+        self._fh.write(json.dumps(entry) + "\n")
+        self._fh.flush()
+
+    # ---- public API ----
+
+    def get(self, order_id: str) -> Optional[dict]:
+        order = self._index.get(order_id)
+        return dict(order) if order is not None else None
+
+    def _put(self, order: dict) -> None:
+        with self._lock:
+            self._append({"op": "put", "order": order})
+            self._index[order["order_id"]] = dict(order)
+
+    def _set_status(self, order_id: str, status: str) -> bool:
+        with self._lock:
+            order = self._index.get(order_id)
+            if order is None:
+                return False
+            self._append({"op": "status", "order_id": order_id, "status": status})
+            order["status"] = status
+            return True
+
+    def pending(self) -> list[dict]:
+        pending = [dict(o) for o in self._index.values() if _is_pending(o.get("status"))]
+        return sorted(pending, key=lambda o: o.get("time") or "")
+
+    def compact(self) -> None:
+        """
+        Rewrite the journal with one `put` line per live order, dropping
+        superseded status lines. Safe to call at any time.
+        """
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            tmp_path = self.journal_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                for order in self._index.values():
+                    f.write(json.dumps({"op": "put", "order": order}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.journal_path)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+# ==========================================================
+# SQLITE BACKEND
+# ==========================================================
+
+class SQLiteOrderStore(OrderStore):
+    """
+    Order store backed by stdlib sqlite3 in WAL mode.
+
+    The full order is kept as a JSON blob, with `order_id`, `status` and
+    `time` promoted to indexed columns. A partial index over non-completed
+    rows keeps `pending()` proportional to the number of live orders rather
+    than to the whole order history.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS orders (
+            order_id TEXT PRIMARY KEY,
+            status   TEXT NOT NULL,
+            time     TEXT,
+            body     TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+        CREATE INDEX IF NOT EXISTS idx_orders_time ON orders(time);
+        CREATE INDEX IF NOT EXISTS idx_orders_pending
+            ON orders(time) WHERE status != 'COMPLETED';
+    """
+
+    def __init__(self, db_path: str, seed_path: Optional[str] = None):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        is_new = not os.path.exists(db_path)
+
+        # One shared connection; the lock serialises access across threads.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+
+        if is_new and seed_path:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO orders (order_id, status, time, body) "
+                    "VALUES (?, ?, ?, ?)",
+                    [self._row(o) for o in _load_legacy_orders(seed_path)],
+                )
+
+    @staticmethod
+    def _row(order: dict) -> tuple:
+        status = normalize_status(order.get("status"))
+        return (order["order_id"], status, order.get("time"), json.dumps(order))
+
+    @staticmethod
+    def _decode(status: str, body: str) -> dict:
+        # The status column is authoritative; the blob may hold a stale copy.
+        order = json.loads(body)
+        order["status"] = status
+        return order
+
+    def get(self, order_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, body FROM orders WHERE order_id = ?", (order_id,)
+            ).fetchone()
+        return self._decode(*row) if row else None
+
+    def _put(self, order: dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO orders (order_id, status, time, body) "
+                "VALUES (?, ?, ?, ?)",
+                self._row(order),
+            )
+
+    def _set_status(self, order_id: str, status: str) -> bool:
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "UPDATE orders SET status = ? WHERE order_id = ?",
+                (status, order_id),
+            )
+        return cur.rowcount > 0
+
+    def pending(self) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, body FROM orders "
+                "WHERE status != 'COMPLETED' ORDER BY time"
+            ).fetchall()
+        return [self._decode(status, body) for status, body in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ==========================================================
+# BACKEND SELECTION
+# ==========================================================
+
+ORDER_STORE_BACKENDS = ("sqlite", "journal")
+
+
+def create_order_store(backend: str, data_dir: str) -> OrderStore:
+    """
+    Build an order store for the given backend name.
+
+    Parameters:
+      backend: "sqlite" (default in tools.py) or "journal".
+      data_dir: Directory holding orders.json and the backend's own files.
+    """
+    seed_path = os.path.join(data_dir, "orders.json")
+    if backend == "sqlite":
+        return SQLiteOrderStore(os.path.join(data_dir, "orders.db"), seed_path=seed_path)
+    if backend == "journal":
+        return JournalOrderStore(os.path.join(data_dir, "orders.jsonl"), seed_path=seed_path)
+    raise ValueError(
+        f"Unknown order store backend {backend!r}. "
+        f"Expected one of: {', '.join(ORDER_STORE_BACKENDS)}"
+    )
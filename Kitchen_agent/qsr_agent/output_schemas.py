@@ -0,0 +1,129 @@
+import ast
+import json
+import re
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+# ===================================================================
+# OUTPUT SCHEMAS
+# Declared as `output_schema` on the robust_* LLM agents, so Gemini is
+# constrained to this shape at generation time, and re-checked by the
+# matching validation checker.
+# ===================================================================
+
+
+class InventoryChange(BaseModel):
+    ingredient: str
+    previous_quantity: float = Field(ge=0)
+    new_quantity: float = Field(ge=0, description="Stock after the change; never negative.")
+    reason: str = Field(description="Why the quantity changed (order deduction, restock, ...).")
+
+
+class InventoryUpdate(BaseModel):
+    changes: list[InventoryChange]
+    low_stock: list[str] = Field(default_factory=list, description="Ingredients at or below their threshold.")
+    warnings: list[str] = Field(default_factory=list)
+    summary: str
+
+
+class LoyaltyUpdate(BaseModel):
+    user_id: str
+    points_awarded: int = 0
+    updated_points: int = Field(ge=0)
+    status: str = Field(description="Loyalty tier after the update.")
+    rewards: list[str] = Field(default_factory=list, description="Rewards unlocked by this update.")
+    summary: str = ""
+
+
+class FeedbackAnalysis(BaseModel):
+    sentiment: Literal["positive", "neutral", "negative"]
+    score: float = Field(ge=-1.0, le=1.0, description="-1 (very negative) to 1 (very positive).")
+    categories: list[str] = Field(description="e.g. food quality, delay, staff, price, cleanliness.")
+    issues: list[str] = Field(default_factory=list)
+    recommendations: list[str] = Field(default_factory=list)
+    summary: str
+
+
+class RefinedOutput(BaseModel):
+    refined_content: str
+    improvements: list[str]
+
+
+# ===================================================================
+# LOCAL JSON REPAIR
+# ===================================================================
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def extract_json(text: str) -> Optional[Any]:
+    """
+    Best-effort parse of a JSON value out of LLM text.
+
+    Tries, in order: the text as-is, the first ```json fenced block, the
+    outermost {...} span, the same with trailing commas removed, and a
+    Python-literal parse (single quotes, True/False/None).
+    Returns None if nothing parses.
+    """
+    if not isinstance(text, str):
+        return None
+    candidates = [text.strip()]
+    fenced = _FENCE.search(text)
+    if fenced:
+        candidates.append(fenced.group(1).strip())
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        candidates.append(text[start:end + 1])
+
+    for candidate in candidates:
+        for variant in (candidate, _TRAILING_COMMA.sub(r"\1", candidate)):
+            try:
+                return json.loads(variant)
+            except json.JSONDecodeError:
+                pass
+            try:
+                value = ast.literal_eval(variant)
+            except (ValueError, SyntaxError, MemoryError, RecursionError):
+                continue
+            if isinstance(value, (dict, list)):
+                return value
+    return None
+
+
+def coerce_to_schema(raw: Any, schema: type[BaseModel]) -> tuple[Optional[dict], Optional[str], bool]:
+    """
+    Validate `raw` (a dict or LLM text) against `schema`.
+
+    Returns (value, error, repaired):
+      - value: the validated output as a plain dict, or None
+      - error: why validation failed ("missing", "not_json", "schema: ..."), or None
+      - repaired: True if the value only validated after local JSON repair
+    """
+    if raw is None or raw == "" or raw == {}:
+        return None, "missing", False
+
+    repaired = False
+    if isinstance(raw, str):
+        try:
+            parsed = json.loads(raw)
+        except json.JSONDecodeError:
+            parsed = extract_json(raw)
+            repaired = True
+        if parsed is None:
+            return None, "not_json", False
+        raw = parsed
+    if isinstance(raw, dict) and len(raw) == 1 and isinstance(next(iter(raw.values())), dict):
+        # Models sometimes wrap the object once, e.g. {"loyalty_update": {...}}.
+        inner = next(iter(raw.values()))
+        if set(inner) & set(schema.model_fields) and not set(raw) & set(schema.model_fields):
+            raw, repaired = inner, True
+
+    try:
+        value = schema.model_validate(raw)
+    except ValidationError as e:
+        first = e.errors()[0]
+        where = ".".join(str(p) for p in first["loc"]) or "<root>"
+        return None, f"schema: {where}: {first['msg']}", repaired
+    return value.model_dump(exclude_none=True), None, repaired
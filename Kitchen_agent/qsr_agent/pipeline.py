@@ -0,0 +1,177 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+
+class ConditionalAgent(BaseAgent):
+    """
+    Gate that runs its single sub-agent only when `condition(state)` holds.
+
+    When the condition is false the sub-agent (and its LLM call) is skipped,
+    and the gate records why under state["<sub-agent>_skipped"]:
+        {"skipped": true, "reason": "..."}
+    When it runs, the same key is reset to {"skipped": false} so a reused
+    session never shows a stale skip.
+    """
+
+    condition: Callable[[Any], bool]
+    skip_reason: str = "Preconditions not met."
+
+    async def _run_async_impl(
+        self, context: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        target = self.sub_agents[0]
+        skip_key = f"{target.name}_skipped"
+
+        if not self.condition(context.session.state):
+            yield Event(
+                invocation_id=context.invocation_id,
+                author=self.name,
+                branch=context.branch,
+                actions=EventActions(
+                    state_delta={skip_key: {"skipped": True, "reason": self.skip_reason}}
+                ),
+            )
+            return
+
+        yield Event(
+            invocation_id=context.invocation_id,
+            author=self.name,
+            branch=context.branch,
+            actions=EventActions(state_delta={skip_key: {"skipped": False}}),
+        )
+        async for event in target.run_async(context):
+            yield event
+
+
+@dataclass(frozen=True)
+class NodeSpec:
+    """State keys a DAG node reads (inputs) and writes (outputs)."""
+    inputs: tuple = ()
+    outputs: tuple = ()
+
+
+class DagAgent(BaseAgent):
+    """
+    Runs sub-agents as a dependency graph instead of a fixed sequence.
+
+    Every sub-agent declares the state keys it reads and writes in
+    `nodes` ({agent name: NodeSpec}). A node depends on every node that
+    writes one of its inputs; inputs nobody writes are expected to be in
+    state already. Nodes whose dependencies are done run concurrently, so
+    end-to-end latency follows the critical path rather than the sum of
+    all steps.
+
+    Events from concurrent nodes are merged through one queue. Each node
+    waits on a resume signal after yielding, so the runner has applied
+    its state_delta before the node continues and before any dependent
+    node starts. Each node runs on its own branch
+    ("<parent branch>.<dag name>.<node name>", as ParallelAgent does), so
+    LLM nodes running side by side do not see each other's conversation
+    turns. Per-node wall-clock timings are written to
+    state["<name>_timings"].
+    """
+
+    nodes: dict[str, NodeSpec]
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        self.dependencies()  # validate the graph at construction time
+
+    def dependencies(self) -> dict[str, set]:
+        """name -> names of the nodes it must wait for."""
+        names = [a.name for a in self.sub_agents]
+        missing = [n for n in names if n not in self.nodes]
+        if missing:
+            raise ValueError(f"{self.name}: no NodeSpec for {missing}")
+
+        writer: dict[str, str] = {}
+        for name in names:
+            for key in self.nodes[name].outputs:
+                if key in writer:
+                    raise ValueError(
+                        f"{self.name}: state key {key!r} written by both {writer[key]} and {name}"
+                    )
+                writer[key] = name
+
+        deps = {
+            name: {writer[k] for k in self.nodes[name].inputs if k in writer} - {name}
+            for name in names
+        }
+
+        # Kahn's algorithm: every node must become ready at some point.
+        pending = {n: set(d) for n, d in deps.items()}
+        while pending:
+            ready = [n for n, d in pending.items() if not d]
+            if not ready:
+                raise ValueError(f"{self.name}: dependency cycle among {sorted(pending)}")
+            for n in ready:
+                del pending[n]
+            for d in pending.values():
+                d.difference_update(ready)
+        return deps
+
+    async def _run_async_impl(
+        self, context: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        deps = self.dependencies()
+        agents = {a.name: a for a in self.sub_agents}
+        done: set[str] = set()
+        started: set[str] = set()
+        timings: dict[str, dict] = {}
+        queue: asyncio.Queue = asyncio.Queue()
+        tasks: dict[str, asyncio.Task] = {}
+        t0 = time.perf_counter()
+
+        async def run_node(name: str) -> None:
+            error = None
+            timings[name] = {"start_ms": round((time.perf_counter() - t0) * 1000, 1)}
+            suffix = f"{self.name}.{name}"
+            branch = f"{context.branch}.{suffix}" if context.branch else suffix
+            events = agents[name].run_async(context.model_copy(update={"branch": branch}))
+            try:
+                async for event in events:
+                    resume = asyncio.Event()
+                    await queue.put((name, event, resume))
+                    # Wait until the runner has applied this event.
+                    await resume.wait()
+            except Exception as e:  # surfaced by the merge loop below
+                error = e
+            finally:
+                await events.aclose()
+                timings[name]["end_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+                await queue.put((name, None, error))
+
+        def launch_ready() -> None:
+            for name in agents:
+                if name not in started and deps[name] <= done:
+                    started.add(name)
+                    tasks[name] = asyncio.create_task(run_node(name))
+
+        try:
+            launch_ready()
+            while len(done) < len(agents):
+                name, event, extra = await queue.get()
+                if event is None:
+                    if extra is not None:
+                        raise extra
+                    done.add(name)
+                    launch_ready()
+                    continue
+                yield event
+                extra.set()
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        yield Event(
+            invocation_id=context.invocation_id,
+            author=self.name,
+            branch=context.branch,
+            actions=EventActions(state_delta={f"{self.name}_timings": timings}),
+        )
@@ -0,0 +1,265 @@
+import bisect
+import datetime
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+# Priority levels (lower is served first), matching the old queuing_agent rules.
+PRIORITY_HIGH = 1      # dine-in or large order
+PRIORITY_STANDARD = 3  # pickup / takeaway
+
+DINE_IN_MODES = {"table", "dining", "dine_in", "dine-in", "table_delivery", "staff_delivery"}
+
+
+@dataclass
+class QueueEntry:
+    order_id: str
+    priority: int
+    enqueued_at: datetime.datetime
+    units: int
+    key: float
+    reason: str = ""
+    pos: int = 0             # index in its lane
+    removed: bool = False
+
+
+def order_units(order: dict) -> int:
+    """Total item quantity in an order (each unit is one cooking job)."""
+    return sum(int(item.get("quantity", 1) or 1) for item in order.get("items") or [])
+
+
+class _Fenwick:
+    """Prefix sums over an append-only array with point updates, O(log n) each."""
+
+    def __init__(self):
+        self._tree = [0]
+
+    def append(self, value: int) -> None:
+        i = len(self._tree)
+        self._tree.append(value + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+
+    def add(self, index: int, delta: int) -> None:
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix(self, n: int) -> int:
+        """Sum of the first n values."""
+        total = 0
+        while n > 0:
+            total += self._tree[n]
+            n -= n & -n
+        return total
+
+
+class _Lane:
+    """
+    Entries of one priority level in enqueue order. Entries are keyed on
+    their enqueue time, so keys only grow along a lane: "entries ahead of
+    key k" is a bisect, and Fenwick trees over lane positions give the
+    live count and units before any position. Removed entries stay as
+    tombstones until they outnumber the live ones.
+    """
+
+    def __init__(self):
+        self.entries: list[QueueEntry] = []
+        self.keys: list[float] = []
+        self.head = 0        # first possibly-live position
+        self.dead = 0
+        self._live = _Fenwick()
+        self._units = _Fenwick()
+
+    def append(self, entry: QueueEntry) -> None:
+        entry.pos = len(self.entries)
+        self.entries.append(entry)
+        self.keys.append(entry.key)
+        self._live.append(1)
+        self._units.append(entry.units)
+
+    def discard(self, entry: QueueEntry) -> None:
+        entry.removed = True
+        self._live.add(entry.pos, -1)
+        self._units.add(entry.pos, -entry.units)
+        self.dead += 1
+        while self.head < len(self.entries) and self.entries[self.head].removed:
+            self.head += 1
+        if self.dead > len(self.entries) - self.dead + 32:
+            self._compact()
+
+    def _compact(self) -> None:
+        live = [e for e in self.entries if not e.removed]
+        self.__init__()
+        for entry in live:
+            self.append(entry)
+
+    def first(self) -> Optional[QueueEntry]:
+        return self.entries[self.head] if self.head < len(self.entries) else None
+
+    def ahead(self, key: float) -> tuple[int, int]:
+        """(live entries, units) with a key below `key`."""
+        n = bisect.bisect_left(self.keys, key)
+        return self._live.prefix(n), self._units.prefix(n)
+
+    def ahead_of(self, entry: QueueEntry) -> tuple[int, int]:
+        """(live entries, units) enqueued before `entry` in this lane."""
+        return self._live.prefix(entry.pos), self._units.prefix(entry.pos)
+
+
+class KitchenQueue:
+    """
+    In-process priority queue over all live (not yet started) orders.
+
+    Ordering uses
+
+        key = priority + minutes_since_epoch(enqueued_at) / aging_minutes
+
+    which is equivalent to "priority minus one level per `aging_minutes`
+    waited": every entry ages at the same rate, so the relative order of
+    keys never changes as time passes. A standard order that has waited
+    2 * aging_minutes ties with a fresh high-priority one, so takeaway
+    orders cannot starve.
+
+    Orders are keyed on the time they enter the queue (not their order
+    time), so each priority level is a FIFO lane with ascending keys: the
+    next order is the smaller of the lane heads, and position and work
+    ahead of an order come from a bisect plus Fenwick prefix sums per
+    lane, O(log n) instead of a scan of the queue.
+
+    An order is queued once: pushing an order that is already queued
+    returns its current assignment. Entries leave through `pop()` /
+    `remove()` when the order starts, or expire `ttl_minutes` after they
+    were queued, so orders whose start is never reported cannot pile up.
+
+    Estimated start times come from the work queued ahead of an order,
+    spread over `station_capacity` parallel station slots at
+    `minutes_per_unit`.
+    """
+
+    def __init__(
+        self,
+        station_capacity: int = 4,
+        minutes_per_unit: float = 4.0,
+        aging_minutes: float = 10.0,
+        large_order_units: int = 5,
+        ttl_minutes: Optional[float] = 120.0,
+    ):
+        self.station_capacity = max(int(station_capacity), 1)
+        self.minutes_per_unit = minutes_per_unit
+        self.aging_minutes = aging_minutes
+        self.large_order_units = large_order_units
+        self.ttl_minutes = ttl_minutes
+
+        self._lock = threading.Lock()
+        self._lanes: dict[int, _Lane] = {}
+        self._entries: dict[str, QueueEntry] = {}
+        self.expired = 0
+
+    # ---- rules ----
+
+    def priority_for(self, order: dict) -> tuple[int, str]:
+        units = order_units(order)
+        mode = str(order.get("delivery_mode") or "").lower()
+        if mode in DINE_IN_MODES or order.get("table") is not None:
+            return PRIORITY_HIGH, "Dine-in order"
+        if units > self.large_order_units:
+            return PRIORITY_HIGH, f"Large order ({units} items)"
+        return PRIORITY_STANDARD, "Pickup/takeaway order"
+
+    def _key(self, priority: int, enqueued_at: datetime.datetime) -> float:
+        return priority + enqueued_at.timestamp() / 60.0 / self.aging_minutes
+
+    # ---- mutations ----
+
+    def push(self, order: dict, now: Optional[datetime.datetime] = None) -> dict:
+        """Enqueue a new order (keyed on `now`) and return its queue assignment."""
+        now = now or datetime.datetime.now()
+        order_id = order.get("order_id") or "UNKNOWN_ORDER"
+
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(order_id)
+            if entry is None:
+                priority, reason = self.priority_for(order)
+                key = self._key(priority, now)
+                lane = self._lanes.setdefault(priority, _Lane())
+                if lane.keys and key < lane.keys[-1]:
+                    # The clock stepped back; keep the lane's keys ascending.
+                    key = lane.keys[-1]
+                entry = QueueEntry(
+                    order_id=order_id,
+                    priority=priority,
+                    enqueued_at=now,
+                    units=max(order_units(order), 1),
+                    key=key,
+                    reason=reason,
+                )
+                lane.append(entry)
+                self._entries[order_id] = entry
+            return self._assignment(entry, now)
+
+    def pop(self) -> Optional[str]:
+        """Remove and return the next order to start, or None if the queue is empty."""
+        with self._lock:
+            heads = [e for e in (lane.first() for lane in self._lanes.values()) if e is not None]
+            if not heads:
+                return None
+            entry = min(heads, key=lambda e: e.key)
+            self._discard(entry.order_id)
+            return entry.order_id
+
+    def remove(self, order_id: str) -> bool:
+        """Drop an order that has started or been cancelled."""
+        with self._lock:
+            return self._discard(order_id)
+
+    def expire(self, now: Optional[datetime.datetime] = None) -> int:
+        """Drop entries queued longer than ttl_minutes. Returns how many went."""
+        with self._lock:
+            return self._expire(now or datetime.datetime.now())
+
+    def _discard(self, order_id: str) -> bool:
+        entry = self._entries.pop(order_id, None)
+        if entry is None:
+            return False
+        self._lanes[entry.priority].discard(entry)
+        return True
+
+    def _expire(self, now: datetime.datetime) -> int:
+        if not self.ttl_minutes:
+            return 0
+        cutoff = now - datetime.timedelta(minutes=self.ttl_minutes)
+        dropped = 0
+        for lane in self._lanes.values():
+            # Lanes are in enqueue order, so stale entries are at the front.
+            while (entry := lane.first()) is not None and entry.enqueued_at <= cutoff:
+                self._discard(entry.order_id)
+                dropped += 1
+        self.expired += dropped
+        return dropped
+
+    # ---- views ----
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _assignment(self, entry: QueueEntry, now: datetime.datetime) -> dict:
+        orders_ahead = units_ahead = 0
+        for priority, lane in self._lanes.items():
+            n, units = lane.ahead_of(entry) if priority == entry.priority else lane.ahead(entry.key)
+            orders_ahead += n
+            units_ahead += units
+        wait_minutes = (units_ahead / self.station_capacity) * self.minutes_per_unit
+        start = max(entry.enqueued_at, now) + datetime.timedelta(minutes=wait_minutes)
+        return {
+            "order_id": entry.order_id,
+            "queue_priority": entry.priority,
+            "estimated_start_time": start.isoformat(timespec="seconds"),
+            "queue_position": orders_ahead + 1,
+            "queue_depth": len(self._entries),
+            "reasoning": (
+                f"{entry.reason} -> priority {entry.priority}. "
+                f"{orders_ahead} order(s) / {units_ahead} item(s) ahead across "
+                f"{self.station_capacity} station slot(s): ~{wait_minutes:.0f} min wait."
+            ),
+        }
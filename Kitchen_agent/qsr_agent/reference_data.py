@@ -0,0 +1,67 @@
+import json
+from typing import Optional
+
+
+class ReferenceData:
+    """
+    Versioned, read-only reference data for the enrichment agents.
+
+    reference_data.json holds per-item par levels and stock thresholds,
+    loyalty tier rules and rewards, the feedback taxonomy and writing
+    style rules. It is parsed once and kept in memory, so agents answer
+    "what is the threshold / tier / category" with a local lookup instead
+    of a web search.
+
+    Returned sections are the shared in-memory dicts; callers must not
+    mutate them.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "r") as f:
+            self._data: dict = json.load(f)
+        self.version = self._data.get("version", 1)
+        self.sections = [k for k, v in self._data.items() if isinstance(v, dict)]
+
+        inventory = self._data.get("inventory", {})
+        self._default_par: dict = inventory.get("default", {})
+        self._par_levels: dict = inventory.get("par_levels", {})
+        # Highest threshold first, so the first match is the current tier.
+        self._tiers = sorted(
+            self._data.get("loyalty", {}).get("tiers", []),
+            key=lambda t: t.get("min_points", 0),
+            reverse=True,
+        )
+
+    def section(self, name: str) -> Optional[dict]:
+        return self._data.get(name) if name in self.sections else None
+
+    def par_level(self, item: str) -> dict:
+        return self._par_levels.get(item, self._default_par)
+
+    def tier_for(self, points: int) -> Optional[dict]:
+        return next((t for t in self._tiers if points >= t.get("min_points", 0)), None)
+
+    def stock_levels(self, inventory: dict) -> dict:
+        """Classify every stocked item against its par level and reorder point."""
+        items, low, critical = {}, [], []
+        for item, qty in inventory.items():
+            if not isinstance(qty, (int, float)):
+                continue
+            par = self.par_level(item)
+            if qty <= par.get("critical", 0):
+                status = "critical"
+                critical.append(item)
+            elif qty <= par.get("reorder_point", 0):
+                status = "low"
+            else:
+                status = "ok"
+            if status != "ok":
+                low.append(item)
+            items[item] = {
+                "quantity": qty,
+                "par": par.get("par"),
+                "reorder_point": par.get("reorder_point"),
+                "status": status,
+                "reorder_qty": max(par.get("par", 0) - qty, 0) if status != "ok" else 0,
+            }
+        return {"version": self.version, "items": items, "low_stock": low, "critical": critical}
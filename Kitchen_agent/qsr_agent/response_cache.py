@@ -0,0 +1,275 @@
+import collections
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .output_schemas import extract_json
+
+# Bump when the key layout or the stored response format changes.
+CACHE_FORMAT = 2
+
+# Per-order fields that never change what the model should answer. They are
+# left out of state inputs so identical orders share a fingerprint.
+VOLATILE_FIELDS = frozenset({"order_id", "time"})
+
+# Stands in for the current order id in masked requests and stored responses.
+# Ids shorter than MIN_MASKED_ID_LEN are left alone: a plain replace of a
+# short id ("12") could hit unrelated text (quantities, table numbers).
+ORDER_ID_PLACEHOLDER = "<<order_id>>"
+MIN_MASKED_ID_LEN = 8
+
+
+# ==========================================================
+# FINGERPRINTS
+# ==========================================================
+
+def _canonical(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _digest(value) -> str:
+    text = value if isinstance(value, str) else _canonical(value)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _content_text(content) -> str:
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    return "".join(p.text or "" for p in (content.parts or []))
+
+
+def _strip_call_ids(value):
+    """Drop ADK's random function-call ids so identical tool turns hash alike."""
+    if isinstance(value, dict):
+        return {k: _strip_call_ids(v) for k, v in value.items() if k != "id"}
+    if isinstance(value, list):
+        return [_strip_call_ids(v) for v in value]
+    return value
+
+
+def request_tail(contents: list, user_content) -> list:
+    """
+    The part of the conversation this model call depends on: everything from
+    the current user message on. Earlier turns of a long-lived session (other
+    orders) are left out, so they do not defeat the cache.
+    """
+    user_text = _content_text(user_content)
+    start = 0
+    if user_text:
+        for i in range(len(contents) - 1, -1, -1):
+            if contents[i].role == "user" and _content_text(contents[i]) == user_text:
+                start = i
+                break
+    return [
+        _strip_call_ids(c.model_dump(mode="json", exclude_none=True))
+        for c in contents[start:]
+    ]
+
+
+def _project(value):
+    """`value` without its VOLATILE_FIELDS, at any depth."""
+    if isinstance(value, dict):
+        return {k: _project(v) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_project(v) for v in value]
+    return value
+
+
+def state_inputs(state, keys) -> dict:
+    """
+    The declared state inputs, canonicalised: JSON held as text (LLM output,
+    often fenced) is parsed, so text and dict forms of one object hash alike,
+    and per-order ids and timestamps are dropped, so two orders with the same
+    items, addons, quantities, delivery mode and table hash alike.
+    """
+    values = {}
+    for key in keys:
+        value = state.get(key) if state else None
+        if isinstance(value, str):
+            parsed = extract_json(value)
+            value = parsed if parsed is not None else value.strip()
+        values[key] = _project(value)
+    return values
+
+
+def _maskable(order_id: Optional[str]) -> bool:
+    return bool(order_id) and len(order_id) >= MIN_MASKED_ID_LEN
+
+
+def mask_order_id(text: str, order_id: Optional[str]) -> str:
+    """Replace `order_id` in serialized text with ORDER_ID_PLACEHOLDER."""
+    return text.replace(order_id, ORDER_ID_PLACEHOLDER) if _maskable(order_id) else text
+
+
+def unmask_order_id(text: str, order_id: Optional[str]) -> str:
+    """Inverse of mask_order_id: put `order_id` back in a stored response."""
+    return text.replace(ORDER_ID_PLACEHOLDER, order_id) if _maskable(order_id) else text
+
+
+def fingerprint(
+    agent_name: str, llm_request, user_content, state, state_keys=(), order_id: Optional[str] = None
+) -> str:
+    """
+    Content address of one model call: agent, instruction, model, tools,
+    state inputs and request tail. With `order_id`, occurrences of it in
+    the instruction and tail (tool-call arguments, tool results) are masked,
+    so the same call made for another order with the same content matches.
+    """
+    config = llm_request.config
+    schema = getattr(config, "response_schema", None) if config else None
+    instruction = _content_text(config.system_instruction if config else None)
+    tail = _canonical(request_tail(llm_request.contents or [], user_content))
+    return _digest({
+        "format": CACHE_FORMAT,
+        "agent": agent_name,
+        "model": llm_request.model,
+        "instruction": _digest(mask_order_id(instruction, order_id)),
+        "tools": sorted(llm_request.tools_dict),
+        "schema": getattr(schema, "__name__", None) or (repr(schema) if schema else None),
+        "state": _digest(state_inputs(state, state_keys)),
+        "tail": _digest(mask_order_id(tail, order_id)),
+    })
+
+
+# ==========================================================
+# CACHE
+# ==========================================================
+
+class ResponseCache:
+    """
+    Content-addressed cache of serialized LlmResponses.
+
+    Memory tier: an LRU of at most `max_entries` responses, each expiring
+    `ttl_seconds` after it was stored. Optional disk tier: a SQLite table
+    at `db_path` with the same TTL, which survives restarts and is
+    consulted on a memory miss (a disk hit is promoted to memory).
+
+    Counters: memory/disk hits, misses, stores, evictions and expirations,
+    plus hits and misses per agent.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key      TEXT PRIMARY KEY,
+            agent    TEXT,
+            expires  REAL NOT NULL,
+            body     TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses(expires);
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 600.0, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.db_path = db_path
+
+        self._lock = threading.Lock()
+        self._memory: "collections.OrderedDict[str, tuple[float, str]]" = collections.OrderedDict()
+        self._counters = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0,
+            "stores": 0, "evictions": 0, "expired": 0,
+        }
+        self._per_agent: dict[str, dict] = {}
+        self._puts_since_prune = 0
+
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+            self._prune_disk(time.time())
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def _count(self, agent: Optional[str], outcome: str) -> None:
+        stats = self._per_agent.setdefault(agent or "?", {"hits": 0, "misses": 0})
+        stats[outcome] += 1
+
+    def _remember(self, key: str, expires: float, body: str) -> None:
+        self._memory[key] = (expires, body)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _prune_disk(self, now: float) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+
+    def get(self, key: str, agent: Optional[str] = None) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    self._count(agent, "hits")
+                    return entry[1]
+                del self._memory[key]
+                self._counters["expired"] += 1
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT expires, body FROM responses WHERE key = ? AND expires > ?", (key, now)
+                ).fetchone()
+                if row:
+                    self._remember(key, row[0], row[1])
+                    self._counters["disk_hits"] += 1
+                    self._count(agent, "hits")
+                    return row[1]
+
+            self._counters["misses"] += 1
+            self._count(agent, "misses")
+            return None
+
+    def put(self, key: str, body: str, agent: Optional[str] = None) -> None:
+        expires = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires, body)
+            self._counters["stores"] += 1
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, agent, expires, body) VALUES (?, ?, ?, ?)",
+                        (key, agent, expires, body),
+                    )
+                self._puts_since_prune += 1
+                if self._puts_since_prune >= 256:
+                    self._puts_since_prune = 0
+                    self._prune_disk(time.time())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses")
+
+    def metrics(self) -> dict:
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "disk_tier": self.db_path,
+                **self._counters,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "agents": {name: dict(s) for name, s in self._per_agent.items()},
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,166 @@
+import re
+
+import numpy as np
+
+# ----------------------------------------------------------
+# Lexicon: word -> valence in roughly [-3, 3]
+# ----------------------------------------------------------
+LEXICON = {
+    # positive
+    "perfect": 3.0, "excellent": 3.0, "amazing": 3.0, "delicious": 3.0,
+    "great": 2.5, "love": 2.5, "loved": 2.5, "awesome": 2.5, "fantastic": 3.0,
+    "tasty": 2.0, "good": 2.0, "nice": 1.5, "fresh": 2.0, "friendly": 2.0,
+    "polite": 1.5, "helpful": 2.0, "quick": 1.5, "fast": 1.5, "clean": 2.0,
+    "hot": 1.0, "crispy": 1.5, "creamy": 1.5, "juicy": 1.5, "cheap": 1.0,
+    "affordable": 1.5, "worth": 1.5, "happy": 2.0, "enjoyed": 2.0, "okay": 0.5,
+    "ok": 0.5, "fine": 0.5, "decent": 1.0,
+    # negative
+    "bad": -2.0, "terrible": -3.0, "awful": -3.0, "horrible": -3.0, "worst": -3.0,
+    "soggy": -2.0, "cold": -1.5, "bland": -1.5, "stale": -2.0, "burnt": -2.0,
+    "raw": -2.0, "greasy": -1.5, "salty": -1.0, "undercooked": -2.0, "overcooked": -1.5,
+    "slow": -2.0, "late": -2.0, "delay": -1.5, "delayed": -2.0, "forever": -1.5,
+    "rude": -2.5, "unfriendly": -2.0, "ignored": -2.0, "dirty": -2.5, "filthy": -3.0,
+    "messy": -1.5, "sticky": -1.5, "smelly": -2.0, "expensive": -1.5,
+    "overpriced": -2.0, "pricey": -1.0, "wrong": -2.0, "missing": -2.0,
+    "disappointed": -2.0, "disappointing": -2.0, "meh": -0.5,
+}
+
+# Words that flip the valence of the next few tokens.
+NEGATORS = {"not", "no", "never", "nothing", "hardly", "barely", "without"}
+NEGATION_WINDOW = 3
+
+# ----------------------------------------------------------
+# Category tags (the ones the feedback agent reports on)
+# ----------------------------------------------------------
+CATEGORIES = {
+    "delay": {
+        "slow", "late", "delay", "delayed", "wait", "waited", "waiting",
+        "forever", "quick", "fast", "minutes", "took",
+    },
+    "food quality": {
+        "taste", "tasty", "delicious", "bland", "soggy", "cold", "hot", "fresh",
+        "stale", "burnt", "raw", "greasy", "salty", "crispy", "creamy", "juicy",
+        "undercooked", "overcooked", "perfect", "pizza", "burger", "fries",
+        "salad", "pasta", "bread", "food",
+    },
+    "staff": {
+        "staff", "waiter", "waitress", "server", "service", "cashier", "rude",
+        "friendly", "unfriendly", "polite", "helpful", "ignored", "manager",
+    },
+    "price": {
+        "price", "prices", "expensive", "cheap", "overpriced", "pricey",
+        "affordable", "value", "worth", "cost", "money",
+    },
+    "cleanliness": {
+        "clean", "dirty", "filthy", "messy", "sticky", "smelly", "hygiene",
+        "table", "tables", "bathroom", "restroom", "floor",
+    },
+}
+CATEGORY_NAMES = list(CATEGORIES)
+
+_TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+# Normalisation constant for score / sqrt(score^2 + alpha), as in VADER.
+_ALPHA = 15.0
+
+
+def _build_tables():
+    vocab = sorted(set(LEXICON) | NEGATORS | set().union(*CATEGORIES.values()))
+    index = {word: i for i, word in enumerate(vocab)}
+    # One extra trailing row for out-of-vocabulary tokens (all zeros).
+    valence = np.zeros(len(vocab) + 1)
+    negator = np.zeros(len(vocab) + 1, dtype=bool)
+    category = np.zeros((len(vocab) + 1, len(CATEGORY_NAMES)), dtype=np.int32)
+    for word, score in LEXICON.items():
+        valence[index[word]] = score
+    for word in NEGATORS:
+        negator[index[word]] = True
+    for c, name in enumerate(CATEGORY_NAMES):
+        for word in CATEGORIES[name]:
+            category[index[word], c] = 1
+    return index, valence, negator, category
+
+
+_INDEX, _VALENCE, _NEGATOR, _CATEGORY = _build_tables()
+_OOV = len(_INDEX)
+
+
+def _token_id(token: str) -> int:
+    if token in _INDEX:
+        return _INDEX[token]
+    if token.endswith("n't"):
+        return _INDEX["not"]
+    return _OOV
+
+
+def score_batch(texts: list[str]) -> list[dict]:
+    """
+    Score many feedback texts in one vectorized pass.
+
+    All tokens of all texts are laid out in one flat array; valence,
+    negation scope and category hits are computed with array lookups and
+    aggregated per text with bincount, so cost is linear in total tokens.
+
+    Returns one dict per text:
+      {"sentiment_score": float in [-1, 1], "label": "...", "categories": [...]}
+    """
+    n_docs = len(texts)
+    if n_docs == 0:
+        return []
+
+    token_ids: list[int] = []
+    doc_ids: list[int] = []
+    for d, text in enumerate(texts):
+        ids = [_token_id(t) for t in _TOKEN_RE.findall((text or "").lower())]
+        token_ids.extend(ids)
+        doc_ids.extend([d] * len(ids))
+
+    if token_ids:
+        tok = np.asarray(token_ids)
+        doc = np.asarray(doc_ids)
+        pos = np.arange(len(tok))
+
+        # Position of the most recent negator at or before each token,
+        # ignoring negators that belong to an earlier document.
+        doc_start = np.searchsorted(doc, doc)
+        last_neg = np.maximum.accumulate(np.where(_NEGATOR[tok], pos, -1))
+        distance = pos - last_neg
+        negated = (last_neg >= doc_start) & (distance >= 1) & (distance <= NEGATION_WINDOW)
+
+        valence = _VALENCE[tok] * np.where(negated, -1.0, 1.0)
+        raw = np.bincount(doc, weights=valence, minlength=n_docs)
+
+        cat_hits = np.zeros((n_docs, len(CATEGORY_NAMES)), dtype=np.int32)
+        np.add.at(cat_hits, doc, _CATEGORY[tok])
+    else:
+        raw = np.zeros(n_docs)
+        cat_hits = np.zeros((n_docs, len(CATEGORY_NAMES)), dtype=np.int32)
+
+    scores = raw / np.sqrt(raw * raw + _ALPHA)
+    labels = np.where(scores >= 0.05, "positive", np.where(scores <= -0.05, "negative", "neutral"))
+
+    return [
+        {
+            "sentiment_score": round(float(scores[d]), 4),
+            "label": str(labels[d]),
+            "categories": [CATEGORY_NAMES[c] for c in np.nonzero(cat_hits[d])[0]],
+        }
+        for d in range(n_docs)
+    ]
+
+
+def summarize(results: list[dict]) -> dict:
+    """Aggregate label counts, category counts and mean score for a scored batch."""
+    labels = {"positive": 0, "neutral": 0, "negative": 0}
+    categories = {name: 0 for name in CATEGORY_NAMES}
+    for r in results:
+        labels[r["label"]] += 1
+        for c in r["categories"]:
+            categories[c] += 1
+    mean = sum(r["sentiment_score"] for r in results) / len(results) if results else 0.0
+    return {
+        "count": len(results),
+        "mean_score": round(mean, 4),
+        "labels": labels,
+        "categories": categories,
+    }
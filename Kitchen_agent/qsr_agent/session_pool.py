@@ -0,0 +1,168 @@
+import asyncio
+import collections
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledSession:
+    session_id: str
+    key: str
+    one_shot: bool
+    created: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    running: int = 0
+    done: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class SessionPool:
+    """
+    Gives every order its own ADK session on a shared runner.
+
+    - With a conversation key (e.g. the A2A contextId), follow-up messages
+      reuse that conversation's session; messages of one conversation run
+      one at a time, different conversations run concurrently.
+    - Without a key, each message gets a fresh one-shot session that is
+      marked done as soon as its run finishes.
+
+    Eviction (deleting the session from the runner's session service):
+      - done one-shot sessions after `completed_ttl` seconds,
+      - conversation sessions idle for `idle_ttl` seconds,
+      - the least recently used idle sessions, to make room for a new
+        one once `max_sessions` are live.
+    A session with a run in flight is never evicted.
+    """
+
+    def __init__(
+        self,
+        runner,
+        max_sessions: int = 256,
+        idle_ttl: float = 900.0,
+        completed_ttl: float = 60.0,
+        user_id: str = "kitchen",
+    ):
+        self.runner = runner
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.completed_ttl = completed_ttl
+        self.user_id = user_id
+
+        self._sessions: "collections.OrderedDict[str, PooledSession]" = collections.OrderedDict()
+        self._counters = {"created": 0, "runs": 0, "evicted_ttl": 0, "evicted_lru": 0}
+        self._max_live = 0
+
+    # ---- lifecycle ----
+
+    async def _acquire(self, key: Optional[str]) -> PooledSession:
+        await self.evict()
+        entry = self._sessions.get(key) if key else None
+        if entry is None:
+            session = await self.runner.session_service.create_session(
+                app_name=self.runner.app_name, user_id=self.user_id
+            )
+            entry = PooledSession(
+                session_id=session.id, key=key or f"order-{uuid.uuid4().hex[:12]}", one_shot=key is None
+            )
+            self._sessions[entry.key] = entry
+            self._counters["created"] += 1
+            self._max_live = max(self._max_live, len(self._sessions))
+        self._sessions.move_to_end(entry.key)
+        entry.last_used = time.monotonic()
+        entry.running += 1
+        return entry
+
+    async def _delete(self, entry: PooledSession) -> None:
+        self._sessions.pop(entry.key, None)
+        await self.runner.session_service.delete_session(
+            app_name=self.runner.app_name, user_id=self.user_id, session_id=entry.session_id
+        )
+
+    async def evict(self) -> int:
+        """Drop expired sessions, then LRU idle sessions down to max_sessions - 1. Returns how many went."""
+        now = time.monotonic()
+        expired = [
+            e for e in self._sessions.values()
+            if not e.running
+            and now - e.last_used >= (self.completed_ttl if e.done else self.idle_ttl)
+        ]
+        evicted_ttl = 0
+        for entry in expired:
+            if entry.running:  # picked up again while an earlier delete awaited
+                continue
+            await self._delete(entry)
+            evicted_ttl += 1
+
+        evicted_lru = 0
+        for entry in list(self._sessions.values()):
+            if len(self._sessions) < self.max_sessions:
+                break
+            if not entry.running:
+                await self._delete(entry)
+                evicted_lru += 1
+
+        self._counters["evicted_ttl"] += evicted_ttl
+        self._counters["evicted_lru"] += evicted_lru
+        return evicted_ttl + evicted_lru
+
+    # ---- running ----
+
+    async def run(self, message: str, key: Optional[str] = None) -> dict:
+        """
+        Run `message` through the runner in the session for `key` (a fresh
+        one if None). Returns the session id, the final session state, the
+        state keys this run wrote (a conversation session also holds state
+        from earlier messages), the last text reply and the number of events.
+        """
+        entry = await self._acquire(key)
+        try:
+            async with entry.lock:
+                content = types.Content(role="user", parts=[types.Part(text=message)])
+                events, final_text, written = 0, "", set()
+                async for event in self.runner.run_async(
+                    user_id=self.user_id, session_id=entry.session_id, new_message=content
+                ):
+                    events += 1
+                    if event.actions and event.actions.state_delta:
+                        written.update(event.actions.state_delta)
+                    if event.content and event.content.parts:
+                        text = "".join(p.text or "" for p in event.content.parts if not p.thought)
+                        if text.strip():
+                            final_text = text
+                session = await self.runner.session_service.get_session(
+                    app_name=self.runner.app_name, user_id=self.user_id, session_id=entry.session_id
+                )
+            self._counters["runs"] += 1
+            return {
+                "session_id": entry.session_id,
+                "conversation": entry.key,
+                "state": dict(session.state) if session else {},
+                "written_keys": sorted(written),
+                "final_text": final_text,
+                "events": events,
+            }
+        finally:
+            entry.running -= 1
+            entry.last_used = time.monotonic()
+            if entry.one_shot:
+                entry.done = True
+
+    # ---- metrics ----
+
+    def metrics(self) -> dict:
+        return {
+            "live_sessions": len(self._sessions),
+            "running": sum(1 for e in self._sessions.values() if e.running),
+            "max_sessions": self.max_sessions,
+            "max_live_sessions": self._max_live,
+            "idle_ttl_s": self.idle_ttl,
+            "completed_ttl_s": self.completed_ttl,
+            **self._counters,
+        }
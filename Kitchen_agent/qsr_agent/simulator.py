@@ -0,0 +1,416 @@
+"""
+Discrete-event kitchen simulator.
+
+Replays historical_orders.json, or a synthetic Poisson arrival stream,
+through the stations defined in data/stations.json. No LLM is involved,
+so queuing and station-assignment policies can be benchmarked at rush-hour
+rates for free:
+
+    python -m qsr_agent.simulator --rate 300 --minutes 120
+    python -m qsr_agent.simulator --source historical --policy scheduler
+"""
+
+import argparse
+import datetime
+import heapq
+import itertools
+import json
+import os
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .queue_engine import KitchenQueue
+from .station_scheduler import StationScheduler
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+STATIONS_PATH = os.path.join(DATA_DIR, "stations.json")
+HISTORY_PATH = os.path.join(DATA_DIR, "historical_orders.json")
+MENU_PATH = os.path.join(DATA_DIR, "menu.json")
+
+# Dispatch disciplines applied when a station slot frees up, plus
+# "scheduler", which runs the live StationScheduler on the simulated clock.
+POLICIES = ("fifo", "priority", "critical_path", "scheduler")
+
+ARRIVAL, SLOT_FREE, ORDER_DONE = 0, 1, 2
+
+
+# ----------------------------------------------------------
+# Arrival streams
+# ----------------------------------------------------------
+
+def historical_arrivals(path: str = HISTORY_PATH) -> list[tuple[float, dict]]:
+    """(minute offset, order) pairs from historical_orders.json, in time order."""
+    with open(path, "r") as f:
+        orders = json.load(f)
+    timed = []
+    for order in orders:
+        try:
+            ts = datetime.datetime.fromisoformat(order["time"]).timestamp() / 60.0
+        except (KeyError, TypeError, ValueError):
+            continue
+        timed.append((ts, order))
+    timed.sort(key=lambda t: t[0])
+    t0 = timed[0][0] if timed else 0.0
+    return [(ts - t0, order) for ts, order in timed]
+
+
+def menu_item_names(path: str = MENU_PATH) -> list[str]:
+    """Every item name on the live menu (menu.json is {category: [items]})."""
+    with open(path, "r") as f:
+        menu = json.load(f)
+    return [item["name"] for items in menu.values() for item in items]
+
+
+def synthetic_arrivals(
+    rate_per_hour: float,
+    minutes: float,
+    menu_items: list[str],
+    seed: int = 7,
+    dine_in_share: float = 0.5,
+) -> list[tuple[float, dict]]:
+    """Poisson arrivals of random 1-4 line orders over `minutes`."""
+    rng = random.Random(seed)
+    arrivals = []
+    t = 0.0
+    for n in itertools.count(1):
+        t += rng.expovariate(rate_per_hour / 60.0)
+        if t >= minutes:
+            break
+        items = [
+            {"name": name, "quantity": rng.choice((1, 1, 1, 2, 2, 3))}
+            for name in rng.sample(menu_items, rng.randint(1, min(4, len(menu_items))))
+        ]
+        arrivals.append((t, {
+            "order_id": f"SIM{n:05d}",
+            "items": items,
+            "delivery_mode": "dining" if rng.random() < dine_in_share else "takeaway",
+        }))
+    return arrivals
+
+
+# ----------------------------------------------------------
+# Simulation
+# ----------------------------------------------------------
+
+@dataclass
+class SimJob:
+    order_id: str
+    chain: list              # [(station, minutes), ...] for one unit
+    step: int
+    enqueued: float
+    rank: tuple = ()
+
+    @property
+    def station(self) -> str:
+        return self.chain[self.step][0]
+
+    @property
+    def key(self) -> tuple:
+        station, minutes = self.chain[self.step]
+        return (station, self.step, minutes, tuple(self.chain))
+
+
+@dataclass
+class SimOrder:
+    order: dict
+    arrival: float
+    priority: int
+    units_left: int = 0
+    first_start: Optional[float] = None
+    done: Optional[float] = None
+
+
+class KitchenSimulator:
+    """
+    Heap-based discrete-event simulation of the kitchen stations.
+
+    Events are (time, seq, kind, payload) tuples on one heap: order
+    arrivals, slot-free events when a station run finishes, and (for the
+    scheduler policy) planned order completions.
+
+    Dispatch policies keep one waiting list per station and, whenever a
+    slot is free, start the best job by:
+      - fifo:          arrival at the station
+      - priority:      KitchenQueue priority with aging (dine-in first)
+      - critical_path: longest remaining route first
+    With batching on, identical waiting jobs ride along up to the
+    station's batch_size.
+
+    The scheduler policy hands each arriving order to a StationScheduler
+    driven by the simulated clock and executes the plan it returns.
+    """
+
+    def __init__(
+        self,
+        policy: str = "critical_path",
+        batching: bool = True,
+        config_path: str = STATIONS_PATH,
+        capacity: Optional[dict] = None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; choose from {POLICIES}")
+        self.policy = policy
+        self.batching = batching
+        self.queue = KitchenQueue()
+        self.scheduler = StationScheduler(config_path)
+        if not batching:
+            self.scheduler.batch_size = {s: 1 for s in self.scheduler.batch_size}
+        for station, slots in (capacity or {}).items():
+            # What-if override: resize a station for this run only.
+            self.scheduler.capacity[station] = slots
+            self.scheduler._slots[station] = [[] for _ in range(slots)]
+            self.scheduler.batch_size.setdefault(station, 1)
+        self.capacity = dict(self.scheduler.capacity)
+
+    # ---- policy ranks (lower starts first) ----
+
+    def _rank(self, job: SimJob, order: SimOrder) -> tuple:
+        if self.policy == "priority":
+            return (order.priority + order.arrival / self.queue.aging_minutes, job.enqueued)
+        if self.policy == "critical_path":
+            remaining = sum(minutes for _, minutes in job.chain[job.step:])
+            return (-remaining, job.enqueued)
+        return (job.enqueued, order.arrival)
+
+    # ---- main loop ----
+
+    def run(self, arrivals: list[tuple[float, dict]]) -> dict:
+        events: list = []
+        seq = itertools.count()
+        for t, order in arrivals:
+            heapq.heappush(events, (t, next(seq), ARRIVAL, order))
+
+        orders: dict[str, SimOrder] = {}
+        waiting: dict[str, list[SimJob]] = {s: [] for s in self.capacity}
+        free = dict(self.capacity)
+        busy_minutes = {s: 0.0 for s in self.capacity}
+        runs = {s: 0 for s in self.capacity}
+        planned_batches: set[str] = set()
+        max_waiting = 0
+
+        def start_jobs(now: float, station: str) -> None:
+            queue = waiting[station]
+            while free[station] > 0 and queue:
+                queue.sort(key=lambda j: j.rank)
+                head = queue.pop(0)
+                batch = [head]
+                if self.batching:
+                    limit = self.scheduler.batch_size.get(station, 1)
+                    mates = [j for j in queue if j.key == head.key][: limit - 1]
+                    for j in mates:
+                        queue.remove(j)
+                    batch += mates
+                minutes = head.chain[head.step][1]
+                free[station] -= 1
+                busy_minutes[station] += minutes
+                runs[station] += 1
+                for job in batch:
+                    sim_order = orders[job.order_id]
+                    if sim_order.first_start is None:
+                        sim_order.first_start = now
+                heapq.heappush(events, (now + minutes, next(seq), SLOT_FREE, (station, batch)))
+
+        def enqueue(now: float, job: SimJob) -> None:
+            job.enqueued = now
+            job.rank = self._rank(job, orders[job.order_id])
+            if job.station not in waiting:
+                waiting[job.station], free[job.station] = [], 1
+                busy_minutes[job.station], runs[job.station] = 0.0, 0
+            waiting[job.station].append(job)
+
+        while events:
+            now, _, kind, payload = heapq.heappop(events)
+
+            if kind == ARRIVAL:
+                order = payload
+                order_id = order.get("order_id") or f"ORDER{next(seq)}"
+                sim_order = SimOrder(order, now, self.queue.priority_for(order)[0])
+                orders[order_id] = sim_order
+
+                if self.policy == "scheduler":
+                    jobs = self.scheduler.plan(order, now=now)
+                    batches = [self.scheduler.batch(j.batch_id) for j in jobs]
+                    for batch in batches:
+                        if batch.batch_id not in planned_batches:
+                            # Count each station run once, however many orders share it.
+                            planned_batches.add(batch.batch_id)
+                            busy_minutes[batch.station] = busy_minutes.get(batch.station, 0.0) + (
+                                batch.finish - batch.start
+                            )
+                            runs[batch.station] = runs.get(batch.station, 0) + 1
+                    finish = max((b.finish for b in batches), default=now)
+                    sim_order.first_start = min((b.start for b in batches), default=now)
+                    heapq.heappush(events, (finish, next(seq), ORDER_DONE, order_id))
+                    continue
+
+                chains = [
+                    self.scheduler.route(item)
+                    for item in order.get("items") or []
+                    for _ in range(int(item.get("quantity", 1) or 1))
+                ]
+                sim_order.units_left = len(chains)
+                if not chains:
+                    sim_order.first_start = sim_order.done = now
+                touched = set()
+                for chain in chains:
+                    job = SimJob(order_id, chain, 0, now)
+                    enqueue(now, job)
+                    touched.add(job.station)
+                for station in touched:
+                    start_jobs(now, station)
+
+            elif kind == SLOT_FREE:
+                station, batch = payload
+                free[station] += 1
+                touched = {station}
+                for job in batch:
+                    if job.step + 1 < len(job.chain):
+                        nxt = SimJob(job.order_id, job.chain, job.step + 1, now)
+                        enqueue(now, nxt)
+                        touched.add(nxt.station)
+                    else:
+                        sim_order = orders[job.order_id]
+                        sim_order.units_left -= 1
+                        if sim_order.units_left == 0:
+                            sim_order.done = now
+                for s in touched:
+                    start_jobs(now, s)
+
+            elif kind == ORDER_DONE:
+                orders[payload].done = now
+
+            max_waiting = max(max_waiting, sum(len(q) for q in waiting.values()))
+
+        return self._report(orders, busy_minutes, runs, max_waiting)
+
+    # ---- metrics ----
+
+    def _report(self, orders: dict, busy_minutes: dict, runs: dict, max_waiting: int) -> dict:
+        done = [o for o in orders.values() if o.done is not None]
+        if not done:
+            return {"policy": self.policy, "batching": self.batching, "orders": len(orders), "completed": 0}
+
+        completion = np.array([o.done - o.arrival for o in done])
+        wait = np.array([(o.first_start or o.arrival) - o.arrival for o in done])
+        t0 = min(o.arrival for o in orders.values())
+        horizon = max(max(o.done for o in done) - t0, 1e-9)
+        p50, p95, p99 = np.percentile(completion, [50, 95, 99])
+
+        return {
+            "policy": self.policy,
+            "batching": self.batching,
+            "orders": len(orders),
+            "completed": len(done),
+            "sim_minutes": round(horizon, 1),
+            "throughput_per_hour": round(len(done) / horizon * 60.0, 1),
+            "queue_wait_min": {
+                "mean": round(float(wait.mean()), 2),
+                "p95": round(float(np.percentile(wait, 95)), 2),
+            },
+            "completion_min": {
+                "mean": round(float(completion.mean()), 2),
+                "p50": round(float(p50), 2),
+                "p95": round(float(p95), 2),
+                "p99": round(float(p99), 2),
+            },
+            "max_jobs_waiting": max_waiting,
+            "utilization": {
+                s: round(busy_minutes.get(s, 0.0) / (cap * horizon), 3)
+                for s, cap in self.capacity.items()
+            },
+            "station_runs": {s: runs.get(s, 0) for s in self.capacity},
+        }
+
+
+def compare(
+    arrivals: list[tuple[float, dict]],
+    policies: tuple = POLICIES,
+    batching: bool = True,
+    config_path: str = STATIONS_PATH,
+    capacity: Optional[dict] = None,
+) -> list[dict]:
+    """Run the same arrival stream through each policy."""
+    return [
+        KitchenSimulator(p, batching, config_path, capacity).run(arrivals)
+        for p in policies
+    ]
+
+
+# ----------------------------------------------------------
+# CLI
+# ----------------------------------------------------------
+
+def _print_table(results: list[dict]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="🍳 Kitchen simulation")
+    for col in ("policy", "batch", "orders", "orders/h", "wait mean", "wait p95",
+                "p50", "p95", "p99", "busiest station"):
+        table.add_column(col, justify="left" if col in ("policy", "busiest station") else "right")
+    for r in results:
+        if not r.get("completed"):
+            table.add_row(r["policy"], str(r["batching"]), str(r["orders"]), *["-"] * 7)
+            continue
+        station, util = max(r["utilization"].items(), key=lambda kv: kv[1])
+        table.add_row(
+            r["policy"],
+            "yes" if r["batching"] else "no",
+            f"{r['completed']}/{r['orders']}",
+            f"{r['throughput_per_hour']}",
+            f"{r['queue_wait_min']['mean']}",
+            f"{r['queue_wait_min']['p95']}",
+            f"{r['completion_min']['p50']}",
+            f"{r['completion_min']['p95']}",
+            f"{r['completion_min']['p99']}",
+            f"{station} {util:.0%}",
+        )
+    Console().print(table)
+
+
+def main(argv: Optional[list[str]] = None) -> list[dict]:
+    parser = argparse.ArgumentParser(description="Discrete-event kitchen simulator")
+    parser.add_argument("--source", choices=("synthetic", "historical"), default="synthetic")
+    parser.add_argument("--rate", type=float, default=300.0, help="Synthetic orders per hour.")
+    parser.add_argument("--minutes", type=float, default=120.0, help="Synthetic arrival window.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--policy", choices=POLICIES + ("all",), default="all")
+    parser.add_argument("--no-batch", action="store_true", help="Disable cross-order batching.")
+    parser.add_argument("--config", default=STATIONS_PATH, help="Stations/routing JSON.")
+    parser.add_argument(
+        "--capacity",
+        action="append",
+        default=[],
+        metavar="STATION=SLOTS",
+        help="Override a station's slot count, e.g. --capacity assembly=4 (repeatable).",
+    )
+    parser.add_argument("--json", action="store_true", help="Print raw results as JSON.")
+    args = parser.parse_args(argv)
+
+    capacity = {}
+    for spec in args.capacity:
+        station, _, slots = spec.partition("=")
+        if not slots.isdigit() or int(slots) < 1:
+            parser.error(f"--capacity expects STATION=SLOTS, got {spec!r}")
+        capacity[station] = int(slots)
+
+    if args.source == "historical":
+        arrivals = historical_arrivals()
+    else:
+        arrivals = synthetic_arrivals(args.rate, args.minutes, menu_item_names(), seed=args.seed)
+
+    policies = POLICIES if args.policy == "all" else (args.policy,)
+    results = compare(arrivals, policies, not args.no_batch, args.config, capacity)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+    return results
+
+
+if __name__ == "__main__":
+    main()
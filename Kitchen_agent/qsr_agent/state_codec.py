@@ -0,0 +1,277 @@
+import datetime
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+
+from .output_schemas import extract_json
+
+# ===================================================================
+# TYPED SESSION STATE
+# Each pipeline output_key has one record type. LLM outputs are parsed
+# once, right after the agent that wrote them (normalize_output), and
+# stored back as the record's canonical JSON-safe dict; readers call
+# decode(state, key) and get the typed record without any re-parsing
+# or key guessing.
+# ===================================================================
+
+
+def _parse(raw) -> dict:
+    """A dict, JSON text (fenced or wrapped in prose) or None -> dict ({} if unusable)."""
+    if isinstance(raw, str):
+        raw = extract_json(raw)
+    return dict(raw) if isinstance(raw, dict) else {}
+
+
+def _str_list(value) -> list:
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(v) for v in value]
+
+
+def _as_bool(value) -> bool:
+    return value is True or str(value).strip().lower() == "true"
+
+
+def _as_int(value, default: int = 1) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(slots=True)
+class OrderItem:
+    name: str
+    quantity: int = 1
+    addons: list = field(default_factory=list)
+    extra: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "OrderItem":
+        raw = dict(raw)
+        name = raw.pop("name", None) or raw.pop("item_name", None) or raw.pop("item", None)
+        return cls(
+            name=str(name or "unknown item"),
+            quantity=_as_int(raw.pop("quantity", 1) or 1),
+            addons=_str_list(raw.pop("addons", None)),
+            extra=raw,
+        )
+
+    def to_state(self) -> dict:
+        return {"name": self.name, "quantity": self.quantity, "addons": list(self.addons), **self.extra}
+
+
+@dataclass(slots=True)
+class Order:
+    """
+    state["order"]. Accepts the LLM loader's {"order": {...}} wrapper, and
+    folds table_number into `table` and delivery_preference into
+    `delivery_mode`. Unknown fields are kept in `extra`.
+    """
+
+    order_id: str
+    items: list
+    table: Any = None
+    delivery_mode: Optional[str] = None
+    status: str = "QUEUED"
+    time: Optional[str] = None
+    extra: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_raw(cls, raw) -> Optional["Order"]:
+        data = _parse(raw)
+        if isinstance(data.get("order"), dict):
+            data = dict(data["order"])
+        if not data:
+            return None
+        table_number, table = data.pop("table_number", None), data.pop("table", None)
+        preference = data.pop("delivery_preference", None)
+        mode = data.pop("delivery_mode", None)
+        return cls(
+            order_id=str(data.pop("order_id", None) or "UNKNOWN_ORDER"),
+            items=[OrderItem.from_dict(i) for i in data.pop("items", None) or [] if isinstance(i, dict)],
+            table=table_number if table_number is not None else table,
+            delivery_mode=preference or mode,
+            status=str(data.pop("status", None) or "QUEUED"),
+            time=data.pop("time", None),
+            extra=data,
+        )
+
+    def to_state(self) -> dict:
+        return {
+            "order_id": self.order_id,
+            "items": [item.to_state() for item in self.items],
+            "table": self.table,
+            "delivery_mode": self.delivery_mode,
+            "status": self.status,
+            "time": self.time,
+            **self.extra,
+        }
+
+
+@dataclass(slots=True)
+class AssemblyJob:
+    item: str
+    addons: list
+    ingredients: list
+
+
+@dataclass(slots=True)
+class StationPlan:
+    """state["station_split"], as written by kitchen_load_balancer_agent."""
+
+    order_id: Optional[str]
+    status: str
+    order_ready_at: Optional[str]
+    assembly: list
+    raw: dict
+
+    @classmethod
+    def from_raw(cls, raw) -> Optional["StationPlan"]:
+        data = _parse(raw)
+        if not data:
+            return None
+        return cls(
+            order_id=data.get("order_id"),
+            status=str(data.get("status") or "SCHEDULED"),
+            order_ready_at=data.get("order_ready_at"),
+            assembly=[
+                AssemblyJob(
+                    item=str(job.get("item") or "unknown item"),
+                    addons=_str_list(job.get("addons")),
+                    ingredients=_str_list(job.get("ingredients") or job.get("components")),
+                )
+                for job in data.get("assembly") or []
+                if isinstance(job, dict)
+            ],
+            raw=data,
+        )
+
+    def to_state(self) -> dict:
+        return self.raw
+
+    def assembly_for(self, item: str) -> Optional[AssemblyJob]:
+        return next((job for job in self.assembly if job.item == item), None)
+
+    def ready_minutes(self) -> Optional[float]:
+        """order_ready_at as minutes since the epoch, or None if unknown."""
+        try:
+            return datetime.datetime.fromisoformat(self.order_ready_at).timestamp() / 60.0
+        except (TypeError, ValueError):
+            return None
+
+
+@dataclass(slots=True)
+class AssemblyCheck:
+    """state["assembly_check"], the ai_checker_agent verdict."""
+
+    order_id: Optional[str]
+    item_name: Optional[str]
+    status: str
+    requires_human_review: bool
+    missing_ingredients: list
+    unexpected_items: list
+    notes: str = ""
+    extra: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_raw(cls, raw) -> Optional["AssemblyCheck"]:
+        data = _parse(raw)
+        if not data:
+            return None
+        return cls(
+            order_id=data.pop("order_id", None),
+            item_name=data.pop("item_name", None),
+            status=str(data.pop("status", None) or "").upper(),
+            requires_human_review=_as_bool(data.pop("requires_human_review", False)),
+            missing_ingredients=_str_list(data.pop("missing_ingredients", None)),
+            unexpected_items=_str_list(data.pop("unexpected_items", None)),
+            notes=str(data.pop("notes", None) or ""),
+            extra=data,
+        )
+
+    @property
+    def needs_attention(self) -> bool:
+        return self.status == "FAIL" or self.requires_human_review
+
+    def to_state(self) -> dict:
+        return {
+            "order_id": self.order_id,
+            "item_name": self.item_name,
+            "status": self.status,
+            "requires_human_review": self.requires_human_review,
+            "missing_ingredients": list(self.missing_ingredients),
+            "unexpected_items": list(self.unexpected_items),
+            "notes": self.notes,
+            **self.extra,
+        }
+
+
+@dataclass(slots=True)
+class ChefAlert:
+    """state["chef_alert"], the notifier_agent message."""
+
+    order_id: Optional[str]
+    alert_message: str
+    requires_fix: bool
+    extra: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_raw(cls, raw) -> Optional["ChefAlert"]:
+        data = _parse(raw)
+        if not data:
+            return None
+        return cls(
+            order_id=data.pop("order_id", None),
+            alert_message=str(data.pop("alert_message", None) or ""),
+            requires_fix=_as_bool(data.pop("requires_fix", False)),
+            extra=data,
+        )
+
+    def to_state(self) -> dict:
+        return {
+            "order_id": self.order_id,
+            "alert_message": self.alert_message,
+            "requires_fix": self.requires_fix,
+            **self.extra,
+        }
+
+
+# output_key -> record type
+STATE_RECORDS = {
+    "order": Order,
+    "station_split": StationPlan,
+    "assembly_check": AssemblyCheck,
+    "chef_alert": ChefAlert,
+}
+
+
+def decode(state, key: str):
+    """Typed record for state[key], or None if it is missing or unusable."""
+    raw = state.get(key) if state else None
+    if raw is None:
+        return None
+    return STATE_RECORDS[key].from_raw(raw)
+
+
+def normalize_output(key: str):
+    """
+    after_agent_callback that parses the agent's output under state[key]
+    once and stores the record's canonical dict in its place. Output that
+    cannot be parsed is left as-is (and decodes to None downstream).
+    """
+    record_type = STATE_RECORDS[key]
+
+    def callback(callback_context: CallbackContext) -> None:
+        raw = callback_context.state.get(key)
+        if raw is None:
+            return None
+        record = record_type.from_raw(raw)
+        if record is not None:
+            callback_context.state[key] = record.to_state()
+        return None
+
+    return callback
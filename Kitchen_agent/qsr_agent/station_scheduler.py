@@ -0,0 +1,380 @@
+import datetime
+import itertools
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+STATION_NAMES = ("frying", "grilling", "baking", "beverage", "salad", "assembly")
+
+
+@dataclass
+class StationJob:
+    job_id: str
+    order_id: str
+    item: str
+    unit: int
+    station: str
+    step: int
+    duration: float          # minutes
+    addons: list = field(default_factory=list)
+    batch_id: str = ""
+
+    @property
+    def key(self) -> tuple:
+        """Jobs with the same key are interchangeable and may share a batch."""
+        return (self.station, _name_key(self.item), self.step, self.duration)
+
+
+@dataclass
+class StationBatch:
+    """One run of a station slot (a fryer basket, a grill load, ...)."""
+    batch_id: str
+    station: str
+    key: tuple
+    slot: int
+    start: float             # minutes on the scheduler clock
+    finish: float
+    jobs: list = field(default_factory=list)
+
+    @property
+    def fanout(self) -> dict:
+        """order_id -> units of that order cooked in this batch."""
+        counts: dict[str, int] = {}
+        for job in self.jobs:
+            counts[job.order_id] = counts.get(job.order_id, 0) + 1
+        return counts
+
+
+def _name_key(name) -> str:
+    """Lookup key for item and addon names: case-insensitive, whitespace-collapsed."""
+    return " ".join(str(name or "").split()).lower()
+
+
+def _now_minutes() -> float:
+    return time.time() / 60.0
+
+
+def _iso(minutes: float) -> str:
+    return datetime.datetime.fromtimestamp(minutes * 60.0).isoformat(timespec="seconds")
+
+
+class StationScheduler:
+    """
+    Earliest-finish-time scheduler over the kitchen stations, with
+    cross-order batching.
+
+    stations.json gives each station a number of parallel slots and routes
+    every menu item through an ordered list of (station, minutes) steps,
+    e.g. grilling -> assembly for a burger. Each unit of an item is one job
+    chain; a step cannot start before the previous step of the same unit
+    has finished.
+
+    Jobs of a new order are placed by list scheduling: units are taken
+    longest-route first, and each step goes to the slot of its station
+    where it finishes earliest. Slots keep every in-flight batch (from all
+    orders), and a new batch may be inserted into an idle gap between
+    them, so short jobs backfill around long ones.
+
+    Batching: a station with `batch_size` > 1 cooks up to that many
+    identical jobs (same item, step and cook time) in one run. Before
+    opening a new batch, a job joins a not-yet-started batch with room
+    if that batch starts no more than `batch_window_min` after the job
+    could start on its own. Each batch keeps a fan-out map back to its
+    orders, and `progress()` reports completion per order.
+
+    Times are float minutes. `now` defaults to the wall clock, but callers
+    such as the simulator can drive the scheduler on their own clock.
+    """
+
+    def __init__(self, config_path: str):
+        with open(config_path, "r") as f:
+            config = json.load(f)
+
+        stations = config.get("stations", {})
+        self.capacity: dict[str, int] = {
+            name: int(spec.get("capacity", 1)) for name, spec in stations.items()
+        }
+        self.batch_size: dict[str, int] = {
+            name: max(int(spec.get("batch_size", 1)), 1) for name, spec in stations.items()
+        }
+        self.batch_window = float(config.get("batch_window_min", 0.0))
+        # Keyed by _name_key, so "veg burger " routes like "Veg Burger".
+        self.routing: dict[str, list[tuple[str, float]]] = {
+            _name_key(item): [(station, float(minutes)) for station, minutes in steps]
+            for item, steps in config.get("routing", {}).items()
+        }
+        self.addon_minutes: dict[str, tuple[str, float]] = {
+            _name_key(addon): (station, float(minutes))
+            for addon, (station, minutes) in config.get("addon_minutes", {}).items()
+        }
+        self.default_route = [
+            (station, float(minutes)) for station, minutes in config.get("default_route", [])
+        ]
+
+        self._lock = threading.Lock()
+        # station -> slot -> batches sorted by start
+        self._slots: dict[str, list[list[StationBatch]]] = {
+            name: [[] for _ in range(cap)] for name, cap in self.capacity.items()
+        }
+        self._batches: dict[str, StationBatch] = {}
+        self._orders: dict[str, list[StationJob]] = {}
+        self._seq = itertools.count(1)
+        self._unknown: set[tuple[str, str]] = set()   # (kind, name) already logged
+
+    # ---- routing ----
+
+    def route(self, item: dict) -> list[tuple[str, float]]:
+        """
+        Station steps for one unit of an order line, including addon time.
+        Names are matched case- and whitespace-insensitively; items without
+        a route take default_route and unknown addons add no time. Each
+        unknown name is logged once.
+        """
+        key = _name_key(item.get("name"))
+        steps = self.routing.get(key)
+        if steps is None:
+            self._warn_unknown("item", key)
+            steps = self.default_route
+        steps = list(steps)
+        for addon in item.get("addons") or []:
+            addon_key = _name_key(addon)
+            if addon_key not in self.addon_minutes:
+                self._warn_unknown("addon", addon_key)
+                continue
+            if not steps:
+                continue
+            station, minutes = self.addon_minutes[addon_key]
+            # Extra work lands on the matching step, or the last one if the
+            # item never visits that station.
+            idx = next((i for i, (s, _) in enumerate(steps) if s == station), len(steps) - 1)
+            steps[idx] = (steps[idx][0], steps[idx][1] + minutes)
+        return steps
+
+    def _warn_unknown(self, kind: str, key: str) -> None:
+        if (kind, key) in self._unknown:
+            return
+        self._unknown.add((kind, key))
+        logger.warning("[StationScheduler] No routing for %s %r; using defaults", kind, key)
+
+    def build_jobs(self, order: dict) -> list[list[StationJob]]:
+        """One job chain per unit, longest chains first."""
+        order_id = order.get("order_id") or "UNKNOWN_ORDER"
+        chains: list[list[StationJob]] = []
+        for line, item in enumerate(order.get("items") or []):
+            steps = self.route(item)
+            for unit in range(1, int(item.get("quantity", 1) or 1) + 1):
+                chains.append([
+                    StationJob(
+                        job_id=f"{order_id}-{line}-{unit}-{s}",
+                        order_id=order_id,
+                        item=item.get("name", "unknown item"),
+                        unit=unit,
+                        station=station,
+                        step=s,
+                        duration=minutes,
+                        addons=list(item.get("addons") or []),
+                    )
+                    for s, (station, minutes) in enumerate(steps)
+                ])
+        chains.sort(key=lambda chain: sum(j.duration for j in chain), reverse=True)
+        return chains
+
+    # ---- placement ----
+
+    @staticmethod
+    def _earliest_gap(batches: list, ready: float, duration: float) -> float:
+        """Earliest start >= ready where [start, start + duration) fits between batches."""
+        start = ready
+        for batch in batches:
+            if start + duration <= batch.start:
+                break
+            start = max(start, batch.finish)
+        return start
+
+    def _open_batch_for(self, job: StationJob, ready: float, latest: float, now: float):
+        """A not-yet-started batch `job` can join without starting later than `latest`."""
+        if self.batch_size.get(job.station, 1) <= 1:
+            return None
+        best = None
+        for slot in self._slots[job.station]:
+            for batch in slot:
+                if (
+                    batch.key == job.key
+                    and len(batch.jobs) < self.batch_size[job.station]
+                    and max(ready, now) <= batch.start <= latest
+                    and (best is None or batch.start < best.start)
+                ):
+                    best = batch
+        return best
+
+    def _place(self, job: StationJob, ready: float, now: float) -> StationBatch:
+        slots = self._slots[job.station]
+        best_slot, best_start = 0, None
+        for idx, batches in enumerate(slots):
+            start = self._earliest_gap(batches, ready, job.duration)
+            if best_start is None or start < best_start:
+                best_slot, best_start = idx, start
+
+        batch = self._open_batch_for(job, ready, best_start + self.batch_window, now)
+        if batch is None:
+            batch = StationBatch(
+                batch_id=f"{job.station}-B{next(self._seq)}",
+                station=job.station,
+                key=job.key,
+                slot=best_slot,
+                start=best_start,
+                finish=best_start + job.duration,
+            )
+            self._batches[batch.batch_id] = batch
+            slots[best_slot].append(batch)
+            slots[best_slot].sort(key=lambda b: b.start)
+        batch.jobs.append(job)
+        job.batch_id = batch.batch_id
+        return batch
+
+    def _prune(self, now: float) -> None:
+        """Forget batches (and whole orders) that finished before `now`."""
+        for slots in self._slots.values():
+            for i, batches in enumerate(slots):
+                if batches and batches[0].finish <= now:
+                    slots[i] = [b for b in batches if b.finish > now]
+        for batch_id in [b for b, batch in self._batches.items() if batch.finish <= now]:
+            del self._batches[batch_id]
+        done = [
+            oid for oid, jobs in self._orders.items()
+            if not any(j.batch_id in self._batches for j in jobs)
+        ]
+        for oid in done:
+            del self._orders[oid]
+
+    def plan(self, order: dict, now: Optional[float] = None) -> list[StationJob]:
+        """Schedule every job of `order` against the current station load."""
+        now = _now_minutes() if now is None else now
+        order_id = order.get("order_id") or "UNKNOWN_ORDER"
+        with self._lock:
+            self._prune(now)
+            self._release(order_id)
+            jobs: list[StationJob] = []
+            for chain in self.build_jobs(order):
+                ready = now
+                for job in chain:
+                    if job.station not in self._slots:
+                        # Unknown station in the routing table: treat it as one slot.
+                        self.capacity[job.station] = 1
+                        self.batch_size[job.station] = 1
+                        self._slots[job.station] = [[]]
+                    ready = self._place(job, ready, now).finish
+                    jobs.append(job)
+            self._orders[order_id] = jobs
+            return jobs
+
+    def release(self, order_id: str) -> bool:
+        """Drop a completed or cancelled order's jobs so their slots can be reused."""
+        with self._lock:
+            return self._release(order_id)
+
+    def _release(self, order_id: str) -> bool:
+        jobs = self._orders.pop(order_id, None)
+        if not jobs:
+            return False
+        for job in jobs:
+            batch = self._batches.get(job.batch_id)
+            if batch is None:
+                continue
+            batch.jobs = [j for j in batch.jobs if j.job_id != job.job_id]
+            if not batch.jobs:
+                # Nothing left to cook in this run: give the slot time back.
+                del self._batches[batch.batch_id]
+                self._slots[batch.station][batch.slot].remove(batch)
+        return True
+
+    # ---- views ----
+
+    def batch(self, batch_id: str) -> Optional[StationBatch]:
+        return self._batches.get(batch_id)
+
+    def progress(self, order_id: str, now: Optional[float] = None) -> dict:
+        """Per-order completion across all the batches its jobs were placed in."""
+        now = _now_minutes() if now is None else now
+        with self._lock:
+            jobs = list(self._orders.get(order_id, []))
+            batches = [self._batches.get(j.batch_id) for j in jobs]
+        if not jobs:
+            return {"order_id": order_id, "tracked": False}
+        finishes = [b.finish if b else now for b in batches]
+        return {
+            "order_id": order_id,
+            "tracked": True,
+            "jobs_total": len(jobs),
+            "jobs_done": sum(1 for f in finishes if f <= now),
+            "ready_at": _iso(max(finishes)),
+            "complete": all(f <= now for f in finishes),
+        }
+
+    def station_load(self, now: Optional[float] = None) -> dict:
+        now = _now_minutes() if now is None else now
+        load = {}
+        with self._lock:
+            for name, slots in self._slots.items():
+                live = [b for batches in slots for b in batches if b.finish > now]
+                load[name] = {
+                    "capacity": self.capacity[name],
+                    "batch_size": self.batch_size[name],
+                    "batches_in_flight": len(live),
+                    "jobs_in_flight": sum(len(b.jobs) for b in live),
+                    "busy_until": _iso(max((b.finish for b in live), default=now)),
+                }
+        return load
+
+    def schedule(self, order: dict) -> dict:
+        """Schedule `order` and return the station_split plan for session state."""
+        now = _now_minutes()
+        jobs = self.plan(order, now)
+        order_id = order.get("order_id") or "UNKNOWN_ORDER"
+
+        with self._lock:
+            placed = [(job, self._batches[job.batch_id]) for job in jobs]
+            placed = [(job, b.slot, b.start, b.finish, b.fanout) for job, b in placed]
+        placed.sort(key=lambda p: (p[2], p[0].station, p[1]))
+
+        split: dict = {name: [] for name in STATION_NAMES}
+        for job, slot, start, finish, fanout in placed:
+            split.setdefault(job.station, []).append({
+                "job_id": job.job_id,
+                "order_id": job.order_id,
+                "item": job.item,
+                "unit": job.unit,
+                "addons": job.addons,
+                "slot": slot,
+                "start": _iso(start),
+                "finish": _iso(finish),
+                "duration_min": round(job.duration, 2),
+                "batch_id": job.batch_id,
+                "batch_fanout": fanout,
+            })
+
+        ready_at = max((p[3] for p in placed), default=now)
+        batch_ids = {p[0].batch_id for p in placed}
+        shared = {p[0].batch_id for p in placed if set(p[4]) - {order_id}}
+        last = max(placed, key=lambda p: p[2], default=None)
+        split.update({
+            "order_id": order_id,
+            "order_ready_at": _iso(ready_at),
+            "makespan_min": round(ready_at - now, 2),
+            "station_load": self.station_load(now),
+            "reasoning": (
+                f"{len(jobs)} job(s) in {len(batch_ids)} batch(es), {len(shared)} shared "
+                "with other orders, placed by earliest finish time across all in-flight orders. "
+                + (
+                    f"Last job to start: {last[0].item} on {last[0].station} in "
+                    f"{last[2] - now:.0f} min; order ready in {ready_at - now:.0f} min."
+                    if last else "No items to schedule."
+                )
+            ),
+        })
+        return split
@@ -0,0 +1,26 @@
+import json
+import os
+import tempfile
+
+
+def atomic_write_json(path: str, data, indent: int = 2) -> None:
+    """
+    Write `data` as JSON so readers only ever see the old or the new file.
+
+    The payload goes to a temp file in the same directory, is fsync'ed and
+    then renamed over `path` with os.replace (atomic on POSIX and Windows).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -20,7 +20,7 @@
 from .queuing_agent import queuing_agent
 from .kitchen_load_balancer_agent import kitchen_load_balancer_agent
 from .ai_checker_agent import ai_checker_agent
-from .notifier_agent import notifier_agent
+from .notifier_agent import notifier_agent, conditional_notifier_agent
 from .delivery_agent import delivery_agent
 from .forecasting_agent import forecasting_agent
 # from .storekeeper_agent import storekeeper_agent
@@ -1,37 +1,55 @@
 
 import os
 import json
+import threading
 
-from google import genai
 from google.genai import types
 
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool, ToolContext
 
 from ..config import config
-from ..agent_utils import suppress_output_callback
+from ..agent_utils import enable_response_cache, suppress_output_callback
+from ..state_codec import decode, normalize_output
 
 
 # -------------------------------------------------------------------
 # 1) Gemini client + config (API key based, NOT Vertex ADC)
 # -------------------------------------------------------------------
 
-# Use your existing GOOGLE_API_KEY from .env
-GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-if not GEMINI_API_KEY:
-    raise RuntimeError(
-        "GOOGLE_API_KEY (or GEMINI_API_KEY) is not set. "
-        "Please add it to your .env or environment."
-    )
-
 # You can still reuse the same model name you stored in config.vision_model
 VISION_MODEL = os.getenv("VERTEX_VISION_MODEL", config.vision_model)
 
-client = genai.Client(
-    api_key=GEMINI_API_KEY,
-    # IMPORTANT: force non-Vertex mode even if GOOGLE_GENAI_USE_VERTEXAI is set
-    vertexai=False,
-)
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_vision_client():
+    """
+    Build the Gemini client on first use rather than at import time,
+    so importing the agent tree needs neither an API key nor a network client.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Use your existing GOOGLE_API_KEY from .env
+                api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise RuntimeError(
+                        "GOOGLE_API_KEY (or GEMINI_API_KEY) is not set. "
+                        "Please add it to your .env or environment."
+                    )
+
+                from google import genai
+
+                _client = genai.Client(
+                    api_key=api_key,
+                    # IMPORTANT: force non-Vertex mode even if GOOGLE_GENAI_USE_VERTEXAI is set
+                    vertexai=False,
+                )
+    return _client
+
 
 # Default reference video: qsr_agent/data/assembly_reference.mp4
 DEFAULT_VIDEO_PATH = os.getenv(
@@ -111,7 +129,7 @@ def _run_video_analysis(
     )
 
     try:
-        response = client.models.generate_content(
+        response = get_vision_client().models.generate_content(
             model=VISION_MODEL,
             contents=[
                 types.Content(
@@ -184,120 +202,35 @@ def analyze_assembly_video(
 
     Parameters:
       order_id: The order_id to validate.
-      tool_context: Provided by ADK. Contains session state, including:
-        - state["order"]:
-            Either:
-              a) a dict like:
-                 {
-                   "order_id": "...",
-                   "items": [...],
-                   ...
-                 }
-              b) a JSON string with the same content
-              c) a JSON string wrapped as {"order": {...}}
-        - state["kitchen_plan"] or similar:
-            Either dict or JSON string containing an "assembly" array.
+      tool_context: Provided by ADK. Reads from session state:
+        - state["order"]: the finalized order (see state_codec.Order).
+        - state["station_split"]: the kitchen_load_balancer_agent plan,
+          whose "assembly" jobs list each item's ingredients and addons.
     """
-    state = tool_context.state or {}
-
-    # ---- 1) Normalize `order` from state ----
-    raw_order = state.get("order")
-
-    order: dict = {}
-    if isinstance(raw_order, dict):
-        order = raw_order
-    elif isinstance(raw_order, str):
-        # Try to parse JSON from string
-        try:
-            parsed = json.loads(raw_order)
-            if isinstance(parsed, dict):
-                # Sometimes it's {"order": {...}}
-                if "order" in parsed and isinstance(parsed["order"], dict):
-                    order = parsed["order"]
-                else:
-                    order = parsed
-        except Exception:
-            # If parsing fails, leave as empty dict; we'll fall back later
-            order = {}
-    elif raw_order is None:
-        order = {}
-    else:
-        # Unknown type; be defensive
-        order = {}
-
-    # ---- 2) Normalize `kitchen_plan` / load-balancer output from state ----
-    raw_kitchen_plan = (
-        state.get("kitchen_plan")
-        or state.get("kitchen_load_plan")
-        or state.get("station_output")
-    )
+    order = decode(tool_context.state, "order")
+    plan = decode(tool_context.state, "station_split")
+
+    # ---- 1) Item to check: the order's first item ----
+    item_name = order.items[0].name if order and order.items else None
+
+    # ---- 2) Expected ingredients/addons from its assembly job ----
+    job = None
+    if plan is not None:
+        if item_name:
+            job = plan.assembly_for(item_name)
+        elif plan.assembly:
+            # No item on the order; fall back to the first assembly job.
+            job = plan.assembly[0]
+            item_name = job.item
+    expected_ingredients = list(job.ingredients) if job else []
+    expected_addons = list(job.addons) if job else []
 
-    kitchen_plan: dict = {}
-    if isinstance(raw_kitchen_plan, dict):
-        kitchen_plan = raw_kitchen_plan
-    elif isinstance(raw_kitchen_plan, str):
-        try:
-            parsed = json.loads(raw_kitchen_plan)
-            if isinstance(parsed, dict):
-                kitchen_plan = parsed
-        except Exception:
-            kitchen_plan = {}
-    elif raw_kitchen_plan is None:
-        kitchen_plan = {}
-    else:
-        kitchen_plan = {}
-
-    # ---- 3) Derive item_name from order ----
-    item_name = None
-    items = order.get("items") or []
-    if items:
-        first_item = items[0]
-        item_name = (
-            first_item.get("name")
-            or first_item.get("item_name")
-            or first_item.get("item")
-        )
-
-    # ---- 4) Derive expected ingredients/addons from assembly plan ----
-    expected_ingredients: list[str] = []
-    expected_addons: list[str] = []
-
-    assembly_blocks = kitchen_plan.get("assembly") or []
-    for block in assembly_blocks:
-        block_item = block.get("item")
-        # In your sample, the assembly block uses `components` not `ingredients`
-        # so we treat components as ingredients if `ingredients` missing.
-        block_ingredients = (
-            block.get("ingredients")
-            or block.get("components")
-            or []
-        )
-        block_addons = block.get("addons") or []
-
-        if item_name and block_item == item_name:
-            expected_ingredients = block_ingredients
-            expected_addons = block_addons
-            break
-
-    # ---- 5) Fallbacks if order/assembly incomplete ----
     if not item_name:
-        # Try to infer from assembly if order didn't have it
-        if assembly_blocks:
-            first_block = assembly_blocks[0]
-            item_name = first_block.get("item", "unknown item")
-            expected_ingredients = (
-                first_block.get("ingredients")
-                or first_block.get("components")
-                or []
-            )
-            expected_addons = first_block.get("addons") or []
-        else:
-            item_name = "unknown item"
-
+        item_name = "unknown item"
     if not order_id:
-        order_id = order.get("order_id", "UNKNOWN_ORDER")
+        order_id = order.order_id if order else "UNKNOWN_ORDER"
 
-    # ---- 6) Delegate to low-level vision helper ----
+    # ---- 3) Delegate to low-level vision helper ----
     return _run_video_analysis(
         order_id=order_id,
         item_name=item_name,
@@ -323,14 +256,30 @@ def request_human_approval(
     would push `ai_assessment` to your kitchen UI, Slack, or a moderation
     dashboard, and then have a human mark it APPROVED/REJECTED.
 
-    For now this is a 'pending' stub:
-    - It marks the check as needing human review.
+    For now this is a stub:
+    - A clean provisional PASS (nothing missing or unexpected) is
+      auto-approved, so the notifier is not woken for it.
+    - Anything else is 'pending' and marks the check as needing human review.
     - Downstream agents can look at `approval_status`.
     """
     # You can add your own side-effects here:
     # - write to a JSON file
     # - call a webhook
     # - send a notification, etc.
+    assessment = ai_assessment or {}
+    clean_pass = (
+        str(assessment.get("provisional_status", "")).upper() == "PASS"
+        and not assessment.get("missing_ingredients")
+        and not assessment.get("unexpected_items")
+    )
+    if clean_pass:
+        return {
+            "order_id": order_id,
+            "item_name": item_name,
+            "approval_status": "APPROVED",
+            "message": "Vision check passed with nothing missing or unexpected; auto-approved.",
+            "ai_assessment": ai_assessment,
+        }
     return {
         "order_id": order_id,
         "item_name": item_name,
@@ -346,7 +295,7 @@ def request_human_approval(
 # -------------------------------------------------------------------
 # 5) AI Checker Agent
 #    - Uses tools above
-#    - Reads state['order'] and state['kitchen_plan']
+#    - Reads state['order'] and state['station_split']
 #    - Writes final JSON to state['assembly_check']
 # -------------------------------------------------------------------
 ai_checker_agent = Agent(
@@ -369,7 +318,7 @@ HARD RULES (do not break these):
 CONTEXT:
 - The current order object is stored in session state under key "order".
 - The kitchen plan / station breakdown (including the assembly block) is
-  stored in state under a key like "station_split" (or similar).
+  stored in state under "station_split".
 - The `analyze_assembly_video` tool will automatically read these from state
   and return both expected and detected ingredients/addons.
 
@@ -439,5 +388,9 @@ RULES:
         FunctionTool(request_human_approval),
     ],
     output_key="assembly_check",
-    after_agent_callback=suppress_output_callback,
+    after_agent_callback=[normalize_output("assembly_check"), suppress_output_callback],
 )
+
+# Keyed on the order's content; tool results are part of the request, so a
+# re-check with a different video analysis or approval is a miss.
+enable_response_cache(ai_checker_agent, state_keys=("order",), order_scoped=True)
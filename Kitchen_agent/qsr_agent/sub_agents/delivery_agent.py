@@ -1,45 +1,73 @@
 
-from google.adk.agents import Agent
+from typing import AsyncGenerator
 
-from ..config import config
-from ..agent_utils import suppress_output_callback
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 
+from ..delivery_rules import TABLE_DELIVERY, classify_delivery
+from ..state_codec import decode
+from ..tools import COMPLETED_STATUS, STARTED_STATUSES, get_table_dispatcher
 
-delivery_agent = Agent(
-    model=config.worker_model,
+
+class DeliveryAgent(BaseAgent):
+    """
+    Deterministic delivery step (last step of the kitchen pipeline).
+
+    Classifies state["order"] as pickup, table_delivery or drone_delivery.
+    Table deliveries are registered with the shared TableDispatcher at the
+    ready time from state["station_split"], and the runner trip they are
+    expected to share with other orders in the same floor zone is attached.
+    The result goes to state["delivery_assignment"].
+
+    Orders that are already COMPLETED, or started but not yet READY, are
+    reported with their status and not handed to the dispatcher (a READY
+    order is dispatched as ready now).
+    """
+
+    async def _run_async_impl(
+        self, context: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = context.session.state
+        order = decode(state, "order")
+
+        if order is None:
+            assignment = {"status": "WAITING", "reason": "No finalized order received yet."}
+        elif order.status.upper() == COMPLETED_STATUS:
+            assignment = {
+                "order_id": order.order_id,
+                "status": COMPLETED_STATUS,
+                "reason": "Order is already completed; it is not dispatched again.",
+            }
+        elif order.status.upper() in STARTED_STATUSES and order.status.upper() != "READY":
+            assignment = {
+                "order_id": order.order_id,
+                "status": order.status.upper(),
+                "reason": "Order is still being prepared; it is dispatched once READY.",
+            }
+        else:
+            dispatcher = get_table_dispatcher()
+            assignment = classify_delivery(order.to_state(), dispatcher.known_tables())
+            if assignment["delivery_mode"] == TABLE_DELIVERY:
+                plan = decode(state, "station_split")
+                entry = dispatcher.add(
+                    assignment["order_id"],
+                    assignment["table_number"],
+                    # None (unknown ready time) means "now" to the dispatcher.
+                    ready_at=plan.ready_minutes() if plan else None,
+                )
+                assignment["zone"] = entry.zone
+                assignment["runner_trip"] = dispatcher.trip_for(entry.order_id)
+
+        yield Event(
+            invocation_id=context.invocation_id,
+            author=self.name,
+            branch=context.branch,
+            actions=EventActions(state_delta={"delivery_assignment": assignment}),
+        )
+
+
+delivery_agent = DeliveryAgent(
     name="delivery_agent",
     description="classifies delivery method: pickup, staff-table-delivery, or drone delivery.",
-    instruction="""
-    You are the Delivery Agent responsible fordetermining the correct delivery mode.
-
-    INPUT FIELDS YOU RECEIVE:
-    {
-      "qr_data": "...", 
-      "order_id": "...",  
-      "delivery_preference": "pickup | table | drone",
-      "table_number": "...", 
-      "user_type": "customer | staff | vip | automated"
-    }
-
-    YOUR JOB:
-  
-
-    1. Determine the correct delivery category:
-       - "pickup" → customer collects directly
-       - "table_delivery" → staff delivers to a table
-       - "drone_delivery" → drone dispatch required
-
-    2. Output a structured JSON response:
-       {
-         "order_id": "...",
-         "delivery_mode": "pickup | table_delivery | drone_delivery",
-         "table_number": "...",   # null if not applicable,if table numver is not in input give random number
-       }
-
-    RULES:
-    - If drone delivery is chosen but table_number exists → ignore table number.
-    - Your response must NOT include extra text outside JSON.
-    """,
-    output_key="delivery_assignment",
-    after_agent_callback=suppress_output_callback,
 )
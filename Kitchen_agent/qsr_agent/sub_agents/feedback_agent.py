@@ -1,9 +1,11 @@
 
 from google.adk.agents import Agent, LoopAgent
-from google.adk.tools import google_search
+from google.adk.tools import FunctionTool
 
 from ..config import config
-from ..agent_utils import suppress_output_callback
+from ..agent_utils import structured_output_callback, suppress_output_callback
+from ..output_schemas import FeedbackAnalysis
+from ..tools import analyze_feedback_batch, get_reference_data, load_feedback_history
 from ..validation_checkers import FeedbackValidationChecker
 
 
@@ -21,14 +23,26 @@ feedback_agent = Agent(
     - Detect actionable issues for service improvement.
     - Summarize insights clearly.
 
-    Required output:
-    - A structured JSON with scores, tags, and recommendations.
-    - A human-readable summary.
-
-    You may use Google Search to understand restaurant feedback trends and best practices.
+    Tools (all local, no web search):
+    - `load_feedback_history(since, limit, cursor, newest_first)` for stored
+      feedback; pages start from the most recent entries.
+    - `analyze_feedback_batch(texts)` for lexicon sentiment scores and category tags.
+    - `get_reference_data("feedback")` for sentiment bands and the category
+      taxonomy (owner and severity of each category).
+
+    Required output (a single JSON object, enforced by the output schema):
+    - `sentiment` (positive / neutral / negative) and `score` from -1 to 1.
+    - `categories`, `issues` and `recommendations`.
+    - `summary`: a human-readable summary.
     """,
-    tools=[google_search],
+    tools=[
+        FunctionTool(load_feedback_history),
+        FunctionTool(analyze_feedback_batch),
+        FunctionTool(get_reference_data),
+    ],
     output_key="feedback_analysis",
+    output_schema=FeedbackAnalysis,
+    after_model_callback=structured_output_callback(FeedbackAnalysis, "feedback_analysis"),
     after_agent_callback=suppress_output_callback,
 )
 
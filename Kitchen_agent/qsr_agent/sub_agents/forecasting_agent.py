@@ -27,6 +27,8 @@ forecasting_agent = Agent(
        - You do NOT need to provide the 'data' argument; the tool will load 
          historical sales automatically from the database.
        - Simply call `run_prophet_forecast(periods=7)`.
+       - The result holds the total daily demand under "forecast" and one
+         series per menu item under "items"; use the series for "item_name".
 
     2. Compare:
        - previous_forecast
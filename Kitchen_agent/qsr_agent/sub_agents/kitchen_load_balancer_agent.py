@@ -1,62 +1,58 @@
 
-from google.adk.agents import Agent
-
-from ..config import config
-from ..agent_utils import suppress_output_callback
-
-
-kitchen_load_balancer_agent = Agent(
-    model=config.worker_model,
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from ..state_codec import decode
+from ..tools import STARTED_STATUSES, get_bom_engine, get_station_scheduler
+
+
+class KitchenLoadBalancerAgent(BaseAgent):
+    """
+    Deterministic station scheduler step.
+
+    Routes every unit of state["order"] through its stations (from
+    data/stations.json) and places the jobs on the shared StationScheduler,
+    which sees every in-flight order. The plan, with slot, start and finish
+    per job, is written to state["station_split"]. Assembly jobs also carry
+    the item's ingredients so the AI checker knows what to expect.
+
+    Orders that have already started are not planned again: their existing
+    progress on the scheduler is reported instead.
+    """
+
+    async def _run_async_impl(
+        self, context: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        order = decode(context.session.state, "order")
+
+        if order is None or not order.items:
+            split = {"status": "WAITING", "reason": "No finalized order received yet."}
+        elif order.status.upper() in STARTED_STATUSES:
+            split = {
+                "order_id": order.order_id,
+                "status": order.status.upper(),
+                "reason": "Order has already started; it is not scheduled again.",
+                "progress": get_station_scheduler().progress(order.order_id),
+            }
+        else:
+            split = get_station_scheduler().schedule(order.to_state())
+            bom = get_bom_engine()
+            for job in split.get("assembly", []):
+                exploded = bom.explode({"items": [{"name": job["item"], "addons": job["addons"]}]})
+                job["ingredients"] = sorted(exploded["ingredients"])
+
+        yield Event(
+            invocation_id=context.invocation_id,
+            author=self.name,
+            branch=context.branch,
+            actions=EventActions(state_delta={"station_split": split}),
+        )
+
+
+kitchen_load_balancer_agent = KitchenLoadBalancerAgent(
     name="kitchen_load_balancer_agent",
     description="Splits an order into different kitchen stations such as frying, grilling, baking, beverages, and assembly.",
-    instruction="""
-    You are the Kitchen Load Balancer Agent for an automated AI restaurant system.
-
-      
-      Always read the order from session.state["order"].
-      If session.state["order"] is missing, call get_order_details via parent agent.
-      Never ask user for order details.
-
-
-    Your responsibilities:
-    1. Receive structured order details, including:
-       - items
-       - addons
-       - ingredients list
-       - cooking method (if provided)
-       - predefined mapping from menu → station types
-
-    2. Split the order into the correct kitchen stations:
-       - frying_station
-       - grilling_station
-       - baking_station
-       - beverage_station
-       - salad_station
-       - assembly_station
-
-    3. For each item:
-       - Identify required station(s)
-       - Prepare a clean station job list
-       - Include addons and customizations
-       - Include required ingredients for each item
-
-    4. Output must be a single JSON object:
-       {
-         "frying": [...],
-         "grilling": [...],
-         "baking": [...],
-         "beverage": [...],
-         "salad": [...],
-         "assembly": [...],
-         "reasoning": "short explanation of the distribution"
-         "forcast":[...],#add dummy for forcasting order for next 1 hr
-       }
-
-    5. Do NOT include extra explanations outside the JSON.
-    6. Do NOT perform cooking; you only split the instruction load.
-
-    Your output should be extremely structured and ready for downstream station agents.
-    """,
-    output_key="station_split",
-    after_agent_callback=suppress_output_callback,
 )
@@ -1,9 +1,11 @@
 
 from google.adk.agents import Agent, LoopAgent
-from google.adk.tools import google_search
+from google.adk.tools import FunctionTool
 
 from ..config import config
-from ..agent_utils import suppress_output_callback
+from ..agent_utils import structured_output_callback, suppress_output_callback
+from ..output_schemas import LoyaltyUpdate
+from ..tools import fetch_loyalty_profile, get_loyalty_tier, get_reference_data, update_loyalty_points
 from ..validation_checkers import LoyaltyUpdateValidationChecker
 
 
@@ -19,15 +21,27 @@ loyalty_agent = Agent(
     - Ensuring loyalty values never become inconsistent.
     - Generating alerts for reward unlocking.
 
-    Required output:
-    - A structured JSON containing updated loyalty data.
-    - Any triggered reward events.
-    - Logs on what changed and why.
+    Tools (all local, no web search):
+    - `fetch_loyalty_profile(user_id)` and `update_loyalty_points(user_id, points)`.
+      Points are credited once per order: a result with "duplicate": true
+      means this order was already credited; report the balance it returns.
+    - `get_reference_data("loyalty")` for the points rules, tiers and rewards.
+    - `get_loyalty_tier(points)` for the tier of a points balance.
 
-    You may use Google Search to reference standard loyalty reward practices.
+    Required output (a single JSON object, enforced by the output schema):
+    - `user_id`, `points_awarded`, `updated_points` and `status` (the tier).
+    - `rewards`: any reward events triggered by this update.
+    - `summary`: what changed and why.
     """,
-    tools=[google_search],
+    tools=[
+        FunctionTool(fetch_loyalty_profile),
+        FunctionTool(update_loyalty_points),
+        FunctionTool(get_loyalty_tier),
+        FunctionTool(get_reference_data),
+    ],
     output_key="loyalty_update",
+    output_schema=LoyaltyUpdate,
+    after_model_callback=structured_output_callback(LoyaltyUpdate, "loyalty_update"),
     after_agent_callback=suppress_output_callback,
 )
 
@@ -2,7 +2,9 @@
 from google.adk.agents import Agent
 
 from ..config import config
-from ..agent_utils import suppress_output_callback
+from ..agent_utils import enable_response_cache, suppress_output_callback
+from ..pipeline import ConditionalAgent
+from ..state_codec import decode, normalize_output
 
 
 notifier_agent = Agent(
@@ -50,5 +52,25 @@ notifier_agent = Agent(
     - You do NOT fix the issue; you only notify the human chef.
     """,
     output_key="chef_alert",
-    after_agent_callback=suppress_output_callback,
+    after_agent_callback=[normalize_output("chef_alert"), suppress_output_callback],
+)
+
+enable_response_cache(notifier_agent, state_keys=("assembly_check",), order_scoped=True)
+
+
+def needs_chef_alert(state) -> bool:
+    """
+    notifier_agent's trigger: the assembly check FAILed or asks for a human.
+    A missing or unreadable check also alerts, so problems are never silent.
+    """
+    check = decode(state, "assembly_check")
+    return check is None or check.needs_attention
+
+
+conditional_notifier_agent = ConditionalAgent(
+    name="conditional_notifier_agent",
+    description="Runs notifier_agent only when the assembly check needs a chef's attention.",
+    sub_agents=[notifier_agent],
+    condition=needs_chef_alert,
+    skip_reason="Assembly check passed without human review; no chef alert needed.",
 )
@@ -1,16 +1,31 @@
 # blogger_agent/sub_agents/order_loader_agent.py
 
-from google.adk.agents import Agent
+import datetime
+import json
+import logging
+import re
+import uuid
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import Agent, BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 from google.adk.tools import FunctionTool
 
 from ..config import config
-from ..agent_utils import suppress_output_callback
+from ..agent_utils import enable_response_cache, suppress_output_callback
+from ..state_codec import Order, decode, normalize_output
 from ..tools import get_order_details
 
+logger = logging.getLogger(__name__)
+
+# Explicit order IDs as produced by the POS / save_new_order, e.g. ORD001, ORD-1A2B3C4D.
+ORDER_ID_PATTERN = re.compile(r"\b(?:ORD|HORD)-?[A-Z0-9]{3,}\b")
+
 
-order_loader_agent = Agent(
+order_loader_llm_agent = Agent(
     model=config.worker_model,
-    name="order_loader_agent",
+    name="order_loader_llm_agent",
     description="Loads full order details into shared state based on an order ID or natural language input.",
     instruction="""
     You are the first step in the Kitchen Agent pipeline.
@@ -57,6 +72,102 @@ order_loader_agent = Agent(
     tools=[FunctionTool(get_order_details)],
     # This makes the returned value appear in the shared state as state["order"]
     output_key="order",
-    after_agent_callback=suppress_output_callback,
+    after_agent_callback=[normalize_output("order"), suppress_output_callback],
 )
 
+# The same natural-language order always parses to the same items, so the
+# parse is served from the response cache; OrderLoaderFastPath then gives
+# each order its own TEMP id.
+enable_response_cache(order_loader_llm_agent)
+
+
+def _extract_structured_order(text: str) -> Optional[dict]:
+    """Return the order if `text` carries a JSON order ({"order": {...}} or {"items": [...]})."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        payload = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+
+    order = payload.get("order") if isinstance(payload.get("order"), dict) else payload
+    if not isinstance(order.get("items"), list) or not order["items"]:
+        return None
+
+    # Same defaults the LLM loader is told to infer.
+    order = dict(order)
+    order.setdefault("order_id", f"TEMP-{uuid.uuid4().hex[:8].upper()}")
+    order.setdefault("status", "QUEUED")
+    order.setdefault("loyalty_points_awarded", 0)
+    if not order.get("time"):
+        order["time"] = datetime.datetime.now().isoformat(timespec="seconds")
+    return order
+
+
+class OrderLoaderFastPath(BaseAgent):
+    """
+    Deterministic first stage of the order pipeline.
+
+    If the user message names an existing order ID, or already carries a
+    structured JSON order, the order is written straight to state["order"]
+    without a model call. Only free-form natural-language orders fall
+    through to the wrapped LLM loader (the single sub-agent).
+
+    Orders built by the LLM loader get a fresh TEMP id and timestamp
+    afterwards, so a cached parse of an identical message never reuses
+    another order's id.
+    """
+
+    async def _run_async_impl(
+        self, context: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        text = ""
+        if context.user_content and context.user_content.parts:
+            text = "\n".join(p.text for p in context.user_content.parts if p.text)
+
+        order = _extract_structured_order(text)
+        source = "structured_json"
+        if order is None:
+            for order_id in ORDER_ID_PATTERN.findall(text):
+                order = get_order_details(order_id) or None
+                if order:
+                    source = "order_store"
+                    break
+
+        if order is not None:
+            logger.info(
+                "[OrderLoader] Fast path hit | source=%s | order_id=%s",
+                source,
+                order.get("order_id"),
+            )
+            yield Event(
+                invocation_id=context.invocation_id,
+                author=self.name,
+                branch=context.branch,
+                actions=EventActions(state_delta={"order": Order.from_raw(order).to_state()}),
+            )
+            return
+
+        async for event in self.sub_agents[0].run_async(context):
+            yield event
+
+        order = decode(context.session.state, "order")
+        if order is not None and order.order_id.startswith("TEMP-"):
+            order.order_id = f"TEMP-{uuid.uuid4().hex[:8].upper()}"
+            order.time = datetime.datetime.now().isoformat(timespec="seconds")
+            yield Event(
+                invocation_id=context.invocation_id,
+                author=self.name,
+                branch=context.branch,
+                actions=EventActions(state_delta={"order": order.to_state()}),
+            )
+
+
+order_loader_agent = OrderLoaderFastPath(
+    name="order_loader_agent",
+    description="Loads the order into state['order'] directly for known IDs or JSON orders; otherwise asks the LLM loader.",
+    sub_agents=[order_loader_llm_agent],
+)
@@ -1,42 +1,52 @@
 
-from google.adk.agents import Agent
-from ..config import config
+from typing import AsyncGenerator
 
-queuing_agent = Agent(
-    model=config.worker_model,
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from ..state_codec import decode
+from ..tools import STARTED_STATUSES, get_kitchen_queue
+
+
+class QueuingAgent(BaseAgent):
+    """
+    Deterministic queuing step (first step of the kitchen pipeline).
+
+    Pushes state["order"] onto the shared KitchenQueue, which applies the
+    dine-in / large-order / takeaway priorities plus aging and estimates
+    the start time from the real queue depth. The result goes to
+    state["queue_assignment"] in the same shape the LLM version produced.
+
+    Orders that have already started (e.g. a completed order looked up
+    again by ID) are reported with their status and never re-queued.
+    """
+
+    async def _run_async_impl(
+        self, context: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        order = decode(context.session.state, "order")
+
+        if order is None or not order.items:
+            assignment = {"status": "WAITING", "reason": "No finalized order received yet."}
+        elif order.status.upper() in STARTED_STATUSES:
+            assignment = {
+                "order_id": order.order_id,
+                "status": order.status.upper(),
+                "reason": "Order has already started; it is not queued again.",
+            }
+        else:
+            assignment = get_kitchen_queue().push(order.to_state())
+
+        yield Event(
+            invocation_id=context.invocation_id,
+            author=self.name,
+            branch=context.branch,
+            actions=EventActions(state_delta={"queue_assignment": assignment}),
+        )
+
+
+queuing_agent = QueuingAgent(
     name="queuing_agent",
     description="Assigns priority and estimated start time based on order details.",
-    instruction="""
-    You are the Queuing Agent (First step of the Kitchen Pipeline).
-
-    **CRITICAL INPUT CHECK:**
-    1. Look at the message immediately before this one (output from Aura/Reception).
-    2. Does it contain a JSON object with the key `"order"`?
-    
-    **DECISION LOGIC:**
-    - **IF NO VALID ORDER FOUND:** (e.g., Input was "Hi", or "Here is the menu")
-      - **STOP IMMEDIATELY.** - Output: `{"status": "WAITING", "reason": "No finalized order received yet."}`
-      - Do NOT hallucinate an order ID.
-
-    - **IF VALID ORDER FOUND:**
-      - Parse the order details from that JSON.
-      - **Priority Rules:**
-        - Dine-in or Large Order (>5 items) = Priority 1 (High).
-        - Pickup/Takeaway = Priority 3 (Standard).
-      - **Time Estimation:**
-        - Add 15 minutes to the current time found in the order.
-      
-      - **OUTPUT:** Return a JSON object:
-        ```json
-        {
-          "order_id": "EXTRACTED_FROM_INPUT",
-          "queue_priority": 1,
-          "estimated_start_time": "...",
-          "reasoning": "..."
-        }
-        ```
-    """,
-    output_key="queue_assignment",
-#     after_agent_callback=suppress_output_callback,
 )
-
@@ -1,9 +1,11 @@
 
 from google.adk.agents import Agent, LoopAgent
-from google.adk.tools import google_search
+from google.adk.tools import FunctionTool
 
 from ..config import config
-from ..agent_utils import suppress_output_callback
+from ..agent_utils import structured_output_callback, suppress_output_callback
+from ..output_schemas import RefinedOutput
+from ..tools import get_reference_data
 from ..validation_checkers import RefinementValidationChecker
 
 
@@ -21,14 +23,16 @@ refinement_agent = Agent(
     - Preserve original meaning while enhancing quality.
     - Support long-form text restructuring.
 
-    Output must include:
-    - A refined version of the input content.
-    - A short list of improvements made.
+    Call `get_reference_data("writing_style")` for the house writing rules.
 
-    You may use Google Search to find writing guidelines, clarity principles, or formatting references.
+    Output must be a single JSON object (enforced by the output schema):
+    - `refined_content`: the refined version of the input content.
+    - `improvements`: a short list of improvements made.
     """,
-    tools=[google_search],
+    tools=[FunctionTool(get_reference_data)],
     output_key="refined_output",
+    output_schema=RefinedOutput,
+    after_model_callback=structured_output_callback(RefinedOutput, "refined_output"),
     after_agent_callback=suppress_output_callback,
 )
 
@@ -1,9 +1,17 @@
 
 from google.adk.agents import Agent, LoopAgent
-from google.adk.tools import google_search
+from google.adk.tools import FunctionTool
 
 from ..config import config
-from ..agent_utils import suppress_output_callback
+from ..agent_utils import structured_output_callback, suppress_output_callback
+from ..output_schemas import InventoryUpdate
+from ..tools import (
+    apply_inventory_deltas,
+    check_stock_levels,
+    fetch_inventory,
+    get_reference_data,
+    get_stock_deductions,
+)
 from ..validation_checkers import InventoryUpdateValidationChecker
 
 
@@ -23,17 +31,40 @@ storekeeper_agent = Agent(
     - Cross-checking ingredient availability before order approval.
     - Syncing with forecasting intelligence for predictive restocking.
 
-    Required output:
-    - A structured JSON update containing the revised inventory values.
-    - Clear logs of what changed and why.
-    - Any warnings (e.g., low stock, missing ingredients).
+    Required output (a single JSON object, enforced by the output schema):
+    - `changes`: one entry per ingredient touched, with `ingredient`,
+      `previous_quantity`, `new_quantity` (never negative) and `reason`.
+    - `low_stock`: ingredients at or below their threshold.
+    - `warnings`: anything else that needs attention (e.g., missing ingredients).
+    - `summary`: a short log of what changed and why.
+
+    Tools (all local, no web search):
+    - `fetch_inventory()` for current stock.
+    - `get_stock_deductions()` for the processed order's deductions, computed
+      from the recipe book in inventory keys; pass its `deltas` unchanged to
+      `apply_inventory_deltas` and list its `unstocked` items under `warnings`.
+    - `apply_inventory_deltas(deltas)` to deduct the processed order's items
+      and addons (negative values) or restock (positive values) in one write.
+      It is applied once per order: a result with "duplicate": true means
+      this order was already deducted, so report those changes instead of
+      deducting again.
+    - `check_stock_levels()` for par level, reorder point, status and reorder
+      quantity per item; use it for `low_stock` and restock amounts.
+    - `get_reference_data("inventory")` for storage and stock rules.
 
     Additional notes:
-    - Use Google Search to retrieve food storage best practices, safety constraints, or recommended stock thresholds.
     - Follow strict validation rules defined by the InventoryUpdateValidationChecker.
     """,
-    tools=[google_search],
+    tools=[
+        FunctionTool(fetch_inventory),
+        FunctionTool(get_stock_deductions),
+        FunctionTool(apply_inventory_deltas),
+        FunctionTool(check_stock_levels),
+        FunctionTool(get_reference_data),
+    ],
     output_key="updated_inventory",
+    output_schema=InventoryUpdate,
+    after_model_callback=structured_output_callback(InventoryUpdate, "updated_inventory"),
     after_agent_callback=suppress_output_callback,
 )
 
@@ -184,35 +184,100 @@
 
 # blogger_agent/tools.py
 
-import json
 import os
 import datetime
+import threading
 import uuid  # <--- Added for ID generation
-import pandas as pd
+from typing import TYPE_CHECKING, Optional
+
+from google.adk.tools import ToolContext
+
+from .event_log import EventLogger
+from .feedback_store import FeedbackStore
+from .inventory_ledger import InventoryLedger
+from .loyalty_store import LoyaltyStore
+from .menu_cache import MenuCache
+from .order_store import COMPLETED_STATUS, OrderStore, create_order_store
+from .queue_engine import KitchenQueue
+from .reference_data import ReferenceData
+from .response_cache import ResponseCache
+from .state_codec import decode
+from .station_scheduler import StationScheduler
+
+# NumPy-backed engines are imported on first use so that importing the
+# tools (and the agent tree) stays cheap.
+if TYPE_CHECKING:
+    from .bom import BomEngine
+    from .delivery_engine import TableDispatcher
+    from .forecasting import ForecastEngine
 
 # Base path to project directory
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # blogger_agent root
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 
 
+# ----------------------------------------------------------
+# Shared order store
+#   ORDER_STORE_BACKEND=sqlite  -> data/orders.db (default)
+#   ORDER_STORE_BACKEND=journal -> data/orders.jsonl
+# ----------------------------------------------------------
+ORDER_STORE_BACKEND = os.getenv("ORDER_STORE_BACKEND", "sqlite").lower()
+
+_order_store = None
+_order_store_lock = threading.Lock()
+
+
+def get_order_store() -> OrderStore:
+    """
+    Return the process-wide order store, building it on first use.
+    New stores are seeded once from the legacy orders.json.
+    """
+    global _order_store
+    if _order_store is None:
+        with _order_store_lock:
+            if _order_store is None:
+                _order_store = create_order_store(ORDER_STORE_BACKEND, DATA_DIR)
+    return _order_store
+
+
+# ----------------------------------------------------------
+# Shared LLM response cache (agents opt in with enable_response_cache)
+#   LLM_CACHE_SIZE=512   responses kept in memory (0 disables the cache)
+#   LLM_CACHE_TTL_S=600  seconds a response stays valid
+#   LLM_CACHE_DB=<path>  optional SQLite tier that survives restarts
+# ----------------------------------------------------------
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide LLM response cache, building it on first use."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    max_entries=int(os.getenv("LLM_CACHE_SIZE", "512")),
+                    ttl_seconds=float(os.getenv("LLM_CACHE_TTL_S", "600")),
+                    db_path=os.getenv("LLM_CACHE_DB") or None,
+                )
+    return _response_cache
+
+
 # ==========================================================
 # 1. RECEPTION / MENU TOOLS (New for Aura)
 # ==========================================================
 
+# Parsed once; re-read only when menu.json changes on disk.
+_menu_cache = MenuCache(os.path.join(DATA_DIR, "menu.json"))
+
+
 def get_menu() -> dict:
     """
     Fetches the menu items from the database.
     Used by the Reception Agent to show options to the user.
     """
-    menu_path = os.path.join(DATA_DIR, "menu.json")
-    if not os.path.exists(menu_path):
-        return {"error": "Menu file (menu.json) not found in data directory."}
-        
-    try:
-        with open(menu_path, "r") as f:
-            return json.load(f)
-    except Exception as e:
-        return {"error": f"Failed to load menu: {e}"}
+    return _menu_cache.menu()
 
 
 def save_new_order(
@@ -220,10 +285,11 @@ def save_new_order(
     eta: str,
     table_number: int = None,
     num_people: int = None,
-    customer_name: str = "Guest"
+    customer_name: str = "Guest",
+    delivery_mode: str = "dining"
 ) -> dict:
     """
-    Generates IDs, creates a structured order, saves it to orders.json, 
+    Generates IDs, creates a structured order, saves it to the order store,
     and returns the order object for the pipeline.
     
     Parameters:
@@ -251,19 +317,11 @@ def save_new_order(
     }
 
     # 3. Process Items (Try to map to IDs from menu.json if possible)
-    menu = get_menu()
-    flat_menu = {}
-    if "error" not in menu:
-        for category in menu.values():
-            if isinstance(category, list):
-                for m_item in category:
-                    flat_menu[m_item.get('name', '').lower()] = m_item.get('id')
-
     for item in items:
         item_name = item.get("name", "Unknown")
         # Lookup ID or generate temporary one
-        item_id = flat_menu.get(item_name.lower(), f"ITEM-{uuid.uuid4().hex[:4]}")
-        
+        item_id = _menu_cache.item_id(item_name) or f"ITEM-{uuid.uuid4().hex[:4]}"
+
         new_order["items"].append({
             "item_id": item_id,
             "name": item_name,
@@ -271,27 +329,8 @@ def save_new_order(
             "addons": item.get("addons", [])
         })
 
-    # 4. Save to orders.json
-    orders_path = os.path.join(DATA_DIR, "orders.json")
-    current_orders = []
-    
-    if os.path.exists(orders_path):
-        try:
-            with open(orders_path, "r") as f:
-                content = f.read().strip()
-                if content:
-                    current_orders = json.loads(content)
-        except json.JSONDecodeError:
-            current_orders = []
-
-    # Ensure it's a list
-    if not isinstance(current_orders, list):
-        current_orders = []
-
-    current_orders.append(new_order)
-
-    with open(orders_path, "w") as f:
-        json.dump(current_orders, f, indent=2)
+    # 4. Persist through the order store (no full-file rewrite)
+    get_order_store().put(new_order)
 
     # Return structured dict for the next agent
     return {"order": new_order}
@@ -301,75 +340,215 @@ def save_new_order(
 # 2. ORDER MANAGEMENT TOOLS (Existing)
 # ==========================================================
 
-def get_order_details(order_id: str) -> dict:
-    """Fetch order details from orders.json."""
-    with open(os.path.join(DATA_DIR, "orders.json"), "r") as f:
-        orders = json.load(f)
-    for order in orders:
-        if order["order_id"] == order_id:
-            return order
-    return {}  # empty if not found
+STARTED_STATUSES = {"PREPARING", "ASSEMBLING", "READY", COMPLETED_STATUS}
+COOKED_STATUSES = {"READY", COMPLETED_STATUS}
+
+_station_scheduler = None
+_station_scheduler_lock = threading.Lock()
+
+
+def get_station_scheduler() -> StationScheduler:
+    """Return the process-wide station scheduler, loading stations.json on first use."""
+    global _station_scheduler
+    if _station_scheduler is None:
+        with _station_scheduler_lock:
+            if _station_scheduler is None:
+                _station_scheduler = StationScheduler(os.path.join(DATA_DIR, "stations.json"))
+    return _station_scheduler
 
-def update_order_status(order_id: str, status: str) -> dict:
-    """Update order status."""
-    with open(os.path.join(DATA_DIR, "orders.json"), "r") as f:
-        orders = json.load(f)
 
-    updated = False
-    for order in orders:
-        if order["order_id"] == order_id:
-            order["status"] = status
-            updated = True
-            break
+# ----------------------------------------------------------
+# Shared kitchen queue
+#   KITCHEN_QUEUE_TTL_MIN=120  minutes an order may wait before it is
+#                              dropped as stale (0 keeps it until it starts)
+# ----------------------------------------------------------
+_kitchen_queue = None
+_kitchen_queue_lock = threading.Lock()
 
-    with open(os.path.join(DATA_DIR, "orders.json"), "w") as f:
-        json.dump(orders, f, indent=2)
 
+def get_kitchen_queue() -> KitchenQueue:
+    """
+    Return the process-wide kitchen queue, building it on first use.
+    Wait estimates spread over the station slots of stations.json.
+    """
+    global _kitchen_queue
+    if _kitchen_queue is None:
+        with _kitchen_queue_lock:
+            if _kitchen_queue is None:
+                _kitchen_queue = KitchenQueue(
+                    station_capacity=sum(get_station_scheduler().capacity.values()),
+                    ttl_minutes=float(os.getenv("KITCHEN_QUEUE_TTL_MIN", "120")),
+                )
+    return _kitchen_queue
+
+
+def get_order_details(order_id: str) -> dict:
+    """Fetch order details from the order store."""
+    return get_order_store().get(order_id) or {}  # empty if not found
+
+def update_order_status(order_id: str, status: str) -> dict:
+    """Update order status."""
+    store = get_order_store()
+    before = store.get(order_id)
+    updated = store.update_status(order_id, status)
+    if updated and str(status).upper() in STARTED_STATUSES and _kitchen_queue is not None:
+        # Once cooking starts the order no longer waits in the kitchen queue.
+        _kitchen_queue.remove(order_id)
+    if updated and str(status).upper() in COOKED_STATUSES and _station_scheduler is not None:
+        # Free any station time the order still had reserved.
+        _station_scheduler.release(order_id)
+    if updated and str(status).upper() == COMPLETED_STATUS and _table_dispatcher is not None:
+        # Delivered (or collected): no runner needs to carry it any more.
+        _table_dispatcher.remove(order_id)
+    if updated and str(status).upper() == COMPLETED_STATUS and before.get("status") != COMPLETED_STATUS:
+        # Orders feed the demand series once, when they become COMPLETED.
+        get_forecast_engine().record_order(store.get(order_id))
     return {"updated": updated, "order_id": order_id, "new_status": status}
 
+def get_order_progress(order_id: str) -> dict:
+    """Station progress of an order: jobs done vs. total across its (possibly shared) batches."""
+    return get_station_scheduler().progress(order_id)
+
 def fetch_pending_orders() -> dict:
     """Return all orders that are not completed."""
-    with open(os.path.join(DATA_DIR, "orders.json"), "r") as f:
-        orders = json.load(f)
+    return {"pending_orders": get_order_store().pending()}
+
+
+# ==========================================================
+# 2b. DELIVERY TOOLS
+#   TABLE_DELIVERY_TTL_MIN=60  minutes a ready table delivery may wait for
+#                              a runner before it is dropped as stale
+# ==========================================================
 
-    pending = [o for o in orders if o["status"] != "completed"]
-    return {"pending_orders": pending}
+_table_dispatcher = None
+_table_dispatcher_lock = threading.Lock()
+
+
+def get_table_dispatcher() -> "TableDispatcher":
+    """Return the process-wide table-delivery dispatcher, loading floor_map.json on first use."""
+    global _table_dispatcher
+    if _table_dispatcher is None:
+        with _table_dispatcher_lock:
+            if _table_dispatcher is None:
+                from .delivery_engine import TableDispatcher
+                _table_dispatcher = TableDispatcher(
+                    os.path.join(DATA_DIR, "floor_map.json"),
+                    ttl_minutes=float(os.getenv("TABLE_DELIVERY_TTL_MIN", "60")),
+                )
+    return _table_dispatcher
+
+def dispatch_table_deliveries() -> dict:
+    """
+    Hand all ready table deliveries to staff runners, batched into
+    nearest-neighbour trips per floor zone.
+    """
+    return get_table_dispatcher().dispatch()
 
 
 # ==========================================================
 # 3. INVENTORY TOOLS
 # ==========================================================
 
+_inventory_ledger = None
+_inventory_ledger_lock = threading.Lock()
+
+
+def get_inventory_ledger() -> InventoryLedger:
+    """Return the process-wide inventory ledger, loading inventory.json on first use."""
+    global _inventory_ledger
+    if _inventory_ledger is None:
+        with _inventory_ledger_lock:
+            if _inventory_ledger is None:
+                _inventory_ledger = InventoryLedger(os.path.join(DATA_DIR, "inventory.json"))
+    return _inventory_ledger
+
 def fetch_inventory() -> dict:
-    """Load the current inventory."""
-    with open(os.path.join(DATA_DIR, "inventory.json"), "r") as f:
-        return json.load(f)
+    """Load the current inventory (served from the in-memory stock cache)."""
+    return get_inventory_ledger().snapshot()
 
 def update_inventory_changes(item: str, qty: int) -> dict:
     """Deduct or add stock."""
-    with open(os.path.join(DATA_DIR, "inventory.json"), "r") as f:
-        inventory = json.load(f)
+    result = get_inventory_ledger().apply_deltas({item: qty})
+    return {"item": item, "updated_qty": result["updated"][item]}
+
+def _order_idempotency_key(tool_context: Optional[ToolContext]) -> Optional[str]:
+    """The order a tool call is made for (from session state), used to apply its writes once."""
+    order = decode(tool_context.state, "order") if tool_context is not None else None
+    if order is None or order.order_id == "UNKNOWN_ORDER":
+        return None
+    return order.order_id
 
-    inventory[item] = max(0, inventory.get(item, 0) + qty)
+def apply_inventory_deltas(deltas: dict, tool_context: Optional[ToolContext] = None) -> dict:
+    """
+    Apply stock changes for many items in one atomic write.
+
+    Parameters:
+      deltas: {item: qty}, e.g. {"Extra Cheese": -2, "Veg Burger": -1}.
+              Negative values deduct stock, positive values restock.
+
+    Changes for the order in session state are applied once; repeating the
+    call (e.g. on a retry) returns the first result with "duplicate": True.
+    """
+    return get_inventory_ledger().apply_deltas(
+        deltas, idempotency_key=_order_idempotency_key(tool_context)
+    )
+
+_bom_engine = None
+_bom_engine_lock = threading.Lock()
 
-    with open(os.path.join(DATA_DIR, "inventory.json"), "w") as f:
-        json.dump(inventory, f, indent=2)
 
-    return {"item": item, "updated_qty": inventory[item]}
+def get_bom_engine() -> "BomEngine":
+    """Return the process-wide BOM engine, loading recipes.json on first use."""
+    global _bom_engine
+    if _bom_engine is None:
+        with _bom_engine_lock:
+            if _bom_engine is None:
+                from .bom import BomEngine
+                _bom_engine = BomEngine(os.path.join(DATA_DIR, "recipes.json"))
+    return _bom_engine
 
 def get_ingredient_requirements(order_id: str) -> dict:
-    """Return ingredient list for the order."""
-    with open(os.path.join(DATA_DIR, "recipes.json"), "r") as f:
-        recipes = json.load(f)
+    """
+    Return the aggregated ingredient list for the whole order:
+    every item, scaled by quantity, plus addon ingredient deltas.
+    """
     order = get_order_details(order_id)
-    # Be careful: ensure your orders actually have a 'recipe' field or logic to map items to recipes
-    # Assuming basic items have recipes:
-    if order and "items" in order and order["items"]:
-        # Just getting the first item's recipe for this simplified logic
-        # In a real app, you'd aggregate all items
-        first_item = order["items"][0]["name"]
-        return recipes.get(first_item, {}) 
-    return {}
+    if not order:
+        return {}
+    result = get_bom_engine().explode(order)
+    result["order_id"] = order_id
+    return result
+
+def get_stock_deductions(tool_context: ToolContext) -> dict:
+    """
+    Inventory deltas for the order in session state, already in
+    inventory.json keys: pass "deltas" straight to apply_inventory_deltas.
+    Ordered items or addons that are not stocked are listed under "unstocked".
+    """
+    order = decode(tool_context.state, "order")
+    if order is None:
+        return {"deltas": {}, "unstocked": [], "unmatched_items": [], "error": "No order in session state."}
+    result = get_bom_engine().stock_deltas(order.to_state())
+    result["order_id"] = order.order_id
+    return result
+
+def get_batch_ingredient_requirements(order_ids: list[str]) -> dict:
+    """
+    Return ingredient needs for several orders in one vectorized pass.
+
+    Parameters:
+      order_ids: e.g. ["ORD001", "ORD002"]. Unknown IDs are listed under "missing_orders".
+    """
+    orders, missing = [], []
+    for order_id in order_ids:
+        order = get_order_details(order_id)
+        if order:
+            orders.append(order)
+        else:
+            missing.append(order_id)
+    result = get_bom_engine().explode_batch(orders)
+    result["missing_orders"] = missing
+    return result
 
 def trigger_low_stock_alert(item: str) -> dict:
     """Triggered when any item is below threshold."""
@@ -380,42 +559,105 @@ def trigger_low_stock_alert(item: str) -> dict:
 # 4. LOYALTY TOOLS
 # ==========================================================
 
+_loyalty_store = None
+_loyalty_store_lock = threading.Lock()
+
+
+def get_loyalty_store() -> LoyaltyStore:
+    """Return the process-wide loyalty store, loading loyalty.json on first use."""
+    global _loyalty_store
+    if _loyalty_store is None:
+        with _loyalty_store_lock:
+            if _loyalty_store is None:
+                _loyalty_store = LoyaltyStore(os.path.join(DATA_DIR, "loyalty.json"))
+    return _loyalty_store
+
 def fetch_loyalty_profile(user_id: str) -> dict:
-    with open(os.path.join(DATA_DIR, "loyalty.json"), "r") as f:
-        profiles = json.load(f)
-    return profiles.get(user_id, {})
+    profile = get_loyalty_store().get(user_id)
+    return profile.to_json() if profile else {}
 
-def update_loyalty_points(user_id: str, points: int) -> dict:
-    with open(os.path.join(DATA_DIR, "loyalty.json"), "r") as f:
-        profiles = json.load(f)
-    profiles[user_id] = profiles.get(user_id, 0) + points
-    with open(os.path.join(DATA_DIR, "loyalty.json"), "w") as f:
-        json.dump(profiles, f, indent=2)
-    return {"user": user_id, "points": profiles[user_id]}
+def update_loyalty_points(
+    user_id: str, points: int, tool_context: Optional[ToolContext] = None
+) -> dict:
+    """
+    Add points to a customer's balance. Points for the order in session
+    state are credited once; repeating the call returns the current balance
+    with "duplicate": True.
+    """
+    store = get_loyalty_store()
+    key = _order_idempotency_key(tool_context)
+    key = f"{key}:{user_id}" if key else None
+    duplicate = key is not None and store.has_applied(key)
+    profile = store.add_points(user_id, points, idempotency_key=key)
+    return {"user": user_id, "points": profile.points, "duplicate": duplicate}
 
 
 # ==========================================================
 # 5. FEEDBACK TOOLS
 # ==========================================================
 
+_feedback_store = None
+_feedback_store_lock = threading.Lock()
+
+
+def get_feedback_store() -> FeedbackStore:
+    """
+    Return the process-wide feedback store (data/feedback.jsonl).
+    The JSONL file is seeded once from the legacy feedback.json.
+    """
+    global _feedback_store
+    if _feedback_store is None:
+        with _feedback_store_lock:
+            if _feedback_store is None:
+                _feedback_store = FeedbackStore(
+                    os.path.join(DATA_DIR, "feedback.jsonl"),
+                    seed_path=os.path.join(DATA_DIR, "feedback.json"),
+                )
+    return _feedback_store
+
 def save_feedback(user_id: str, feedback: str) -> dict:
     timestamp = datetime.datetime.now().isoformat()
-    feedback_file = os.path.join(DATA_DIR, "feedback.json")
-    with open(feedback_file, "r") as f:
-        fb = json.load(f)
-    fb.append({"user": user_id, "feedback": feedback, "time": timestamp})
-    with open(feedback_file, "w") as f:
-        json.dump(fb, f, indent=2)
+    get_feedback_store().append({"user": user_id, "feedback": feedback, "time": timestamp})
     return {"saved": True}
 
-def load_feedback_history() -> dict:
-    with open(os.path.join(DATA_DIR, "feedback.json"), "r") as f:
-        return json.load(f)
+def load_feedback_history(
+    since: str = None, limit: int = 50, cursor: int = None, newest_first: bool = True
+) -> dict:
+    """
+    Load one page of customer feedback, newest first by default.
+
+    Parameters:
+      since: Optional ISO timestamp; only feedback at or after it is returned.
+      limit: Maximum number of entries in this page. Default is 50.
+      cursor: Pass the previous page's `next_cursor` to continue; omit it for the first page.
+      newest_first: True (default) pages back from the most recent feedback;
+        False pages forward from the oldest.
+
+    Returns {"feedback": [...], "next_cursor": int | None}.
+    """
+    try:
+        return get_feedback_store().page(since=since, limit=limit, cursor=cursor, newest_first=newest_first)
+    except ValueError as e:
+        return {"feedback": [], "next_cursor": None, "error": str(e)}
 
 def analyze_feedback_sentiment(text: str) -> dict:
-    """Mock sentiment tool."""
-    score = 1 if "good" in text.lower() else -1
-    return {"sentiment_score": score}
+    """
+    Offline lexicon-based sentiment and category tagging for one feedback text.
+    Returns {"sentiment_score": -1..1, "label": "...", "categories": [...]}.
+    """
+    from . import sentiment
+    return sentiment.score_batch([text])[0]
+
+def analyze_feedback_batch(texts: list[str]) -> dict:
+    """
+    Score many feedback texts in one pass, with an aggregate summary.
+
+    Parameters:
+      texts: Raw feedback strings, e.g. ["Burger was cold", "Staff were friendly"].
+    """
+    from . import sentiment
+    results = sentiment.score_batch(texts)
+    return {"results": results, "summary": sentiment.summarize(results)}
 
 
 # ==========================================================
@@ -425,11 +667,29 @@ def analyze_feedback_sentiment(text: str) -> dict:
 def send_notification(msg: str, to: str) -> dict:
     return {"sent": True, "message": msg, "to": to}
 
-def save_system_logs(event: str) -> dict:
-    with open(os.path.join(DATA_DIR, "system_logs.txt"), "a") as f:
-        f.write(event + "\n")
+# Structured, buffered replacement for the old system_logs.txt writer.
+_event_logger = EventLogger(os.path.join(DATA_DIR, "system_events.jsonl"))
+
+
+def save_system_logs(event: str, order_id: str = None, agent: str = None) -> dict:
+    """
+    Record a pipeline event. The write is buffered and flushed in the background.
+
+    Parameters:
+      event: Short description, e.g. "Order ORD002 status updated to PREPARING".
+      order_id: Optional order the event belongs to.
+      agent: Optional name of the agent reporting the event.
+    """
+    _event_logger.log(event, order_id=order_id, agent=agent)
     return {"logged": True}
 
+def query_system_logs(limit: int = 20, order_id: str = None, agent: str = None) -> dict:
+    """
+    Return the most recent logged events, optionally filtered by order or agent.
+    Reads the log from the end, so cost does not grow with log size.
+    """
+    return {"events": _event_logger.query(limit=limit, order_id=order_id, agent=agent)}
+
 def message_bus(sender: str, receiver: str, payload: dict) -> dict:
     return {"from": sender, "to": receiver, "payload": payload}
 
@@ -438,46 +698,80 @@ def message_bus(sender: str, receiver: str, payload: dict) -> dict:
 # 7. PROPHET FORECASTING TOOL
 # ==========================================================
 
+_forecast_engine = None
+_forecast_engine_lock = threading.Lock()
+
+
+def get_forecast_engine() -> "ForecastEngine":
+    """Return the process-wide forecast engine, aggregating historical_orders.json on first use."""
+    global _forecast_engine
+    if _forecast_engine is None:
+        with _forecast_engine_lock:
+            if _forecast_engine is None:
+                from .forecasting import ForecastEngine
+                _forecast_engine = ForecastEngine(os.path.join(DATA_DIR, "historical_orders.json"))
+    return _forecast_engine
+
 def run_prophet_forecast(periods: int = 7) -> dict:
     """
     Runs a time-series forecast using internal sales history data.
-    
+
     Parameters:
         periods (int): Future days to forecast. Default is 7.
+
+    Returns the total daily forecast under "forecast" and one series per
+    menu item under "items". Results are cached until new orders complete.
     """
-    # 1. Load data internally (Solving the Agent asking for data)
-    sales_path = os.path.join(DATA_DIR, "sales_history.json")
-    
-    if not os.path.exists(sales_path):
-        return {"error": "sales_history.json not found in data directory."}
-        
-    try:
-        with open(sales_path, "r") as f:
-            data = json.load(f)
-    except Exception as e:
-        return {"error": f"Failed to load sales history: {e}"}
+    return get_forecast_engine().forecast(periods)
+
+
+# ==========================================================
+# 8. REFERENCE DATA TOOLS (local replacement for web search)
+# ==========================================================
+
+_reference_data = None
+_reference_data_lock = threading.Lock()
+
+
+def get_reference_store() -> ReferenceData:
+    """Return the process-wide reference data, loading reference_data.json on first use."""
+    global _reference_data
+    if _reference_data is None:
+        with _reference_data_lock:
+            if _reference_data is None:
+                _reference_data = ReferenceData(os.path.join(DATA_DIR, "reference_data.json"))
+    return _reference_data
+
+def get_reference_data(section: str) -> dict:
+    """
+    Look up kitchen reference data (local and versioned, no web search needed).
+
+    Parameters:
+        section (str): one of
+            "inventory"     - par levels, reorder points and stock rules per item
+            "loyalty"       - points rules, tiers (min_points, multiplier, perks) and rewards
+            "feedback"      - sentiment bands and the category taxonomy (owner, severity)
+            "writing_style" - rules for refining text
+    """
+    store = get_reference_store()
+    data = store.section(section)
+    if data is None:
+        return {"error": f"Unknown section {section!r}", "sections": store.sections}
+    return {"version": store.version, "section": section, "data": data}
+
+def check_stock_levels() -> dict:
+    """
+    Compare current inventory with the reference par levels.
+
+    Returns per item: quantity, par, reorder_point, status ("ok" / "low" /
+    "critical") and reorder_qty (units needed to get back to par), plus the
+    "low_stock" and "critical" item lists.
+    """
+    return get_reference_store().stock_levels(fetch_inventory())
+
+def get_loyalty_tier(points: int) -> dict:
+    """Return the loyalty tier (name, min_points, multiplier, perks) for a points balance."""
+    store = get_reference_store()
+    tier = store.tier_for(points)
+    return {"version": store.version, "points": points, "tier": tier}
 
-    # 2. Run Logic
-    try:
-        df = pd.DataFrame(data)
-        df["ds"] = pd.to_datetime(df["ds"])
-    except Exception as e:
-        return {"error": f"Invalid input format in file: {e}"}
-
-    df = df.sort_values("ds")
-    if len(df) < 2:
-        return {"error": "Not enough data points to forecast."}
-
-    last_value = df["y"].iloc[-1]
-    second_last_value = df["y"].iloc[-2]
-    daily_change = last_value - second_last_value
-    last_date = df["ds"].iloc[-1]
-
-    forecast_list = []
-    current_value = last_value
-    for i in range(1, periods + 1):
-        next_date = last_date + pd.Timedelta(days=i)
-        current_value += daily_change
-        forecast_list.append({"ds": next_date.strftime("%Y-%m-%d"), "yhat": float(current_value)})
-
-    return {"forecast": forecast_list}
\ No newline at end of file
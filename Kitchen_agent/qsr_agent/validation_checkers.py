@@ -1,9 +1,19 @@
 import logging
-from typing import AsyncGenerator
+import threading
+from typing import AsyncGenerator, Optional
 
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event, EventActions
+from pydantic import BaseModel
+
+from .output_schemas import (
+    FeedbackAnalysis,
+    InventoryUpdate,
+    LoyaltyUpdate,
+    RefinedOutput,
+    coerce_to_schema,
+)
 
 # Setup logger for validation warnings
 logger = logging.getLogger(__name__)
@@ -35,95 +45,137 @@ class BlogPostValidationChecker(BaseAgent):
             yield Event(author=self.name)
 
 
-class LoyaltyUpdateValidationChecker(BaseAgent):
+# -------------------------------------------------------------------
+# Retry accounting, per output key, across all sessions in this process.
+# -------------------------------------------------------------------
+_stats_lock = threading.Lock()
+_retry_stats: dict[str, dict] = {}
+
+
+def _record_attempt(output_key: str, valid: bool, repaired: bool, cause: Optional[str] = None) -> None:
+    with _stats_lock:
+        stats = _retry_stats.setdefault(
+            output_key,
+            {"attempts": 0, "valid": 0, "repaired": 0, "retries": 0, "causes": {}},
+        )
+        stats["attempts"] += 1
+        if valid:
+            stats["valid"] += 1
+            stats["repaired"] += int(repaired)
+        else:
+            stats["retries"] += 1
+            # Group schema errors by field, not by the full message.
+            kind = ": ".join(cause.split(": ")[:2]) if cause.startswith("schema: ") else cause
+            stats["causes"][kind] = stats["causes"].get(kind, 0) + 1
+
+
+def validation_stats() -> dict:
+    """Attempts, first-pass/repaired successes and retry causes per output key."""
+    with _stats_lock:
+        return {key: {**s, "causes": dict(s["causes"])} for key, s in _retry_stats.items()}
+
+
+class StructuredOutputChecker(BaseAgent):
     """
-    Validates the loyalty update output to ensure
-    it contains required fields and is logically correct.
+    Validates state[output_key] against `output_schema` inside a LoopAgent.
+
+    The value is repaired locally first (fenced or prose-wrapped JSON,
+    trailing commas, a one-level wrapper object), so only output that is
+    genuinely unusable triggers another LLM call. A valid value is written
+    back to state as a plain dict and ends the loop.
+
+    Every attempt is recorded under state["<output_key>_validation"]
+    ({"attempts", "valid", "repaired", "retry_causes"}) and in the
+    process-wide `validation_stats()`.
     """
 
+    output_key: str
+    output_schema: type[BaseModel]
+
+    def check(self, value: dict):
+        """Extra semantic checks beyond the schema; return an error string or None."""
+        return None
+
     async def _run_async_impl(
         self, context: InvocationContext
     ) -> AsyncGenerator[Event, None]:
-
-        loyalty_update = context.session.state.get("loyalty_update")
-        required_keys = {"user_id", "updated_points", "status"}
-
-        # ✅ FIX: Check if it is a dictionary before calling .keys()
-        if isinstance(loyalty_update, dict) and required_keys.issubset(loyalty_update.keys()):
+        state = context.session.state
+        record_key = f"{self.output_key}_validation"
+        record = state.get(record_key)
+        if not isinstance(record, dict) or record.get("invocation_id") != context.invocation_id:
+            record = {"invocation_id": context.invocation_id, "attempts": 0, "retry_causes": []}
+        record = {**record, "attempts": record["attempts"] + 1, "retry_causes": list(record["retry_causes"])}
+
+        value, cause, repaired = coerce_to_schema(state.get(self.output_key), self.output_schema)
+        if cause == "missing" and state.get(f"{self.output_key}_parse_error"):
+            cause = state[f"{self.output_key}_parse_error"]
+        if cause is None:
+            cause = self.check(value)
+
+        _record_attempt(self.output_key, cause is None, repaired, cause)
+        if cause is None:
+            record.update(valid=True, repaired=repaired)
             yield Event(
+                invocation_id=context.invocation_id,
                 author=self.name,
-                actions=EventActions(escalate=True),
+                branch=context.branch,
+                actions=EventActions(
+                    state_delta={self.output_key: value, record_key: record},
+                    escalate=True,
+                ),
             )
-        else:
-            if loyalty_update and isinstance(loyalty_update, str):
-                logger.warning(f"[LoyaltyChecker] Validation failed. Expected JSON, got text: {loyalty_update[:50]}...")
-            
-            yield Event(author=self.name)
+            return
 
+        record["retry_causes"].append(cause)
+        record.update(valid=False, repaired=False)
+        logger.warning(
+            "[%s] %s invalid on attempt %d: %s", self.name, self.output_key, record["attempts"], cause
+        )
+        yield Event(
+            invocation_id=context.invocation_id,
+            author=self.name,
+            branch=context.branch,
+            actions=EventActions(state_delta={record_key: record}),
+        )
 
-class FeedbackValidationChecker(BaseAgent):
-    """Checks if feedback entry is valid."""
 
-    async def _run_async_impl(
-        self, context: InvocationContext
-    ) -> AsyncGenerator[Event, None]:
-        feedback = context.session.state.get("feedback")
-        
-        # ✅ FIX: Check if it is a dictionary first
-        if isinstance(feedback, dict) and "user_id" in feedback and "text" in feedback:
-            yield Event(author=self.name, actions=EventActions(escalate=True))
-        else:
-            if feedback and isinstance(feedback, str):
-                 logger.warning(f"[FeedbackChecker] Validation failed. Expected JSON, got text: {feedback[:50]}...")
-            yield Event(author=self.name)
+class LoyaltyUpdateValidationChecker(StructuredOutputChecker):
+    """Validates state["loyalty_update"] against LoyaltyUpdate."""
 
+    output_key: str = "loyalty_update"
+    output_schema: type[BaseModel] = LoyaltyUpdate
 
-class RefinementValidationChecker(BaseAgent):
-    """
-    Validates the refinement output to ensure it contains proper suggestions 
-    based on loyalty and feedback data.
-    """
 
-    async def _run_async_impl(
-        self, context: InvocationContext
-    ) -> AsyncGenerator[Event, None]:
+class FeedbackValidationChecker(StructuredOutputChecker):
+    """Validates state["feedback_analysis"] against FeedbackAnalysis."""
 
-        # Retrieve refinement data from session state
-        refinement_data = context.session.state.get("refinement_suggestions")
+    output_key: str = "feedback_analysis"
+    output_schema: type[BaseModel] = FeedbackAnalysis
 
-        # Check if the data exists and has expected structure
-        if (
-            refinement_data 
-            and isinstance(refinement_data, dict) 
-            and "suggestions" in refinement_data
-        ):
-            yield Event(
-                author=self.name,
-                actions=EventActions(escalate=True),
-            )
-        else:
-            yield Event(author=self.name)
 
+class RefinementValidationChecker(StructuredOutputChecker):
+    """Validates state["refined_output"] against RefinedOutput."""
+
+    output_key: str = "refined_output"
+    output_schema: type[BaseModel] = RefinedOutput
+
+    def check(self, value: dict):
+        if not value["refined_content"].strip():
+            return "empty refined_content"
+        return None
 
-class InventoryUpdateValidationChecker(BaseAgent):
+
+class InventoryUpdateValidationChecker(StructuredOutputChecker):
     """
-    Validates the inventory update output to ensure
-    all ingredients are accounted for and stock changes are correct.
+    Validates state["updated_inventory"] against InventoryUpdate
+    (the schema already rejects negative stock).
     """
 
-    async def _run_async_impl(
-        self, context: InvocationContext
-    ) -> AsyncGenerator[Event, None]:
-
-        inventory_update = context.session.state.get("updated_inventory")
+    output_key: str = "updated_inventory"
+    output_schema: type[BaseModel] = InventoryUpdate
 
-        if (
-            inventory_update 
-            and isinstance(inventory_update, dict)
-            and all(isinstance(v, (int, float)) and v >= 0 for v in inventory_update.values())
-        ):
-            # Valid update
-            yield Event(author=self.name, actions=EventActions(escalate=True))
-        else:
-            # Invalid or missing data
-            yield Event(author=self.name)
\ No newline at end of file
+    def check(self, value: dict):
+        names = [c["ingredient"] for c in value["changes"]]
+        if len(names) != len(set(names)):
+            return "duplicate ingredient in changes"
+        return None
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from qsr_agent.pipeline import DagAgent, NodeSpec
+
+
+class Step(BaseAgent):
+    """Writes `output` after `delay` seconds, noting which inputs it could see and its branch."""
+
+    output: str
+    inputs: tuple = ()
+    delay: float = 0.1
+
+    async def _run_async_impl(self, context):
+        seen = sorted(k for k in self.inputs if k in context.session.state)
+        await asyncio.sleep(self.delay)
+        yield Event(
+            invocation_id=context.invocation_id,
+            author=self.name,
+            branch=context.branch,
+            actions=EventActions(state_delta={self.output: {"seen": seen, "branch": context.branch}}),
+        )
+
+
+def _dag() -> DagAgent:
+    steps = [
+        Step(name="load", output="order"),
+        Step(name="queue", output="queue_assignment", inputs=("order",)),
+        Step(name="split", output="station_split", inputs=("order",)),
+        Step(name="deliver", output="delivery_assignment", inputs=("order", "station_split")),
+    ]
+    return DagAgent(
+        name="flow",
+        sub_agents=steps,
+        nodes={s.name: NodeSpec(inputs=s.inputs, outputs=(s.output,)) for s in steps},
+    )
+
+
+async def _run(agent) -> tuple[list, dict]:
+    runner = InMemoryRunner(agent=agent, app_name="test")
+    session = await runner.session_service.create_session(app_name="test", user_id="u")
+    message = types.Content(role="user", parts=[types.Part(text="go")])
+    events = [e async for e in runner.run_async(user_id="u", session_id=session.id, new_message=message)]
+    session = await runner.session_service.get_session(app_name="test", user_id="u", session_id=session.id)
+    return events, session.state
+
+
+def test_dependencies_follow_declared_state_keys():
+    assert _dag().dependencies() == {
+        "load": set(),
+        "queue": {"load"},
+        "split": {"load"},
+        "deliver": {"load", "split"},
+    }
+
+
+def test_independent_nodes_run_concurrently_after_their_inputs():
+    started = time.perf_counter()
+    _, state = asyncio.run(_run(_dag()))
+    elapsed = time.perf_counter() - started
+
+    # Critical path is load -> split -> deliver (3 steps), not all 4.
+    assert elapsed < 0.35
+    assert state["queue_assignment"]["seen"] == ["order"]
+    assert state["delivery_assignment"]["seen"] == ["order", "station_split"]
+    timings = state["flow_timings"]
+    assert timings["split"]["start_ms"] >= timings["load"]["end_ms"]
+    assert timings["deliver"]["start_ms"] >= timings["split"]["end_ms"]
+
+
+def test_each_node_runs_on_its_own_branch():
+    events, state = asyncio.run(_run(_dag()))
+
+    assert state["queue_assignment"]["branch"] == "flow.queue"
+    assert state["station_split"]["branch"] == "flow.split"
+    assert {e.branch for e in events if e.author == "split"} == {"flow.split"}
+
+
+def test_cycles_and_duplicate_writers_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        DagAgent(
+            name="bad",
+            sub_agents=[Step(name="a", output="x", inputs=("y",)), Step(name="b", output="y", inputs=("x",))],
+            nodes={"a": NodeSpec(inputs=("y",), outputs=("x",)), "b": NodeSpec(inputs=("x",), outputs=("y",))},
+        )
+    with pytest.raises(ValueError, match="written by both"):
+        DagAgent(
+            name="bad",
+            sub_agents=[Step(name="a", output="x"), Step(name="b", output="x")],
+            nodes={"a": NodeSpec(outputs=("x",)), "b": NodeSpec(outputs=("x",))},
+        )
@@ -0,0 +1,41 @@
+import json
+
+from qsr_agent.feedback_store import FeedbackStore
+
+
+def _store(tmp_path, n: int = 30) -> FeedbackStore:
+    path = tmp_path / "feedback.jsonl"
+    path.write_text(json.dumps({"customer_id": "LEGACY", "text": "old entry"}) + "\n")
+    store = FeedbackStore(str(path))
+    for i in range(n):
+        store.append({"user": f"u{i}", "feedback": "ok " * i, "time": f"2026-01-01T10:{i:02d}:00"})
+    return store
+
+
+def test_newest_first_pages_cover_the_history_in_reverse(tmp_path):
+    store = _store(tmp_path)
+    oldest_first = [entry for _, entry in store.iter_entries()]
+
+    newest_first, cursor = [], None
+    while True:
+        page = store.page(limit=7, cursor=cursor, newest_first=True)
+        newest_first += page["feedback"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert newest_first == oldest_first[::-1]
+    assert newest_first[-1] == {"user": "LEGACY", "feedback": "old entry", "time": None}
+
+
+def test_newest_first_stops_at_since(tmp_path):
+    store = _store(tmp_path)
+    page = store.page(since="2026-01-01T10:25:00", limit=50, newest_first=True)
+
+    assert [e["user"] for e in page["feedback"]] == ["u29", "u28", "u27", "u26", "u25"]
+    assert page["next_cursor"] is None
+
+
+def test_small_blocks_split_lines_correctly(tmp_path):
+    store = _store(tmp_path)
+    assert [e for _, e in store.iter_newest(block_size=5)] == [e for _, e in store.iter_newest()]
@@ -0,0 +1,35 @@
+import json
+
+from qsr_agent.forecasting import ForecastEngine
+
+
+def _engine(tmp_path) -> ForecastEngine:
+    history = [
+        {"order_id": f"H{day}", "items": [{"name": "Veg Burger", "quantity": 2}], "time": f"2026-01-{day:02d}T12:00:00"}
+        for day in range(1, 16)
+    ]
+    path = tmp_path / "historical_orders.json"
+    path.write_text(json.dumps(history))
+    return ForecastEngine(str(path))
+
+
+def test_an_order_is_counted_once(tmp_path):
+    engine = _engine(tmp_path)
+    order = {"order_id": "LIVE1", "items": [{"name": "Veg Burger", "quantity": 3}], "time": "2026-01-15T18:00:00"}
+
+    assert engine.record_order(order) is True
+    total = engine._counts.sum()
+    assert engine.record_order(order) is False
+    assert engine._counts.sum() == total == 2 * 15 + 3
+
+
+def test_repeat_record_keeps_cached_forecast(tmp_path):
+    engine = _engine(tmp_path)
+    engine.record_order({"order_id": "LIVE1", "items": [{"name": "Veg Burger"}], "time": "2026-01-15T18:00:00"})
+    first = engine.forecast(periods=3)
+    version = engine._version
+
+    engine.record_order({"order_id": "LIVE1", "items": [{"name": "Veg Burger"}], "time": "2026-01-15T18:00:00"})
+
+    assert engine._version == version
+    assert engine.forecast(periods=3) is first  # served from cache, not refitted
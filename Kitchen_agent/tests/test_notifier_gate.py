@@ -0,0 +1,54 @@
+import asyncio
+import importlib
+import json
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from qsr_agent.sub_agents.notifier_agent import conditional_notifier_agent, needs_chef_alert
+
+ai_checker = importlib.import_module("qsr_agent.sub_agents.ai_checker_agent")
+
+
+def _check(status: str, requires_human_review: bool, **extra) -> str:
+    return json.dumps({
+        "order_id": "TEMP-AAAA1111",
+        "item_name": "Veg Burger",
+        "status": status,
+        "missing_ingredients": [],
+        "unexpected_items": [],
+        "requires_human_review": requires_human_review,
+        **extra,
+    })
+
+
+async def _run_gate(state: dict) -> dict:
+    runner = InMemoryRunner(agent=conditional_notifier_agent, app_name="test")
+    session = await runner.session_service.create_session(app_name="test", user_id="u", state=state)
+    message = types.Content(role="user", parts=[types.Part(text="check done")])
+    async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+        pass
+    session = await runner.session_service.get_session(app_name="test", user_id="u", session_id=session.id)
+    return session.state
+
+
+def test_clean_pass_is_auto_approved():
+    clean = {"provisional_status": "PASS", "missing_ingredients": [], "unexpected_items": []}
+    assert ai_checker.request_human_approval("TEMP-AAAA1111", "Veg Burger", clean)["approval_status"] == "APPROVED"
+
+    flagged = {**clean, "provisional_status": "FAIL", "missing_ingredients": ["cheese"]}
+    assert ai_checker.request_human_approval("TEMP-AAAA1111", "Veg Burger", flagged)["approval_status"] == "PENDING"
+
+
+def test_gate_fires_on_fail_review_or_missing_check():
+    assert needs_chef_alert({"assembly_check": _check("FAIL", True, missing_ingredients=["cheese"])})
+    assert needs_chef_alert({"assembly_check": _check("HOLD", True)})
+    assert needs_chef_alert({})
+
+
+def test_gate_skips_an_approved_pass():
+    state = asyncio.run(_run_gate({"assembly_check": _check("PASS", False)}))
+
+    assert state["notifier_agent_skipped"]["skipped"] is True
+    assert state["notifier_agent_skipped"]["reason"]
+    assert "chef_alert" not in state
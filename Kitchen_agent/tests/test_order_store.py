@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from qsr_agent.order_store import JournalOrderStore, OrderStore, SQLiteOrderStore, create_order_store
+
+SEED = [
+    {"order_id": "ORD001", "status": "pending", "time": "2026-01-01T12:00:00", "items": [{"name": "Cola"}]},
+    {"order_id": "ORD002", "status": "completed", "time": "2026-01-01T11:00:00", "items": []},
+]
+
+
+def _seed(tmp_path) -> str:
+    path = tmp_path / "orders.json"
+    path.write_text(json.dumps(SEED))
+    return str(path)
+
+
+def test_journal_seeds_from_legacy_json_and_replays(tmp_path):
+    journal = str(tmp_path / "orders.jsonl")
+    store = JournalOrderStore(journal, seed_path=_seed(tmp_path))
+    store.put({"order_id": "ORD003", "time": "2026-01-01T13:00:00", "items": []})
+    store.update_status("ORD001", "ready")
+
+    reopened = JournalOrderStore(journal, seed_path=_seed(tmp_path))
+
+    assert len(reopened) == 3
+    assert reopened.get("ORD001")["status"] == "READY"
+    assert reopened.get("ORD003")["status"] == "QUEUED"
+    assert [o["order_id"] for o in reopened.pending()] == ["ORD001", "ORD003"]
+
+
+def test_journal_skips_a_torn_last_line(tmp_path):
+    journal = tmp_path / "orders.jsonl"
+    store = JournalOrderStore(str(journal))
+    store.put({"order_id": "ORD001", "items": []})
+    with open(journal, "a") as f:
+        f.write('{"op": "status", "order_id": "ORD0')
+
+    assert JournalOrderStore(str(journal)).get("ORD001")["status"] == "QUEUED"
+
+
+def test_compact_keeps_one_line_per_order(tmp_path):
+    journal = tmp_path / "orders.jsonl"
+    store = JournalOrderStore(str(journal))
+    store.put({"order_id": "ORD001", "items": []})
+    for status in ("PREPARING", "READY", "COMPLETED"):
+        store.update_status("ORD001", status)
+
+    store.compact()
+
+    assert len(journal.read_text().splitlines()) == 1
+    assert JournalOrderStore(str(journal)).get("ORD001")["status"] == "COMPLETED"
+
+
+def test_update_of_unknown_order_is_rejected(tmp_path):
+    store = JournalOrderStore(str(tmp_path / "orders.jsonl"))
+    assert store.update_status("NOPE", "READY") is False
+    assert store.get("NOPE") is None
+
+
+@pytest.fixture(params=["journal", "sqlite"])
+def backend(request) -> str:
+    return request.param
+
+
+def test_backends_share_status_normalisation_and_pending(tmp_path, backend):
+    (tmp_path / "orders.json").write_text(json.dumps(SEED))
+    store = create_order_store(backend, str(tmp_path))
+    store.put({"order_id": "ORD003", "status": " preparing ", "time": "2026-01-01T13:00:00", "items": []})
+    store.update_status("ORD003", "Completed")
+
+    assert isinstance(store, OrderStore)
+    assert store.get("ORD001")["status"] == "PENDING"
+    assert store.get("ORD003")["status"] == "COMPLETED"
+    assert [o["order_id"] for o in store.pending()] == ["ORD001"]
+
+    reopened = create_order_store(backend, str(tmp_path))
+    assert reopened.get("ORD003")["status"] == "COMPLETED"
+    assert reopened.get("ORD003")["items"] == []
+
+
+def test_sqlite_status_column_wins_over_the_stored_body(tmp_path):
+    store = SQLiteOrderStore(str(tmp_path / "orders.db"))
+    store.put({"order_id": "ORD001", "status": "queued", "items": [{"name": "Cola"}]})
+    store.update_status("ORD001", "ready")
+
+    assert store.get("ORD001") == {"order_id": "ORD001", "status": "READY", "items": [{"name": "Cola"}]}
+    assert store.update_status("NOPE", "READY") is False
+
+
+def test_unknown_backend_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown order store backend"):
+        create_order_store("mongo", str(tmp_path))
@@ -0,0 +1,74 @@
+import datetime
+
+from qsr_agent.queue_engine import PRIORITY_HIGH, PRIORITY_STANDARD, KitchenQueue
+
+T0 = datetime.datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _at(minutes: float) -> datetime.datetime:
+    return T0 + datetime.timedelta(minutes=minutes)
+
+
+def _order(order_id: str, table=None, quantity: int = 1, **extra) -> dict:
+    return {"order_id": order_id, "table": table, "items": [{"name": "Veg Burger", "quantity": quantity}], **extra}
+
+
+def test_dine_in_and_large_orders_go_first():
+    queue = KitchenQueue(aging_minutes=10)
+    queue.push(_order("TAKEAWAY"), now=_at(0))
+    queue.push(_order("LARGE", quantity=6), now=_at(1))
+    dine_in = queue.push(_order("DINE", table=4), now=_at(2))
+
+    assert dine_in["queue_priority"] == PRIORITY_HIGH
+    assert dine_in["queue_position"] == 2
+    assert [queue.pop(), queue.pop(), queue.pop()] == ["LARGE", "DINE", "TAKEAWAY"]
+    assert queue.pop() is None
+
+
+def test_waiting_takeaway_ages_ahead_of_fresh_dine_in():
+    queue = KitchenQueue(aging_minutes=10)
+    takeaway = queue.push(_order("TAKEAWAY"), now=_at(0))
+    assert takeaway["queue_priority"] == PRIORITY_STANDARD
+
+    # Within 2 * aging_minutes the dine-in order jumps ahead ...
+    assert queue.push(_order("DINE-1", table=1), now=_at(19))["queue_position"] == 1
+    # ... after that the takeaway order has aged past it.
+    assert queue.push(_order("DINE-2", table=2), now=_at(21))["queue_position"] == 3
+    assert [queue.pop(), queue.pop(), queue.pop()] == ["DINE-1", "TAKEAWAY", "DINE-2"]
+
+
+def test_wait_estimate_counts_units_ahead_over_station_capacity():
+    queue = KitchenQueue(station_capacity=2, minutes_per_unit=4.0, ttl_minutes=None)
+    queue.push(_order("A", table=1, quantity=3), now=_at(0))
+    queue.push(_order("B", table=2, quantity=1), now=_at(0))
+    assignment = queue.push(_order("C", table=3), now=_at(0))
+
+    assert assignment["queue_position"] == 3
+    assert assignment["estimated_start_time"] == _at(8).isoformat(timespec="seconds")
+
+
+def test_push_is_idempotent_and_keys_on_enqueue_time():
+    queue = KitchenQueue()
+    queue.push(_order("NEW", table=1), now=_at(0))
+    # An order with an old order time does not jump the queue ...
+    stale = queue.push(_order("OLD", table=2, time=_at(-600).isoformat()), now=_at(1))
+    assert stale["queue_position"] == 2
+    # ... and pushing it again keeps its place instead of adding a duplicate.
+    again = queue.push(_order("OLD", table=2), now=_at(5))
+    assert again["queue_position"] == 2
+    assert len(queue) == 2
+
+
+def test_remove_and_ttl_expiry_keep_the_queue_bounded():
+    queue = KitchenQueue(ttl_minutes=60)
+    for i in range(500):
+        queue.push(_order(f"TEMP-{i}", table=1), now=_at(i * 0.1))
+    assert queue.remove("TEMP-0") is True
+    assert queue.remove("TEMP-0") is False
+    assert len(queue) == 499
+
+    fresh = queue.push(_order("FRESH", table=1), now=_at(200))
+    assert fresh["queue_position"] == 1
+    assert fresh["estimated_start_time"] == _at(200).isoformat(timespec="seconds")
+    assert len(queue) == 1
+    assert queue.expired == 499
@@ -0,0 +1,126 @@
+import asyncio
+import re
+import time
+
+from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from qsr_agent import tools
+from qsr_agent.agent_utils import enable_response_cache
+from qsr_agent.response_cache import ResponseCache, state_inputs
+from qsr_agent.state_codec import decode
+
+
+class EchoLlm(BaseLlm):
+    """Answers with the order id named in the instruction and counts its calls."""
+
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self.calls += 1
+        instruction = llm_request.config.system_instruction
+        order_id = re.search(r"order (\S+)", instruction).group(1)
+        text = f'{{"order_id": "{order_id}", "status": "PASS"}}'
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def _order(order_id: str, time: str, table=5, quantity: int = 2) -> dict:
+    return {
+        "order_id": order_id,
+        "time": time,
+        "table": table,
+        "delivery_mode": "table",
+        "items": [{"name": "Veg Burger", "quantity": quantity, "addons": ["cheese"]}],
+    }
+
+
+def _checker(llm: EchoLlm) -> LlmAgent:
+    agent = LlmAgent(
+        model=llm,
+        name="checker",
+        instruction=lambda ctx: f"Check order {decode(ctx.state, 'order').order_id}",
+        output_key="check",
+    )
+    enable_response_cache(agent, state_keys=("order",), order_scoped=True)
+    return agent
+
+
+async def _run(agent, order: dict) -> dict:
+    runner = InMemoryRunner(agent=agent, app_name="test")
+    session = await runner.session_service.create_session(app_name="test", user_id="u", state={"order": order})
+    message = types.Content(role="user", parts=[types.Part(text="check the assembly")])
+    async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+        pass
+    session = await runner.session_service.get_session(app_name="test", user_id="u", session_id=session.id)
+    return session.state
+
+
+def test_state_inputs_ignore_order_id_and_time():
+    first = {"order": _order("TEMP-AAAA1111", "2026-01-01T12:00:00")}
+    second = {"order": _order("TEMP-BBBB2222", "2026-01-01T12:05:00")}
+    assert state_inputs(first, ("order",)) == state_inputs(second, ("order",))
+    assert state_inputs(first, ("order",)) != state_inputs({"order": _order("X", "t", table=6)}, ("order",))
+
+
+def test_identical_orders_share_a_cached_response(monkeypatch):
+    monkeypatch.setattr(tools, "_response_cache", ResponseCache())
+    llm = EchoLlm(model="echo")
+    agent = _checker(llm)
+
+    first = asyncio.run(_run(agent, _order("TEMP-AAAA1111", "2026-01-01T12:00:00")))
+    second = asyncio.run(_run(agent, _order("TEMP-BBBB2222", "2026-01-01T12:05:00")))
+
+    assert llm.calls == 1
+    assert "TEMP-AAAA1111" in first["check"]
+    # The hit is re-stamped with the order it answers, not the one it was stored for.
+    assert "TEMP-BBBB2222" in second["check"]
+    assert "TEMP-AAAA1111" not in second["check"]
+    assert tools.get_response_cache().metrics()["agents"]["checker"] == {"hits": 1, "misses": 1}
+
+
+def test_different_order_content_misses(monkeypatch):
+    monkeypatch.setattr(tools, "_response_cache", ResponseCache())
+    llm = EchoLlm(model="echo")
+    agent = _checker(llm)
+
+    asyncio.run(_run(agent, _order("TEMP-AAAA1111", "2026-01-01T12:00:00")))
+    asyncio.run(_run(agent, _order("TEMP-BBBB2222", "2026-01-01T12:00:00", quantity=3)))
+
+    assert llm.calls == 2
+
+
+def test_lru_keeps_the_most_recently_used_entries():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("A", "C")
+    assert cache.metrics()["evictions"] == 1
+
+
+def test_entries_expire_after_the_ttl():
+    cache = ResponseCache(ttl_seconds=0.05)
+    cache.put("a", "A")
+    time.sleep(0.1)
+
+    assert cache.get("a") is None
+    assert cache.metrics()["expired"] == 1
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    db = str(tmp_path / "cache.db")
+    cache = ResponseCache(db_path=db)
+    cache.put("a", "A", agent="checker")
+    cache.close()
+
+    reopened = ResponseCache(db_path=db)
+    assert reopened.get("a", agent="checker") == "A"
+    assert reopened.get("a") == "A"
+    metrics = reopened.metrics()
+    assert (metrics["disk_hits"], metrics["memory_hits"]) == (1, 1)
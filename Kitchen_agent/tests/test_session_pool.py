@@ -0,0 +1,95 @@
+import asyncio
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from qsr_agent.session_pool import SessionPool
+
+
+class Counter(BaseAgent):
+    """Counts turns in its session and writes "order" only for messages that place one."""
+
+    async def _run_async_impl(self, context):
+        turns = context.session.state.get("turns", 0) + 1
+        text = context.user_content.parts[0].text
+        delta = {"turns": turns}
+        if text.startswith("order"):
+            delta["order"] = {"order_id": text}
+        await asyncio.sleep(0.05)
+        yield Event(
+            invocation_id=context.invocation_id,
+            author=self.name,
+            branch=context.branch,
+            content=types.Content(role="model", parts=[types.Part(text=f"turn {turns}")]),
+            actions=EventActions(state_delta=delta),
+        )
+
+
+def _pool(**kwargs) -> SessionPool:
+    return SessionPool(InMemoryRunner(agent=Counter(name="counter")), **kwargs)
+
+
+def _live(pool: SessionPool) -> int:
+    sessions = pool.runner.session_service.sessions.get(pool.runner.app_name, {})
+    return len(sessions.get(pool.user_id, {}))
+
+
+def test_one_shot_messages_get_isolated_sessions():
+    pool = _pool()
+
+    async def main():
+        return await asyncio.gather(*[pool.run(f"order {i}") for i in range(4)])
+
+    results = asyncio.run(main())
+
+    assert len({r["session_id"] for r in results}) == 4
+    assert all(r["state"]["turns"] == 1 for r in results)
+    assert [r["final_text"] for r in results] == ["turn 1"] * 4
+
+
+def test_conversation_reuses_its_session_and_reports_written_keys():
+    pool = _pool()
+
+    async def main():
+        return await pool.run("order A", key="ctx-1"), await pool.run("thanks", key="ctx-1")
+
+    first, second = asyncio.run(main())
+
+    assert first["session_id"] == second["session_id"]
+    assert second["state"]["turns"] == 2
+    assert first["written_keys"] == ["order", "turns"]
+    # The earlier order is still in state, but this run did not write it.
+    assert "order" in second["state"] and second["written_keys"] == ["turns"]
+
+
+def test_done_and_idle_sessions_are_evicted():
+    pool = _pool(idle_ttl=0.5, completed_ttl=0.05)
+
+    async def main():
+        await pool.run("order A")
+        await pool.run("hello", key="ctx-1")
+        await asyncio.sleep(0.15)
+        after_completed = await pool.evict()
+        await asyncio.sleep(0.5)
+        after_idle = await pool.evict()
+        return after_completed, after_idle
+
+    assert asyncio.run(main()) == (1, 1)
+    assert _live(pool) == 0
+    assert pool.metrics()["evicted_ttl"] == 2
+
+
+def test_lru_eviction_keeps_the_pool_bounded():
+    pool = _pool(max_sessions=2)
+
+    async def main():
+        for key in ("a", "b", "c", "d"):
+            await pool.run("hello", key=key)
+
+    asyncio.run(main())
+
+    assert pool.metrics()["live_sessions"] == 2
+    assert pool.metrics()["evicted_lru"] == 2
+    assert _live(pool) == 2
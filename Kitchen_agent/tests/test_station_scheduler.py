@@ -0,0 +1,109 @@
+import json
+import logging
+
+import pytest
+
+from qsr_agent.station_scheduler import StationScheduler
+
+CONFIG = {
+    "stations": {
+        "frying": {"capacity": 1, "batch_size": 4},
+        "grilling": {"capacity": 1, "batch_size": 1},
+        "assembly": {"capacity": 1, "batch_size": 1},
+    },
+    "batch_window_min": 2.0,
+    "routing": {
+        "Veg Burger": [["grilling", 5.0], ["assembly", 1.5]],
+        "Crispy Fries": [["frying", 4.0]],
+    },
+    "addon_minutes": {"Extra Cheese": ["assembly", 0.5]},
+    "default_route": [["assembly", 3.0]],
+}
+
+
+@pytest.fixture
+def scheduler(tmp_path) -> StationScheduler:
+    path = tmp_path / "stations.json"
+    path.write_text(json.dumps(CONFIG))
+    return StationScheduler(str(path))
+
+
+def test_route_names_ignore_case_and_whitespace(scheduler):
+    exact = scheduler.route({"name": "Veg Burger", "addons": ["Extra Cheese"]})
+    sloppy = scheduler.route({"name": "  veg   BURGER ", "addons": ["extra cheese "]})
+
+    assert sloppy == exact == [("grilling", 5.0), ("assembly", 2.0)]
+
+
+def test_unknown_names_use_defaults_and_are_logged_once(scheduler, caplog):
+    with caplog.at_level(logging.WARNING, logger="qsr_agent.station_scheduler"):
+        for _ in range(3):
+            assert scheduler.route({"name": "Mystery Wrap", "addons": ["Gold Leaf"]}) == [("assembly", 3.0)]
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert len(messages) == 2
+    assert any("item 'mystery wrap'" in m for m in messages)
+    assert any("addon 'gold leaf'" in m for m in messages)
+
+
+def _times(scheduler, jobs) -> list[tuple]:
+    return [
+        (job.station, scheduler.batch(job.batch_id).start, scheduler.batch(job.batch_id).finish)
+        for job in jobs
+    ]
+
+
+def test_units_respect_step_order_and_station_capacity(scheduler):
+    jobs = scheduler.plan({"order_id": "A", "items": [{"name": "Veg Burger", "quantity": 2}]}, now=0)
+
+    assert sorted(_times(scheduler, jobs)) == [
+        ("assembly", 5.0, 6.5),
+        ("assembly", 10.0, 11.5),
+        ("grilling", 0.0, 5.0),
+        ("grilling", 5.0, 10.0),
+    ]
+
+
+def test_progress_and_release(scheduler):
+    scheduler.plan({"order_id": "A", "items": [{"name": "Veg Burger"}]}, now=0)
+
+    assert scheduler.progress("A", now=1)["jobs_done"] == 0
+    assert scheduler.progress("A", now=5.5) | {"ready_at": None} == {
+        "order_id": "A", "tracked": True, "jobs_total": 2, "jobs_done": 1, "ready_at": None, "complete": False,
+    }
+    assert scheduler.progress("A", now=7)["complete"] is True
+
+    # Releasing A gives its grill time to the next order.
+    assert scheduler.release("A") is True
+    jobs = scheduler.plan({"order_id": "B", "items": [{"name": "Veg Burger"}]}, now=0)
+    assert _times(scheduler, jobs)[0] == ("grilling", 0.0, 5.0)
+    assert scheduler.progress("A") == {"order_id": "A", "tracked": False}
+
+
+def test_identical_jobs_from_different_orders_share_a_batch(scheduler):
+    a = scheduler.plan({"order_id": "A", "items": [{"name": "Crispy Fries", "quantity": 2}]}, now=0)
+    b = scheduler.plan({"order_id": "B", "items": [{"name": "crispy fries ", "quantity": 2}]}, now=0)
+
+    batch = scheduler.batch(a[0].batch_id)
+    assert {job.batch_id for job in a + b} == {batch.batch_id}
+    assert batch.fanout == {"A": 2, "B": 2}
+    assert (batch.start, batch.finish) == (0.0, 4.0)
+
+
+def test_full_or_started_batches_are_not_joined(scheduler):
+    scheduler.plan({"order_id": "A", "items": [{"name": "Crispy Fries", "quantity": 4}]}, now=0)
+    full = scheduler.plan({"order_id": "B", "items": [{"name": "Crispy Fries"}]}, now=0)
+    late = scheduler.plan({"order_id": "C", "items": [{"name": "Crispy Fries"}]}, now=5)
+
+    assert _times(scheduler, full) == [("frying", 4.0, 8.0)]
+    # B's batch started at 4, so C opens its own run after it.
+    assert _times(scheduler, late) == [("frying", 8.0, 12.0)]
+    assert scheduler.batch(late[0].batch_id).fanout == {"C": 1}
+
+
+def test_stations_without_batching_cook_one_job_per_run(scheduler):
+    jobs = scheduler.plan(
+        {"order_id": "A", "items": [{"name": "Veg Burger"}, {"name": "Veg Burger"}]}, now=0
+    )
+    grill_batches = {job.batch_id for job in jobs if job.station == "grilling"}
+    assert len(grill_batches) == 2